@@ -2,26 +2,177 @@
 """
 Lightweight FastAPI adapter exposing two endpoints:
 - POST /text  -> accepts JSON {"text": "..."} and returns AdapterOutput-like JSON
+- POST /text/batch -> accepts JSON {"texts": [...]} and returns a list of AdapterOutput-like JSON
 - POST /transcribe -> accepts multipart file upload "file" (audio) and returns transcribed text
 
+Concurrent uploads are coalesced by a small micro-batcher (see _TranscribeBatcher) so the
+model runs once per batch instead of once per request.
+
 Run with:
 uvicorn kyrax_core.adapters.api_adapter:app --reload --host 0.0.0.0 --port 8000
+
+The Whisper model is loaded in the startup hook, not at import. For several CPU workers, load it
+once in the parent and share the weights copy-on-write across forked workers:
+KYRAX_PRELOAD_WHISPER=1 gunicorn -k uvicorn.workers.UvicornWorker --preload -w 4 kyrax_core.adapters.api_adapter:app
+(on GPU prefer a single worker: one CUDA context / one copy of the weights per device)
 """
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Response
 from pydantic import BaseModel
-from typing import Dict, Any
-import shutil
-import tempfile
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
 import os
 
+from starlette.concurrency import run_in_threadpool
+
 from .base import AdapterOutput
-from .voice_adapter import WhisperVoiceAdapter
+from .voice_adapter import WhisperVoiceAdapter, SAMPLE_RATE
+
+# orjson-backed responses when available (faster encoding, bytes straight to the socket)
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as _DefaultResponse
+except Exception:
+    from fastapi.responses import JSONResponse as _DefaultResponse
+
+app = FastAPI(title="KYRAX Input Adapter API", default_response_class=_DefaultResponse)
+
+# msgspec encodes the AdapterOutput dataclass directly (no intermediate __dict__ / jsonable pass)
+try:
+    import msgspec
+    _JSON_ENCODER = msgspec.json.Encoder()
+except Exception:
+    _JSON_ENCODER = None
+
+
+def _adapter_response(out: Any) -> Any:
+    """Encode AdapterOutput (or a list of them) for the wire; same JSON shape either way."""
+    if _JSON_ENCODER is not None:
+        return Response(content=_JSON_ENCODER.encode(out), media_type="application/json")
+    if isinstance(out, list):
+        return [o.__dict__ for o in out]
+    return out.__dict__
+
+# shared voice adapter, created on startup (or at import when preloading for forked workers)
+VOICE_ADAPTER: Optional[WhisperVoiceAdapter] = None
+
+
+def _get_voice_adapter() -> WhisperVoiceAdapter:
+    """
+    Return the process-wide adapter, creating it on first use.
+    KYRAX_WHISPER_MODEL may name a size ("base") or a converted int8 CTranslate2 dir
+    (e.g. models/whisper-base-int8, see WhisperVoiceAdapter docstring).
+    """
+    global VOICE_ADAPTER
+    if VOICE_ADAPTER is None:
+        VOICE_ADAPTER = WhisperVoiceAdapter(
+            model_name=os.environ.get("KYRAX_WHISPER_MODEL", "base"),
+            device=os.environ.get("KYRAX_WHISPER_DEVICE", "cpu"),
+        )
+    return VOICE_ADAPTER
+
+
+if os.environ.get("KYRAX_PRELOAD_WHISPER") == "1":
+    # load weights in the parent process so `--preload` workers share them after fork()
+    _ = _get_voice_adapter().model
+
+# duration buckets (seconds) used to group a batch so short clips are not padded to long ones
+_DURATION_BUCKETS = (5.0, 15.0, 30.0)
+
+
+def _duration_bucket(seconds: float) -> int:
+    for i, limit in enumerate(_DURATION_BUCKETS):
+        if seconds <= limit:
+            return i
+    return len(_DURATION_BUCKETS)
+
 
-app = FastAPI(title="KYRAX Input Adapter API")
+class _TranscribeBatcher:
+    """
+    Dynamic micro-batcher for /transcribe.
+    Decoded PCM arrays are queued with a future; a single background task drains up to `max_batch`
+    items (or waits at most `max_wait_ms`), groups them by duration bucket and runs each
+    group in one threadpool call, then resolves the futures.
+    """
 
-# instantiate a shared voice adapter (model choice configurable)
-# NOTE: model will be loaded on first use (lazy)
-VOICE_ADAPTER = WhisperVoiceAdapter(model_name="base")
+    def __init__(self, adapter: WhisperVoiceAdapter, max_batch: int = 8, max_wait_ms: float = 10.0):
+        self.adapter = adapter
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, audio: Any) -> AdapterOutput:
+        if self._queue is None:
+            raise RuntimeError("transcribe batcher not started")
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((audio, len(audio) / SAMPLE_RATE, fut))
+        return await fut
+
+    async def _collect(self) -> List[Tuple[Any, float, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            groups: Dict[int, List[Tuple[Any, float, asyncio.Future]]] = {}
+            for item in batch:
+                groups.setdefault(_duration_bucket(item[1]), []).append(item)
+            for _, items in sorted(groups.items()):
+                audios = [audio for audio, _, _ in items]
+                try:
+                    results = await run_in_threadpool(self.adapter.transcribe_many, audios)
+                except Exception as exc:
+                    results = [exc] * len(items)
+                for (_, _, fut), res in zip(items, results):
+                    if fut.done():
+                        continue
+                    if isinstance(res, Exception):
+                        fut.set_exception(res)
+                    else:
+                        fut.set_result(res)
+
+
+TRANSCRIBE_BATCHER: Optional[_TranscribeBatcher] = None
+
+
+@app.on_event("startup")
+async def _start_voice() -> None:
+    global TRANSCRIBE_BATCHER
+    adapter = _get_voice_adapter()
+    # load the model now (off the event loop) so the first request doesn't pay for it
+    await run_in_threadpool(lambda: adapter.model)
+    TRANSCRIBE_BATCHER = _TranscribeBatcher(adapter)
+    TRANSCRIBE_BATCHER.start()
+
+
+@app.on_event("shutdown")
+async def _stop_voice() -> None:
+    if TRANSCRIBE_BATCHER is not None:
+        await TRANSCRIBE_BATCHER.stop()
 
 
 class TextIn(BaseModel):
@@ -29,30 +180,40 @@ class TextIn(BaseModel):
 
 
 @app.post("/text")
-def post_text(payload: TextIn) -> Dict[str, Any]:
+async def post_text(payload: TextIn):
     if not payload.text or not payload.text.strip():
         raise HTTPException(status_code=400, detail="Empty text")
     out = AdapterOutput(text=payload.text.strip(), source="api_text", meta={"via": "fastapi"})
-    return out.__dict__
+    return _adapter_response(out)
 
 
-@app.post("/transcribe")
-def upload_audio(file: UploadFile = File(...)):
-    # save to temp file and forward to voice adapter
-    suffix = os.path.splitext(file.filename)[1] or ".wav"
-    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-        tmp_path = tmp.name
-        with open(tmp_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
+class TextBatchIn(BaseModel):
+    texts: List[str]
 
+
+@app.post("/text/batch")
+async def post_text_batch(payload: TextBatchIn):
+    # adapters don't interpret language; callers feed the batch to NLUEngine.analyze_many
+    items = [(i, t.strip()) for i, t in enumerate(payload.texts) if t and t.strip()]
+    if not items:
+        raise HTTPException(status_code=400, detail="Empty text batch")
+    return _adapter_response([
+        AdapterOutput(text=t, source="api_text", meta={"via": "fastapi", "batch_index": i})
+        for i, t in items
+    ])
+
+
+@app.post("/transcribe")
+async def upload_audio(file: UploadFile = File(...)):
+    # decode the upload in memory (ffmpeg pipe) and forward the PCM buffer to the batcher
+    data = await file.read()
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty audio upload")
     try:
-        out = VOICE_ADAPTER.transcribe_file(tmp_path)
-        # convert dataclass to dict
-        return out.__dict__
+        if TRANSCRIBE_BATCHER is None:
+            raise RuntimeError("voice adapter not initialised (startup hook did not run)")
+        audio = await run_in_threadpool(_get_voice_adapter().decode_bytes, data)
+        out = await TRANSCRIBE_BATCHER.submit(audio)
+        return _adapter_response(out)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
-    finally:
-        try:
-            os.remove(tmp_path)
-        except Exception:
-            pass
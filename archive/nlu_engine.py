@@ -1,23 +1,103 @@
 # kyrax_core/nlu/nlu_engine.py
 """
 NLU Engine for KYRAX (Phase-2)
-Strategy: deterministic rule-based matching (spaCy patterns + custom rules) first,
-then fallback to a lightweight keyword classifier.
+Strategy: a precompiled regex fast path first, then deterministic rule-based matching
+(spaCy patterns + custom rules), then fallback to a lightweight keyword classifier.
 Outputs a dict: { intent, entities, confidence, source }
 """
 
-from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple, Iterator, Union
+import functools
+import importlib.util
 import re
 
-# Try to import spaCy; give helpful error if missing
+# spaCy is only located here (cheap); it is imported and its model loaded by the first engine that
+# actually needs it (an utterance that misses the regex fast path)
+_HAS_SPACY = importlib.util.find_spec("spacy") is not None
+
+# ---- precompiled patterns for entity extraction (hot path: every analyze() call) ----
+_PREV_REF = r'\b(previous(?:\s+contact)?|last|earlier|one I messaged earlier|one I texted earlier|one I messaged|one I texted|recent(?:ly)?)\b'
+_RE_SEND_TO = re.compile(r'\b(?:send|text)\s+(?P<text>.+?)\s+to\s+(?P<contact>[A-Z][a-zA-Z0-9_\s]+)$', re.I)
+_RE_SEND_TO_SAYING = re.compile(r'\b(?:send|text)\s+(?:a\s+message\s+)?to\s+(?P<contact>[A-Z][a-zA-Z0-9_\s]+?)\s*(?:,|:|\s+said\s+|(?:\s+saying\s+))\s*(?P<text>.+)$', re.I)
+_RE_SEND_CONTACT_TEXT = re.compile(r'\b(?:send|text)\s+(?P<contact>[A-Z][a-zA-Z0-9_\s]+?)\s+(?:a\s+message\s+)?(?:saying|that|:)?\s*(?P<text>.+)$', re.I)
+_RE_PREV = re.compile(r'\b(?:send|text)\s+(?P<text>.+?)\s+to\s+(?P<prev>' + _PREV_REF + r')$', re.I)
+_RE_QUOTED = re.compile(r'["\'](.+?)["\']')
+_RE_QUOTED_CONTACT = re.compile(r'\b(?:send|text)\s+(?P<contact>[A-Z][a-zA-Z0-9_\s]+?)\s+["\']')
+_RE_TO_CONTACT = re.compile(r'\b(?:to|for)\s+([A-Z][a-zA-Z0-9_]+(?:\s+[A-Z][a-zA-Z0-9_]+)*)\b')
+_RE_SAY_TEXT = re.compile(r'(?:say|saying|that|:)\s+["\']?(.+?)["\']?$', re.I)
+_RE_VERB_REST = re.compile(r'\b(?:send|text|message)\s+(.+)$', re.I)
+_RE_TRAILING_TO = re.compile(r'\s+to\s+[A-Z][a-zA-Z0-9_\s]+$')
+_RE_SEND_MSG = re.compile(r'(?:send|text|message)\s+(?:[A-Za-z0-9_]+\s+)?["\']?(?P<msg>[^"\']+?)["\']?$', re.I)
+
+# ---- regex fast path mirroring the spaCy Matcher patterns (label, pattern) ----
+# Verbs are matched case-insensitively (LEMMA/LOWER); names/apps keep the capitalised PROPN shape.
+_FAST_INTENT_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    ("SEND_MESSAGE", r'\b(?i:send)\s+(?:(?i:a)\s+)?(?:(?i:message)\s+)?(?i:to)\s+[A-Z][a-z]+'),
+    ("SEND_MESSAGE", r'\b(?i:text)\s+[A-Z][a-z]+'),
+    ("OPEN_APP", r'\b(?i:open|launch|start)(?i:s|ed|ing)?\s+[A-Z]\w*'),
+    ("TURN_ON", r'\b(?i:turn(?:s|ed|ing)?|switch)\s+(?i:on)\b'),
+    ("TURN_OFF", r'\b(?i:turn(?:s|ed|ing)?|switch)\s+(?i:off)\b'),
+    ("PLAY_MUSIC", r'\b(?i:play(?:s|ed|ing)?)\b'),
+)
+_FAST_INTENT_RE = re.compile("|".join(f"(?P<p{i}>{pat})" for i, (_, pat) in enumerate(_FAST_INTENT_PATTERNS)))
+_FAST_INTENT_DB = None
+
+
+def _fast_intent_db():
+    """Compile the fast-path patterns into one Hyperscan block-mode database (once)."""
+    global _FAST_INTENT_DB
+    if _FAST_INTENT_DB is None:
+        db = hyperscan.Database()
+        n = len(_FAST_INTENT_PATTERNS)
+        db.compile(
+            expressions=[pat.encode() for _, pat in _FAST_INTENT_PATTERNS],
+            ids=list(range(n)),
+            elements=n,
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * n,
+        )
+        _FAST_INTENT_DB = db
+    return _FAST_INTENT_DB
+
+
+def _fast_intent_label(text: str) -> Optional[str]:
+    """
+    Return the Matcher-style label of the leftmost fast-path match (ties -> earliest pattern),
+    or None when nothing matches and the caller should fall through to spaCy.
+    """
+    if _HAS_HYPERSCAN:
+        hits: List[Tuple[int, int]] = []
+
+        def _on_match(pid, start, end, flags, context):
+            hits.append((start, pid))
+
+        _fast_intent_db().scan(text.encode("utf-8"), match_event_handler=_on_match)
+        return _FAST_INTENT_PATTERNS[min(hits)[1]][0] if hits else None
+    m = _FAST_INTENT_RE.search(text)
+    if not m:
+        return None
+    return _FAST_INTENT_PATTERNS[int(m.lastgroup[1:])][0]
+
+
+# Loaded spaCy pipelines + compiled Matchers, shared by every NLUEngine in the process.
+# Keyed by spaCy model name -> (nlp, matcher).
+_NLP_CACHE: Dict[str, Tuple[Any, Any]] = {}
+
+# Optional Aho-Corasick automaton for keyword classification (pip install pyahocorasick)
 try:
-    import spacy
-    from spacy.matcher import Matcher
-    _HAS_SPACY = True
+    import ahocorasick
+    _HAS_AHOCORASICK = True
 except Exception:
-    spacy = None
-    Matcher = None
-    _HAS_SPACY = False
+    ahocorasick = None
+    _HAS_AHOCORASICK = False
+
+# Optional Hyperscan (pip install hyperscan) for the regex fast path; falls back to `re`
+try:
+    import hyperscan
+    _HAS_HYPERSCAN = True
+except Exception:
+    hyperscan = None
+    _HAS_HYPERSCAN = False
 
 # Try to import Command from kyrax_core.command if available (Phase-1)
 try:
@@ -40,39 +120,93 @@ if not _HAS_COMMAND:
             return bool(self.intent)
 
 
+@dataclass(frozen=True)
+class NLUResult:
+    """
+    Immutable NLU output (safe to cache and share between callers).
+    `entities` is stored as (key, value) pairs; use to_dict() for the plain dict form.
+    """
+    intent: Optional[str]
+    entities: Tuple[Tuple[str, Any], ...]
+    confidence: float
+    source: str
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "NLUResult":
+        return cls(
+            intent=d.get("intent"),
+            entities=tuple((d.get("entities") or {}).items()),
+            confidence=float(d.get("confidence", 0.0) or 0.0),
+            source=d.get("source", "nlu"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"intent": self.intent, "entities": dict(self.entities), "confidence": self.confidence, "source": self.source}
+
+
 class NLUEngine:
     def __init__(self, spacy_model: str = "en_core_web_sm"):
         """
         Create engine. It will attempt to load spaCy model lazily.
         """
         self.spacy_model_name = spacy_model
+        # per-engine LRU of analyze() results keyed on the stripped text
+        self._analyze_cached = functools.lru_cache(maxsize=4096)(self._analyze_result)
         self.nlp = None
         self.matcher = None
-        self._load_spacy_if_available()
+        self._spacy_loaded = False  # _load_spacy_if_available() runs on first use, not here
 
         # simple keyword-based intent patterns as fallback
         self.keyword_intents = [
-            ("send_message", ["send", "message", "text", "whatsapp"]),
-            ("open_app", ["open", "launch", "start", "run", "app", "application"]),
-            ("turn_on", ["turn on", "switch on", "enable"]),
-            ("turn_off", ["turn off", "switch off", "disable"]),
-            ("play_music", ["play", "spotify", "music", "song"]),
-            ("search_web", ["search", "google", "look up", "who", "what", "when", "where", "how"]),
-            ("take_note", ["note", "remember", "take note", "write down"]),
+            ("send_message", ("send", "message", "text", "whatsapp")),
+            ("open_app", ("open", "launch", "start", "run", "app", "application")),
+            ("turn_on", ("turn on", "switch on", "enable")),
+            ("turn_off", ("turn off", "switch off", "disable")),
+            ("play_music", ("play", "spotify", "music", "song")),
+            ("search_web", ("search", "google", "look up", "who", "what", "when", "where", "how")),
+            ("take_note", ("note", "remember", "take note", "write down")),
         ]
+        # (intent, keywords, len(keywords)) rows so the classify loop doesn't recompute lengths
+        self._keyword_table: Tuple[Tuple[str, Tuple[str, ...], int], ...] = tuple(
+            (intent, tuple(kws), len(kws)) for intent, kws in self.keyword_intents
+        )
+
+        self._ac = self._build_keyword_automaton()
 
         # simple app/device lists for entity normalization (extendable)
         self.known_apps = {"whatsapp", "telegram", "code", "vscode", "chrome", "edge", "spotify"}
+        # one alternation instead of a regex per app
+        self._RE_APPS = re.compile(r'\b(' + '|'.join(map(re.escape, sorted(self.known_apps))) + r')\b', re.I)
         self.device_keywords = {"light", "fan", "ac", "air conditioner", "tv", "lamp"}
+        # longest first so "air conditioner" wins over shorter overlaps
+        self._device_re = re.compile(
+            r'\b(' + '|'.join(map(re.escape, sorted(self.device_keywords, key=len, reverse=True))) + r')\b', re.I
+        )
+
+    def _ensure_spacy(self) -> bool:
+        """Load spaCy + Matcher on first call; True when the rule-based path is usable."""
+        if not self._spacy_loaded:
+            self._spacy_loaded = True
+            self._load_spacy_if_available()
+        return bool(self.nlp and self.matcher)
 
     def _load_spacy_if_available(self):
         if not _HAS_SPACY:
             return
+        cached = _NLP_CACHE.get(self.spacy_model_name)
+        if cached is not None:
+            self.nlp, self.matcher = cached
+            return
         try:
-            # lazy load on first use
-            self.nlp = spacy.load(self.spacy_model_name, disable=["ner"])  # we'll use matcher and POS
+            import spacy
+            from spacy.matcher import Matcher
+            # load and compile patterns once per process; later engines reuse the cached pair
+            # only tok2vec + tagger + attribute_ruler are needed (Matcher on LOWER/POS);
+            # attribute_ruler stays because it maps tags to the POS values (PROPN) the patterns use
+            self.nlp = spacy.load(self.spacy_model_name, disable=["ner", "parser", "lemmatizer"])
             self.matcher = Matcher(self.nlp.vocab)
             self._register_patterns()
+            _NLP_CACHE[self.spacy_model_name] = (self.nlp, self.matcher)
         except Exception:
             # If model missing, keep nlps None; fallback to keyword classifier will work
             self.nlp = None
@@ -86,41 +220,100 @@ class NLUEngine:
         if not self.matcher:
             return
 
+        # inflected forms matched on LOWER (no lemmatizer in the pipeline)
+        def forms(*words: str) -> Dict[str, Any]:
+            return {"LOWER": {"IN": list(words)}}
+
+        send = forms("send", "sends", "sent", "sending")
+        message = forms("message", "messages")
+
         # pattern for send_message: "send (a) message to X", "text X", "send X a message"
         send_patterns = [
-            [{"LEMMA":"send"}, {"LOWER":"a", "OP":"?"}, {"LEMMA":"message", "OP":"?"}, {"LOWER":"to"}, {"ENT_TYPE":"PERSON", "OP":"+"}],
-            [{"LEMMA":"text"}, {"ENT_TYPE":"PERSON", "OP":"+"}],
-            [{"LOWER":"send"}, {"ENT_TYPE":"PERSON", "OP":"+"}, {"LEMMA":"a", "OP":"?"}, {"LEMMA":"message", "OP":"?"}]
+            [send, {"LOWER":"a", "OP":"?"}, {**message, "OP":"?"}, {"LOWER":"to"}, {"ENT_TYPE":"PERSON", "OP":"+"}],
+            [forms("text", "texts", "texted", "texting"), {"ENT_TYPE":"PERSON", "OP":"+"}],
+            [{"LOWER":"send"}, {"ENT_TYPE":"PERSON", "OP":"+"}, {"LOWER":"a", "OP":"?"}, {**message, "OP":"?"}]
         ]
         self.matcher.add("SEND_MESSAGE", send_patterns)
 
         # open_app: "open vscode", "launch chrome"
         open_patterns = [
-            [{"LEMMA":"open"}, {"POS":"PROPN", "OP":"+"}],
-            [{"LEMMA":"launch"}, {"POS":"PROPN", "OP":"+"}],
-            [{"LEMMA":"start"}, {"POS":"PROPN", "OP":"+"}],
+            [forms("open", "opens", "opened", "opening"), {"POS":"PROPN", "OP":"+"}],
+            [forms("launch", "launches", "launched", "launching"), {"POS":"PROPN", "OP":"+"}],
+            [forms("start", "starts", "started", "starting"), {"POS":"PROPN", "OP":"+"}],
         ]
         self.matcher.add("OPEN_APP", open_patterns)
 
         # turn_on / turn_off patterns
-        self.matcher.add("TURN_ON", [[{"LEMMA":"turn"}, {"LEMMA":"on"}], [{"LOWER":"switch"}, {"LOWER":"on"}]])
-        self.matcher.add("TURN_OFF", [[{"LEMMA":"turn"}, {"LEMMA":"off"}], [{"LOWER":"switch"}, {"LOWER":"off"}]])
+        turn = forms("turn", "turns", "turned", "turning")
+        self.matcher.add("TURN_ON", [[turn, {"LOWER":"on"}], [{"LOWER":"switch"}, {"LOWER":"on"}]])
+        self.matcher.add("TURN_OFF", [[turn, {"LOWER":"off"}], [{"LOWER":"switch"}, {"LOWER":"off"}]])
 
         # play_music
-        self.matcher.add("PLAY_MUSIC", [[{"LEMMA":"play"}, {"LOWER":"music", "OP":"?"}], [{"LEMMA":"play"}, {"POS":"PROPN", "OP":"+"}]])
+        play = forms("play", "plays", "played", "playing")
+        self.matcher.add("PLAY_MUSIC", [[play, {"LOWER":"music", "OP":"?"}], [play, {"POS":"PROPN", "OP":"+"}]])
 
     def analyze(self, text: str) -> Dict[str, Any]:
         """
         Main entry: returns dict {intent, entities, confidence, source}
         Deterministic rules first; fallback to keyword-based.
+        Repeated texts are served from an LRU cache; every call gets its own fresh dict.
         """
-        text = (text or "").strip()
+        return self.analyze_result(text).to_dict()
+
+    def analyze_result(self, text: str) -> NLUResult:
+        """Same as analyze() but returns the cached, immutable NLUResult."""
+        # only whitespace is normalised for the key: case matters to the extractors (names are [A-Z]...)
+        return self._analyze_cached((text or "").strip())
+
+    def _analyze_result(self, text: str) -> NLUResult:
         if not text:
-            return {"intent": None, "entities": {}, "confidence": 0.0, "source": "nlu.empty"}
+            return NLUResult(intent=None, entities=(), confidence=0.0, source="nlu.empty")
+
+        fast = self._analyze_fast(text)
+        if fast is None:
+            doc = self.nlp(text) if self._ensure_spacy() else None
+            fast = self._analyze_with_doc(text, doc)
+        return NLUResult.from_dict(fast)
+
+    def analyze_many(self, texts: List[str], batch_size: int = 64) -> List[Dict[str, Any]]:
+        """
+        Batch variant of analyze(): same result per text, but utterances that miss the
+        fast path are tokenized/tagged together through nlp.pipe instead of one nlp() call each.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        pending: List[Tuple[int, str]] = []
+        for i, raw in enumerate(texts):
+            text = (raw or "").strip()
+            if not text:
+                results[i] = {"intent": None, "entities": {}, "confidence": 0.0, "source": "nlu.empty"}
+                continue
+            fast = self._analyze_fast(text)
+            if fast is not None:
+                results[i] = fast
+            else:
+                pending.append((i, text))
+
+        if pending:
+            if self._ensure_spacy():
+                docs = self.nlp.pipe([t for _, t in pending], batch_size=batch_size)
+            else:
+                docs = (None for _ in pending)
+            for (i, text), doc in zip(pending, docs):
+                results[i] = self._analyze_with_doc(text, doc)
+        return results
+
+    def _analyze_fast(self, text: str) -> Optional[Dict[str, Any]]:
+        # 0) Regex fast path: most short commands resolve here without running the spaCy pipeline
+        label = _fast_intent_label(text)
+        if not label:
+            return None
+        intent = self._map_match_label_to_intent(label)
+        entities = self._heuristic_extract_entities(text)
+        return {"intent": intent, "entities": entities, "confidence": 0.95, "source": "nlu.fast"}
 
+    def _analyze_with_doc(self, text: str, doc) -> Dict[str, Any]:
         # 1) Rule-based (spaCy matcher) — if available
-        if self.nlp and self.matcher:
-            doc = self.nlp(text)
+        if doc is not None:
             matches = self.matcher(doc)
             if matches:
                 # pick highest priority (matcher preserves order of registration)
@@ -160,35 +353,31 @@ class NLUEngine:
         entities = {}
         # PERSON from named entities if model has NER; we disabled NER by default for speed,
         # but if NER is available we should use doc.ents. Try to recover names via PROPN sequences.
+        # single pass over tokens: PROPN names + first known app (token.lower_ is cached by spaCy)
         names = []
+        app = None
         for token in doc:
             if token.pos_ == "PROPN":
                 names.append(token.text)
+            if app is None and token.lower_ in self.known_apps:
+                app = token.lower_
         if names:
             entities["contact"] = " ".join(names)
+        if app:
+            entities["app"] = app
 
-        # apps: check token text against known apps
-        for tok in doc:
-            tl = tok.text.lower()
-            if tl in self.known_apps:
-                entities["app"] = tl
-                break
-
-        # device: noun chunks match known device keywords
-        for chunk in doc.noun_chunks:
-            chunk_text = chunk.text.lower()
-            for dev in self.device_keywords:
-                if dev in chunk_text:
-                    entities.setdefault("device", chunk_text)
-                    break
+        # device: one precompiled scan over the text instead of noun_chunks x device_keywords
+        m_dev = self._device_re.search(text)
+        if m_dev:
+            entities["device"] = m_dev.group(1).lower()
 
         # quoted text or after verbs 'say','tell','text','message'
-        quoted = re.findall(r'["\'](.+?)["\']', text)
+        quoted = _RE_QUOTED.findall(text)
         if quoted:
             entities["text"] = quoted[-1]
         else:
             # try simple pattern 'send X "hello"'
-            m = re.search(r'(?:send|text|message)\s+(?:[A-Za-z0-9_]+\s+)?["\']?(?P<msg>[^"\']+?)["\']?$', text, re.I)
+            m = _RE_SEND_MSG.search(text)
             if m:
                 entities["text"] = m.group("msg").strip()
 
@@ -208,21 +397,21 @@ class NLUEngine:
         t = text.strip()
 
         # 1) explicit "send <text> to <contact>" (non-greedy text capture)
-        m = re.search(r'\b(?:send|text)\s+(?P<text>.+?)\s+to\s+(?P<contact>[A-Z][a-zA-Z0-9_\s]+)$', t, re.I)
+        m = _RE_SEND_TO.search(t)
         if m:
             entities['text'] = m.group('text').strip()
             entities['contact'] = m.group('contact').strip()
             return entities
 
         # 2) "send to <contact> saying <text>" or "send to <contact> <text>"
-        m2 = re.search(r'\b(?:send|text)\s+(?:a\s+message\s+)?to\s+(?P<contact>[A-Z][a-zA-Z0-9_\s]+?)\s*(?:,|:|\s+said\s+|(?:\s+saying\s+))\s*(?P<text>.+)$', t, re.I)
+        m2 = _RE_SEND_TO_SAYING.search(t)
         if m2:
             entities['contact'] = m2.group('contact').strip()
             entities['text'] = m2.group('text').strip()
             return entities
 
         # 3) "send <contact> a message saying <text>" or "text <contact> <text>"
-        m3 = re.search(r'\b(?:send|text)\s+(?P<contact>[A-Z][a-zA-Z0-9_\s]+?)\s+(?:a\s+message\s+)?(?:saying|that|:)?\s*(?P<text>.+)$', t, re.I)
+        m3 = _RE_SEND_CONTACT_TEXT.search(t)
         if m3:
             entities['contact'] = m3.group('contact').strip()
             entities['text'] = m3.group('text').strip()
@@ -230,8 +419,7 @@ class NLUEngine:
 
         # 4) handle "previous / earlier / last" style references:
         #    e.g. "send hi to previous contact", "send to the one I messaged earlier saying hi"
-        prev_pattern = r'\b(previous(?:\s+contact)?|last|earlier|one I messaged earlier|one I texted earlier|one I messaged|one I texted|recent(?:ly)?)\b'
-        m_prev = re.search(r'\b(?:send|text)\s+(?P<text>.+?)\s+to\s+(?P<prev>' + prev_pattern + r')$', t, re.I)
+        m_prev = _RE_PREV.search(t)
         if m_prev:
             entities['text'] = m_prev.group('text').strip()
             # mark contact with a pronoun-like token so context_logger can fill it
@@ -239,10 +427,10 @@ class NLUEngine:
             return entities
 
         # 5) quoted text fallback: "send Rohit 'hello world'"
-        quoted = re.findall(r'["\'](.+?)["\']', t)
+        quoted = _RE_QUOTED.findall(t)
         if quoted:
             # try to also find a contact name before the quote
-            mq = re.search(r'\b(?:send|text)\s+(?P<contact>[A-Z][a-zA-Z0-9_\s]+?)\s+["\']', t)
+            mq = _RE_QUOTED_CONTACT.search(t)
             if mq:
                 entities['contact'] = mq.group('contact').strip()
             entities['text'] = quoted[-1]
@@ -250,32 +438,67 @@ class NLUEngine:
 
         # 6) app detection and simple to/for contact single token fallback
         # look for contact in "to X" minimal
-        m_to = re.search(r'\b(?:to|for)\s+([A-Z][a-zA-Z0-9_]+(?:\s+[A-Z][a-zA-Z0-9_]+)*)\b', t)
+        m_to = _RE_TO_CONTACT.search(t)
         if m_to:
             entities["contact"] = m_to.group(1).strip()
 
         # app tokens
-        for app in self.known_apps:
-            if re.search(r'\b' + re.escape(app) + r'\b', t, re.I):
-                entities["app"] = app
-                break
+        m_app = self._RE_APPS.search(t)
+        if m_app:
+            entities["app"] = m_app.group(1).lower()
 
         # quoted/or fallback for text (if user used 'say' or 'saying')
-        q = re.findall(r'(?:say|saying|that|:)\s+["\']?(.+?)["\']?$', t, re.I)
+        q = _RE_SAY_TEXT.findall(t)
         if q:
             entities["text"] = q[-1].strip()
         else:
             # fallback: everything after the verb as text
-            m_f = re.search(r'\b(?:send|text|message)\s+(.+)$', t, re.I)
+            m_f = _RE_VERB_REST.search(t)
             if m_f:
                 # careful: strip trailing "to <contact>" if present (defensive)
                 val = m_f.group(1).strip()
-                val = re.sub(r'\s+to\s+[A-Z][a-zA-Z0-9_\s]+$', '', val)
+                val = _RE_TRAILING_TO.sub('', val)
                 entities["text"] = val.strip()
 
         return entities
 
 
+    def _build_keyword_automaton(self):
+        """
+        Build one Aho-Corasick automaton over every keyword in _keyword_table.
+        Each keyword maps to the (intent_idx, kw_idx) pairs it belongs to.
+        Returns None when pyahocorasick is not installed (plain substring scan is used instead).
+        """
+        if not _HAS_AHOCORASICK:
+            return None
+        owners: Dict[str, List[Tuple[int, int]]] = {}
+        for i, (_, keywords, _) in enumerate(self._keyword_table):
+            for j, kw in enumerate(keywords):
+                owners.setdefault(kw, []).append((i, j))
+        ac = ahocorasick.Automaton()
+        for kw, refs in owners.items():
+            ac.add_word(kw, tuple(refs))
+        ac.make_automaton()
+        return ac
+
+    def _keyword_hit_counts(self, text_l: str) -> Iterator[int]:
+        """
+        Yield the number of distinct keywords of each intent found in text_l (aligned with _keyword_table).
+        Without the automaton the counts are computed lazily, so a caller that stops early skips the rest.
+        """
+        if self._ac is not None:
+            counts = [0] * len(self._keyword_table)
+            seen = set()
+            for _, refs in self._ac.iter(text_l):
+                for ref in refs:
+                    if ref not in seen:
+                        seen.add(ref)
+                        counts[ref[0]] += 1
+            yield from counts
+            return
+        for _, keywords, _ in self._keyword_table:
+            yield sum(1 for kw in keywords if kw in text_l)
+
     def _keyword_classify(self, text: str) -> Tuple[Optional[str], float]:
         """
         Very simple keyword-count classifier. Returns (intent, confidence).
@@ -285,14 +508,13 @@ class NLUEngine:
 
         best = None
         best_score = 0.0
-        for intent, keywords in self.keyword_intents:
-            score = 0
-            for kw in keywords:
-                if kw in text_l:
-                    score += 1
+        for (intent, _, n_keywords), score in zip(self._keyword_table, self._keyword_hit_counts(text_l)):
             # normalize score
             if score > 0:
-                s = score / len(keywords)
+                s = score / n_keywords
+                if s >= 1.0:
+                    # every keyword present: nothing later can score higher (ties keep the earlier intent)
+                    return (intent, 0.9)
                 if s > best_score:
                     best_score = s
                     best = intent
@@ -304,10 +526,12 @@ class NLUEngine:
         return (best, conf)
 
     # ---- convenience mapper to Command (optional) ----
-    def map_to_command(self, nlu_result: Dict[str, Any], default_domain_map: Optional[Dict[str,str]] = None) -> Command:
+    def map_to_command(self, nlu_result: Union[Dict[str, Any], NLUResult], default_domain_map: Optional[Dict[str,str]] = None) -> Command:
         """
-        Convert NLU result into Command object (Phase-1 Command). This is the canonical bridge.
+        Convert NLU result (dict or NLUResult) into Command object (Phase-1 Command). This is the canonical bridge.
         """
+        if isinstance(nlu_result, NLUResult):
+            nlu_result = nlu_result.to_dict()
         intent = nlu_result.get("intent")
         entities = nlu_result.get("entities", {}) or {}
         confidence = float(nlu_result.get("confidence", 0.0) or 0.0)
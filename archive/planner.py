@@ -1,4 +1,5 @@
 # kyrax_core/planner.py
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 import re
 from datetime import datetime
@@ -18,6 +19,49 @@ INTENT_TO_DOMAIN = {
 }
 
 
+@dataclass
+class PlanSoA:
+    """
+    Column (structure-of-arrays) view of a plan: parallel lists, one entry per step.
+    Lets callers zip() through steps without touching Command attributes; `command(i)`
+    builds the Command for a step only when one is actually needed.
+    """
+    intents: List[str] = field(default_factory=list)
+    domains: List[str] = field(default_factory=list)
+    entities: List[Dict[str, Any]] = field(default_factory=list)
+    confidences: List[float] = field(default_factory=list)
+    sources: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.intents)
+
+    def append(self, intent: str, domain: str, entities: Dict[str, Any], confidence: float, source: str) -> None:
+        self.intents.append(intent)
+        self.domains.append(domain)
+        self.entities.append(entities)
+        self.confidences.append(confidence)
+        self.sources.append(source)
+
+    def command(self, i: int) -> Command:
+        return Command(
+            intent=self.intents[i],
+            domain=self.domains[i],
+            entities=self.entities[i],
+            confidence=self.confidences[i],
+            source=self.sources[i],
+        )
+
+    def commands(self) -> List[Command]:
+        return [self.command(i) for i in range(len(self))]
+
+    @classmethod
+    def from_commands(cls, commands: List[Command]) -> "PlanSoA":
+        soa = cls()
+        for c in commands:
+            soa.append(c.intent, c.domain, c.entities, c.confidence, c.source)
+        return soa
+
+
 class TaskPlanner:
     """
     Simple Task Planner (Brain) that decomposes high-level goals into
@@ -56,6 +100,12 @@ class TaskPlanner:
         Plan a list of Command objects from a goal string and optional context.
         `context` is a plain dict (e.g., {"last_file": "talk_v2.pptx", ...}).
         """
+        return self.plan_soa(goal, context).commands()
+
+    def plan_soa(self, goal: str, context: Optional[Dict[str, Any]] = None) -> PlanSoA:
+        """
+        Same plan as `plan()`, returned as parallel columns (PlanSoA) instead of Command objects.
+        """
         goal = (goal or "").strip().lower()
         context = context or {}
 
@@ -71,31 +121,18 @@ class TaskPlanner:
         # 2) Expand placeholders with context where possible
         steps = [self._expand_placeholders(step, context) for step in steps]
 
-        # 3) Convert to Command objects
-        commands: List[Command] = []
+        # 3) Convert to plan columns
+        soa = PlanSoA()
         for s in steps:
             intent = s.get("intent", "unknown_plan")
             entities = s.get("entities", {}) or {}
             domain = INTENT_TO_DOMAIN.get(intent, "generic")
-            cmd = Command(
-                intent=intent,
-                domain=domain,
-                entities=entities,
-                confidence=0.9,            # planner-confidence (tunable)
-                source="planner"
-            )
-            commands.append(cmd)
+            soa.append(intent, domain, entities, 0.9, "planner")  # planner-confidence (tunable)
 
         # if planner produced nothing, emit a safe fallback command
-        if not commands:
-            commands.append(Command(
-                intent="unknown_plan",
-                domain="system",
-                entities={"goal": goal},
-                confidence=0.5,
-                source="planner"
-            ))
-        return commands
+        if not len(soa):
+            soa.append("unknown_plan", "system", {"goal": goal}, 0.5, "planner")
+        return soa
 
     def execute_plan(self, commands: List[Command], dispatcher) -> List[Any]:
         """
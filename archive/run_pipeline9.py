@@ -6,127 +6,274 @@ Full example pipeline integrating:
  - intent_mapper -> CommandBridge
  - CommandBuilder (with optional contacts resolver + raw_text)
  - ContactResolver (canonicalization + fuzzy lookup)
- - AIReasoner (LLM adapter optional via OPENAI_API_KEY env var)
+ - AIReasoner (Gemini-backed LLM callables)
  - Dispatcher -> SkillRegistry -> Playwright-backed WhatsAppSkill
 
 Notes:
  - Ensure data/contacts.json exists and contains your contacts.
- - If you want LLM-backed reasoning, set OPENAI_API_KEY in env (optional).
  - This script is defensive: it works even if some optional pieces
-   (OpenAI, builder contacts arg) are not installed/updated.
+   (builder contacts arg) are not installed/updated.
 """
 
-import os
+import argparse
+import asyncio
+import inspect
+import re
+import threading
 import time
 import logging
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
+# Optional Hyperscan (pip install hyperscan; Linux only) to gate the send extractor; falls back to `re`
+try:
+    import hyperscan
+    _HAS_HYPERSCAN = True
+except Exception:
+    hyperscan = None
+    _HAS_HYPERSCAN = False
+
 # core pipeline pieces
-# use Gemini-backed LLM NLU
-from kyrax_core.llm.gemini_client import GeminiClient
-from kyrax_core.nlu.llm_nlu import LLMNLU
+# (Gemini client / LLMNLU and the Playwright WhatsApp skill are imported inside main(),
+#  so importing this module for its parsers stays cheap)
 from kyrax_core.intent_mapper import map_nlu_to_command
 from kyrax_core.command_builder import CommandBuilder
 from kyrax_core.context_logger import ContextLogger
 from kyrax_core.skill_registry import SkillRegistry
 from kyrax_core.dispatcher import Dispatcher
 from kyrax_core.command import Command
-from kyrax_core.ai_reasoner import AIReasoner
 # utils we added
 from kyrax_core.contact_resolver import ContactResolver
 from kyrax_core.ai_reasoner import AIReasoner
 
-# skills
-from skills.whatsapp_skill import WhatsAppSkill
-
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger("run_pipeline")
 
 
 # -------------------------
-# Optional OpenAI adapter
+# Helper clause splitter
 # -------------------------
-def get_openai_llm_callable():
-    """
-    Return a callable llm(prompt, max_tokens) -> str if openai is configured.
-    Returns None if openai is not available or API key not set.
-    """
-    try:
-        import openai
-    except Exception:
-        return None
-
-    api_key = os.environ.get("OPENAI_API_KEY") or openai.api_key
-    if not api_key:
-        return None
-    openai.api_key = api_key
-
-    def llm(prompt: str, max_tokens: int = 512) -> str:
-        # Use Chat Completions (gpt-3.5/4 whatever is available)
-        try:
-            resp = openai.ChatCompletion.create(
-                model=os.environ.get("OPENAI_MODEL", "gpt-3.5-turbo"),
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=0.0,
-            )
-            return resp.choices[0].message.content
-        except Exception as e:
-            raise
-
-    return llm
+# patterns compiled once at import; the helpers below run on every CLI turn
+_CLAUSE_SPLIT_RE = re.compile(r'\b(?:and then|then|, then|,|;|\band\b|\bthen\b)\b', re.I)
+_SEND_PATTERNS = [
+    re.compile(p, re.I) for p in (
+        r'send (?:a )?message to (?P<contact>[^,;]+?) saying (?P<text>[^,;]+)',
+        r'text (?P<contact>[^,;]+?) saying (?P<text>[^,;]+)',
+        r'send (?P<text>[^,;]+?) to (?P<contact>[^,;]+)$',
+        # generic: "send a message to A saying X and to B saying Y" will be split by clause splitter then matched
+    )
+]
+# All three send shapes fused into one alternation scanned over the whole input. A field may not
+# cross a clause boundary (",", ";", " and ", " then "); each match must end at one, like the
+# per-clause matching this replaces.
+_SEND_FIELD = r'(?:(?!\s+(?:and|then)\s)[^,;])+?'
+_SEND_END = r'(?=\s*[,;]|\s+(?:and|then)\s|\s*$)'
+_SEND_GLOBAL = re.compile(
+    rf'send (?:a )?message to (?P<c1>{_SEND_FIELD}) saying (?P<t1>{_SEND_FIELD}){_SEND_END}'
+    rf'|text (?P<c2>{_SEND_FIELD}) saying (?P<t2>{_SEND_FIELD}){_SEND_END}'
+    rf'|send (?P<t3>{_SEND_FIELD}) to (?P<c3>{_SEND_FIELD}){_SEND_END}',
+    re.I,
+)
+
+# Hyperscan can't capture groups or evaluate lookaheads, so it only answers "could any send shape
+# be in here?" in one DFA pass; the captures are still taken by _SEND_GLOBAL on a hit.
+_SEND_GATE_PATTERNS = (
+    r'send\s.*\sto\s',
+    r'text\s.*\ssaying\s',
+)
+_SEND_GATE_DB = None
+
+
+def _send_gate_db():
+    """Compile the send gate patterns into one Hyperscan block-mode database (once)."""
+    global _SEND_GATE_DB
+    if _SEND_GATE_DB is None:
+        db = hyperscan.Database()
+        n = len(_SEND_GATE_PATTERNS)
+        db.compile(
+            expressions=[pat.encode() for pat in _SEND_GATE_PATTERNS],
+            ids=list(range(n)),
+            elements=n,
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_DOTALL | hyperscan.HS_FLAG_SINGLEMATCH] * n,
+        )
+        _SEND_GATE_DB = db
+    return _SEND_GATE_DB
+
+
+def _may_contain_send(raw: str) -> bool:
+    """False only when no send shape can match `raw`; always True without Hyperscan."""
+    if not _HAS_HYPERSCAN:
+        return True
+    hits: List[int] = []
+
+    def _on_match(pid, start, end, flags, context):
+        hits.append(pid)
+        return True  # stop scanning at the first hit
+
+    _send_gate_db().scan(raw.encode("utf-8"), match_event_handler=_on_match)
+    return bool(hits)
 
 
-# -------------------------
-# Helper clause splitter
-# -------------------------
 def split_clauses(raw: str) -> List[str]:
-    import re
-    parts = re.split(r'\b(?:and then|then|, then|,|;|\band\b|\bthen\b)\b', raw, flags=re.I)
-    return [p.strip() for p in parts if p.strip()]
+    return [p.strip() for p in _CLAUSE_SPLIT_RE.split(raw) if p.strip()]
+
 
-import re
 def extract_send_commands(raw: str):
     """
     Conservative extractor: returns list of dicts {contact, text}
     Looks for common patterns; returns [] if none.
     """
-    patterns = [
-        r'send (?:a )?message to (?P<contact>[^,;]+?) saying (?P<text>[^,;]+)',
-        r'text (?P<contact>[^,;]+?) saying (?P<text>[^,;]+)',
-        r'send (?P<text>[^,;]+?) to (?P<contact>[^,;]+)$',
-        # generic: "send a message to A saying X and to B saying Y" will be split by clause splitter then matched
-    ]
     out = []
-    s = raw.strip()
-    # try global matches for multiple occurrences (split by comma/and then try)
-    clauses = re.split(r',\s*|\s+and\s+|\s+then\s+', s, flags=re.I)
-    for c in clauses:
-        c = c.strip()
-        for pat in patterns:
-            m = re.search(pat, c, flags=re.I)
-            if m:
-                contact = m.groupdict().get("contact") and m.groupdict().get("contact").strip()
-                text = m.groupdict().get("text") and m.groupdict().get("text").strip()
-                if contact and text:
-                    out.append({"contact": contact, "text": text})
-                    break
+    if not _may_contain_send(raw):
+        return out
+    # single scan over the whole input; one match per send clause
+    for m in _SEND_GLOBAL.finditer(raw.strip()):
+        contact = (m["c1"] or m["c2"] or m["c3"]).strip()
+        text = (m["t1"] or m["t2"] or m["t3"]).strip()
+        if contact and text:
+            out.append({"contact": contact, "text": text})
     return out
 
+# -------------------------
+# Local fast-path intent classifier
+# -------------------------
+class LocalIntentClassifier:
+    """
+    Regex/keyword classifier for common single-clause commands so they skip the Gemini round-trip.
+    analyze(raw) returns the same shape as LLMNLU.analyze: {intent, entities, confidence, source}.
+    A confidence of 0.0 (intent None) means "no local match" -> caller falls back to the LLM.
+    """
+
+    RULES = {
+        # send_message reuses the extractor patterns above
+        "send_message": [(pat, 0.9) for pat in _SEND_PATTERNS],
+        "open_app": [
+            (re.compile(r'^(?:please\s+)?(?:open|launch|start)\s+(?:the\s+)?(?P<app>[\w .+-]+?)(?:\s+app)?$', re.I), 0.85),
+        ],
+        "close_app": [
+            (re.compile(r'^(?:please\s+)?(?:close|quit|kill)\s+(?:the\s+)?(?P<app>[\w .+-]+?)(?:\s+app)?$', re.I), 0.85),
+        ],
+        "set_volume": [
+            (re.compile(r'^(?:please\s+)?(?:set\s+)?(?:the\s+)?volume\s+(?:to\s+|at\s+)?(?P<level>\d{1,3})\s*(?:%|percent)?$', re.I), 0.9),
+        ],
+        "mute": [(re.compile(r'^(?:please\s+)?mute(?:\s+(?:the\s+)?(?:volume|sound|audio))?$', re.I), 0.9)],
+        "unmute": [(re.compile(r'^(?:please\s+)?unmute(?:\s+(?:the\s+)?(?:volume|sound|audio))?$', re.I), 0.9)],
+        "delete_file": [
+            (re.compile(r'^(?:please\s+)?(?:delete|remove)\s+(?:the\s+)?file\s+(?P<path>\S+)$', re.I), 0.85),
+        ],
+    }
+
+    def analyze(self, raw: str) -> dict:
+        text = (raw or "").strip()
+        for intent, rules in self.RULES.items():
+            for pat, conf in rules:
+                m = pat.search(text) if intent == "send_message" else pat.match(text)
+                if not m:
+                    continue
+                entities = {k: v.strip() for k, v in m.groupdict().items() if v and v.strip()}
+                if intent == "send_message" and not ("contact" in entities and "text" in entities):
+                    continue
+                return {"intent": intent, "entities": entities, "confidence": conf, "source": "local_nlu"}
+        return {"intent": None, "entities": {}, "confidence": 0.0, "source": "local_nlu"}
+
+
+# minimum local confidence to skip the LLM NLU call
+LOCAL_NLU_MIN_CONFIDENCE = 0.6
+
+# seconds between background keepalive rounds in the REPL
+KEEPALIVE_INTERVAL_S = 30
+
+
+# -------------------------
+# Non-interactive batch mode
+# -------------------------
+def run_batch_file(path, nlu, local_nlu, builder, ctx_logger, resolver, dispatcher):
+    """
+    Run one command per line of `path` without prompting.
+    Local parsers go first; every line they can't handle is sent to Gemini in ONE batch job
+    (nlu.analyze_batch) instead of one sync call per line. Lines are then built and dispatched
+    in file order; anything needing clarification is reported and skipped.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [ln.strip() for ln in f if ln.strip() and not ln.lstrip().startswith("#")]
+
+    # 1) local NLU pass: list of NLU-shaped dicts per line (None = needs the LLM)
+    per_line = []
+    for raw in lines:
+        sends = extract_send_commands(raw)
+        if sends:
+            per_line.append([
+                {"intent": "send_message", "entities": {"contact": c["contact"], "text": c["text"]},
+                 "confidence": 0.9, "source": "local_parser"}
+                for c in sends
+            ])
+            continue
+        res = local_nlu.analyze(raw)
+        per_line.append([res] if res["confidence"] >= LOCAL_NLU_MIN_CONFIDENCE else None)
+
+    # 2) single batch submission for the leftovers
+    llm_idx = [i for i, r in enumerate(per_line) if r is None]
+    if llm_idx:
+        print(f"Submitting {len(llm_idx)} line(s) to Gemini batch NLU...")
+        for i, res in zip(llm_idx, nlu.analyze_batch([lines[i] for i in llm_idx])):
+            per_line[i] = [res]
+
+    # 3) build + dispatch in file order
+    for raw, results in zip(lines, per_line):
+        print(f"\n> {raw}")
+        for nlu_res in results:
+            cmd_bridge = map_nlu_to_command({
+                "intent": nlu_res.get("intent"),
+                "slots": nlu_res.get("entities") or {},
+                "confidence": nlu_res.get("confidence", 0.0),
+                "meta": {"source": nlu_res.get("source")}
+            }, source="batch")
+            cmd_validated, issues = builder.build({
+                "intent": cmd_bridge.intent,
+                "entities": cmd_bridge.entities,
+                "confidence": cmd_bridge.confidence,
+                "source": cmd_bridge.source
+            }, source=cmd_bridge.source, context_logger=ctx_logger, raw_text=raw, contacts_registry=resolver)
+            if issues or cmd_validated is None:
+                print("Skipped (needs clarification):", issues)
+                continue
+            res = dispatcher.execute(cmd_validated)
+            print("Result:", res)
+            if res.success:
+                ctx_logger.update_from_command(cmd_validated)
+
+
 # -------------------------
 # Main CLI pipeline
 # -------------------------
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="KYRAX CLI pipeline")
+    parser.add_argument("--batch-file", help="run commands from a file (one per line) using Gemini batch NLU, then exit")
+    args = parser.parse_args(argv)
+
     print("Starting KYRAX pipeline (examples/run_pipeline.py)")
 
+    # heavy imports deferred to first use (google-genai, Playwright)
+    from kyrax_core.llm.gemini_client import GeminiClient
+    from kyrax_core.nlu.llm_nlu import LLMNLU
+    from skills.whatsapp_skill import WhatsAppSkill
+
 
 
     # instantiate Gemini adapter (optionally pass model name)
     gemini = GeminiClient()  # or "text-bison-001" if your project uses that model id
     nlu = LLMNLU(gemini_client=gemini)
+    local_nlu = LocalIntentClassifier()
 
     builder = CommandBuilder()
+    # Older builders lack raw_text / contacts_registry: check the signature once instead of
+    # probing with try/except TypeError on every turn.
+    _build_params = set(inspect.signature(builder.build).parameters)
+
+    def build_extra(**optional):
+        return {k: v for k, v in optional.items() if k in _build_params}
+
     ctx_logger = ContextLogger(max_entries=200, ttl_seconds=3600)
     registry = SkillRegistry()
 
@@ -134,11 +281,20 @@ def main():
     # This avoids TypeError: ContactResolver.__init__() got an unexpected keyword argument 'contacts_path'
     resolver = ContactResolver("data/contacts.json")
 
-    # AI reasoner with optional OpenAI adapter
-    # llm_callable = get_openai_llm_callable()
+    # AI reasoner backed by Gemini
     # provide a simple callable: llm_callable(prompt, max_tokens)
     llm_callable = lambda prompt, max_tokens=512: gemini.complete(prompt, max_tokens=max_tokens, temperature=0.0)
-    reasoner = AIReasoner(llm=llm_callable)
+    llm_async = lambda prompt, max_tokens=512: gemini.complete_async(prompt, max_tokens=max_tokens, temperature=0.0)
+    llm_stream = lambda prompt, max_tokens=512: gemini.stream(prompt, max_tokens=max_tokens, temperature=0.0)
+    reasoner = AIReasoner(llm=llm_callable, llm_async=llm_async, llm_stream=llm_stream)
+    # one loop for the whole session, running in a background thread: the genai aio transport
+    # stays bound to it across turns, and keepalive work runs while input() waits for the user
+    loop = asyncio.new_event_loop()
+    loop_thread = threading.Thread(target=loop.run_forever, name="kyrax_loop", daemon=True)
+    loop_thread.start()
+
+    def run_async(coro):
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
 
     # Register skills (Playwright WhatsApp skill)
     wa_profile = r"C:\Users\HP\kyrax_wa_profile"  # change to your path
@@ -149,9 +305,27 @@ def main():
 
     dispatcher = Dispatcher(registry=registry)
 
-    print("KYRAX CLI (type 'exit' to quit). Example: send a message to Akshat: 'send a message to Akshat saying hi'")
+    async def keepalive():
+        # warm Gemini's connection, prune expired context and revive a closed WhatsApp tab
+        # during user think-time instead of on the next command
+        while True:
+            try:
+                ctx_logger.prune()
+                await asyncio.to_thread(gemini.warmup)
+                await asyncio.to_thread(wa_skill.keepalive)
+            except Exception as e:
+                log.debug("keepalive failed: %s", e)
+            await asyncio.sleep(KEEPALIVE_INTERVAL_S)
+
+    keepalive_task = asyncio.run_coroutine_threadsafe(keepalive(), loop)
 
     try:
+        if args.batch_file:
+            run_batch_file(args.batch_file, nlu, local_nlu, builder, ctx_logger, resolver, dispatcher)
+            return
+
+        print("KYRAX CLI (type 'exit' to quit). Example: send a message to Akshat: 'send a message to Akshat saying hi'")
+
         while True:
             try:
                 raw = input("\n> ").strip()
@@ -202,30 +376,25 @@ def main():
             multi_cmds = extract_send_commands(raw)
             if multi_cmds:  # Handle even single commands (len >=1) to bypass Gemini
                 print(f"Detected {len(multi_cmds)} send-message task(s) (local parser). Executing sequentially.")
-                for step in multi_cmds:
+                # resolve every contact up front: local matches first, leftovers in ONE LLM call
+                resolved = resolver.resolve_batch([c["contact"] for c in multi_cmds], llm=llm_callable)
+                ready = []
+                for step, canonical in zip(multi_cmds, resolved):
                     nlu_like = {
                         "intent": "send_message",
                         "entities": {
-                            "contact": step["contact"],
+                            "contact": canonical or step["contact"],
                             "text": step["text"],
                         },
                         "confidence": 0.9,
                         "source": "local_parser",
                     }
-                    try:
-                        cmd_validated, issues = builder.build(
-                            nlu_like,
-                            source="local_parser",
-                            context_logger=ctx_logger,
-                            raw_text=raw,
-                            contacts_registry=resolver,
-                        )
-                    except TypeError:
-                        cmd_validated, issues = builder.build(
-                            nlu_like,
-                            source="local_parser",
-                            context_logger=ctx_logger,
-                        )
+                    cmd_validated, issues = builder.build(
+                        nlu_like,
+                        source="local_parser",
+                        context_logger=ctx_logger,
+                        **build_extra(raw_text=raw, contacts_registry=resolver),
+                    )
                     if issues:
                         print("Builder issues:", issues)
                         # auto-resolve single candidate
@@ -237,10 +406,18 @@ def main():
                                 print("Cannot resolve contact:", step["contact"])
                                 continue
                     if cmd_validated:
+                        ready.append(cmd_validated)
+
+                # dispatch all validated sends together; the WhatsApp skill queues them on its worker
+                if ready:
+                    for cmd_validated in ready:
                         print("Executing:", cmd_validated)
-                        res = dispatcher.execute(cmd_validated)
+                    results = run_async(asyncio.gather(
+                        *[dispatcher.execute_async(c) for c in ready], return_exceptions=True
+                    ))
+                    for cmd_validated, res in zip(ready, results):
                         print("Result:", res)
-                        if res.success:
+                        if not isinstance(res, BaseException) and res.success:
                             ctx_logger.update_from_command(cmd_validated)
                 continue  # 🚨 IMPORTANT: do NOT fall through to AIReasoner or NLU/Gemini
 
@@ -248,36 +425,51 @@ def main():
             clauses = split_clauses(raw)
             is_compound = len(clauses) > 1
 
-            # If we have an LLM and the user wrote a compound sentence, ask reasoner for proposals
+            # If we have an LLM and the user wrote a compound sentence, ask reasoner for a plan.
+            # Steps are streamed: step k is dispatched on a worker while step k+1 is still generating.
             if is_compound and reasoner and llm_callable:
-                try:
-                    proposals = reasoner.propose_and_validate_plan(raw, context=ctx_logger.get_all() if hasattr(ctx_logger, "get_all") else {}, command_builder=builder, max_candidates=1)
-                except Exception:
-                    proposals = []
-
-                if proposals:
-                    # proposals is list of tuples (PlanProposal, [(Command|None, issues), ...])
-                    plan, validated = proposals[0]
-                    print(f"AI proposed plan: {plan.explanation} (score={plan.score:.2f})")
-                    for idx, (cmd_obj, issues) in enumerate(validated, start=1):
-                        print(f" Step {idx}: {cmd_obj}  issues={issues}")
-                        if issues:
-                            print("  -> Issues found; will skip execution of this step unless clarified.")
-                        else:
-                            # Execute validated command
+                got_steps = False
+                pending = []
+                with ThreadPoolExecutor(max_workers=1, thread_name_prefix="plan_dispatch") as step_pool:
+                    try:
+                        step_stream = reasoner.propose_stream(raw, context=ctx_logger.get_all() if hasattr(ctx_logger, "get_all") else {}, command_builder=builder)
+                        for idx, (pc, cmd_obj, issues) in enumerate(step_stream, start=1):
+                            got_steps = True
+                            if pc.intent == "ask_clarify":
+                                print("AI needs clarification:", pc.entities.get("question"))
+                                break
+                            print(f" Step {idx}: {cmd_obj}  issues={issues}")
+                            if issues:
+                                print("  -> Issues found; will skip execution of this step unless clarified.")
+                                continue
+                            # Execute validated command (in order, on the single dispatch worker)
                             print(f" Executing: {cmd_obj}")
-                            res = dispatcher.execute(cmd_obj)
-                            print("  Result:", res)
-                            if res.success:
-                                try:
-                                    ctx_logger.update_from_command(cmd_obj)
-                                except Exception:
-                                    pass
+                            pending.append((cmd_obj, step_pool.submit(dispatcher.execute, cmd_obj)))
+                    except Exception as e:
+                        print("AI reasoner error:", e)
+
+                    for cmd_obj, fut in pending:
+                        try:
+                            res = fut.result()
+                        except Exception as e:
+                            print("  Dispatch error:", e)
+                            continue
+                        print("  Result:", res)
+                        if res.success:
+                            try:
+                                ctx_logger.update_from_command(cmd_obj)
+                            except Exception:
+                                pass
+
+                if got_steps:
                     # After handling the plan, go to next user input
                     continue
 
             # --- Single-clause / fallback path: NLU -> map -> build -> dispatch
-            nlu_res = nlu.analyze(raw)
+            # local classifier first; only low-confidence inputs pay for the Gemini round-trip
+            nlu_res = local_nlu.analyze(raw)
+            if nlu_res["confidence"] < LOCAL_NLU_MIN_CONFIDENCE:
+                nlu_res = nlu.analyze(raw)
             print("NLU:", nlu_res)
 
             # Use the bridge to get a Command-like object
@@ -300,32 +492,13 @@ def main():
                 "context_logger": ctx_logger,
             }
 
-            # The official builder.build signature may accept `raw_text` and `contacts_registry`.
-            # Try to pass them; if builder doesn't accept them, fall back gracefully.
-            try:
-                cmd_validated, issues = builder.build(
-                    built_kwargs["nlu_result"],
-                    source=built_kwargs["source"],
-                    context_logger=built_kwargs["context_logger"],
-                    raw_text=raw,
-                    contacts_registry=resolver
-                )
-            except TypeError:
-                # try without contacts_registry and raw_text
-                try:
-                    cmd_validated, issues = builder.build(
-                        built_kwargs["nlu_result"],
-                        source=built_kwargs["source"],
-                        context_logger=built_kwargs["context_logger"],
-                    )
-                except TypeError:
-                    # older builder that expects the nlu_result as simple dict positional - try minimal call
-                    cmd_validated, issues = builder.build({
-                        "intent": cmd_bridge.intent,
-                        "entities": cmd_bridge.entities,
-                        "confidence": cmd_bridge.confidence,
-                        "source": cmd_bridge.source
-                    }, source=cmd_bridge.source, context_logger=ctx_logger)
+            # optional kwargs (raw_text / contacts_registry) filtered once at startup, see build_extra()
+            cmd_validated, issues = builder.build(
+                built_kwargs["nlu_result"],
+                source=built_kwargs["source"],
+                context_logger=built_kwargs["context_logger"],
+                **build_extra(raw_text=raw, contacts_registry=resolver)
+            )
 
             # Normalize return shape if builder returns 3-tuple by mistake
             if isinstance(cmd_validated, tuple) and len(cmd_validated) == 3:
@@ -369,22 +542,8 @@ def main():
                         else:
                             sel = choice
                         if sel:
-                            # patch cmd_bridge and rebuild
-                            cmd_bridge.entities["contact"] = sel
-                            try:
-                                cmd_validated, issues = builder.build({
-                                    "intent": cmd_bridge.intent,
-                                    "entities": cmd_bridge.entities,
-                                    "confidence": cmd_bridge.confidence,
-                                    "source": cmd_bridge.source
-                                }, source=cmd_bridge.source, context_logger=ctx_logger, raw_text=raw, contacts_registry=resolver)
-                            except TypeError:
-                                cmd_validated, issues = builder.build({
-                                    "intent": cmd_bridge.intent,
-                                    "entities": cmd_bridge.entities,
-                                    "confidence": cmd_bridge.confidence,
-                                    "source": cmd_bridge.source
-                                }, source=cmd_bridge.source, context_logger=ctx_logger)
+                            # re-validate just the clarified contact (no full rebuild / context refill)
+                            cmd_validated, issues = builder.patch(cmd_bridge, {"contact": sel}, contacts_registry=resolver)
                             if issues:
                                 print("Builder issues after clarification:", issues)
                                 if cmd_validated is None:
@@ -432,6 +591,11 @@ def main():
                         pass
         except Exception:
             pass
+        keepalive_task.cancel()
+        gemini.close()
+        loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join(timeout=5)
+        loop.close()
         print("Goodbye.")
 
 
@@ -1,9 +1,20 @@
 # kyrax_core/adapters/voice_adapter.py
 import os
+import subprocess
 import tempfile
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, List, Union
 from .base import InputAdapter, AdapterOutput
 
+# Prefer faster-whisper (CTranslate2 backend, batched inference); fall back to openai-whisper.
+try:
+    from faster_whisper import WhisperModel, BatchedInferencePipeline
+    _HAS_FASTER_WHISPER = True
+except Exception:
+    WhisperModel = None
+    BatchedInferencePipeline = None
+    _HAS_FASTER_WHISPER = False
+
 # Try to import whisper; if not available, we'll raise helpful errors at runtime
 try:
     import whisper
@@ -12,6 +23,18 @@ except Exception:
     whisper = None
     _HAS_WHISPER = False
 
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except Exception:
+    np = None
+    _HAS_NUMPY = False
+
+# Whisper models expect 16 kHz mono audio
+SAMPLE_RATE = 16000
+# read/write size for the ffmpeg decode pipes
+_PIPE_CHUNK = 1 << 20
+
 # Optional mic-recording dependency (lightweight). If not installed, mic mode will error with guidance.
 try:
     import sounddevice as sd
@@ -25,45 +48,161 @@ except Exception:
 
 class WhisperVoiceAdapter(InputAdapter):
     """
-    Voice adapter using openai-whisper (local). Two modes:
+    Voice adapter using faster-whisper (preferred) or openai-whisper (local). Two modes:
       - from_file: transcribe an audio file path
       - from_mic: record from default microphone for `record_seconds` seconds and transcribe
     Notes:
+      * With faster-whisper the CTranslate2 model is wrapped in a BatchedInferencePipeline,
+        which transcribes the 30s windows of an upload as one batch instead of sequentially.
+      * Weights are quantized by default (int8_float16 on CUDA, int8 on CPU). `model_name` may
+        also point at a pre-converted CTranslate2 directory, e.g.:
+          ct2-transformers-converter --model openai/whisper-base \
+              --output_dir models/whisper-base-int8 --quantization int8_float16
       * You must have ffmpeg in PATH for whisper.load_audio / model.transcribe on many systems.
       * Model downloads happen the first time you call load_model(...); choose a small model for dev.
     """
 
-    def __init__(self, model_name: str = "base", device: str = "cpu"):
-        if not _HAS_WHISPER:
+    def __init__(
+        self,
+        model_name: str = "base",
+        device: str = "cpu",
+        compute_type: Optional[str] = None,
+        batch_size: int = 16,
+    ):
+        if not (_HAS_FASTER_WHISPER or _HAS_WHISPER):
             raise RuntimeError(
-                "Whisper package not found. Install with `pip install openai-whisper` or `faster-whisper`."
+                "Whisper package not found. Install with `pip install faster-whisper` or `openai-whisper`."
             )
         self.model_name = model_name
         self.device = device
+        self.backend = "faster-whisper" if _HAS_FASTER_WHISPER else "openai-whisper"
+        self.compute_type = compute_type or ("int8_float16" if device == "cuda" else "int8")
+        self.batch_size = batch_size
         # load lazily only when needed (avoid long startup time)
         self._model = None
+        self._pipe = None
 
     @property
     def model(self):
         if self._model is None:
             # This will download the model if not present (size depends on model_name)
-            self._model = whisper.load_model(self.model_name, device=self.device)
+            if self.backend == "faster-whisper":
+                self._model = WhisperModel(self.model_name, device=self.device, compute_type=self.compute_type)
+            else:
+                self._model = whisper.load_model(self.model_name, device=self.device)
         return self._model
 
+    @property
+    def pipeline(self):
+        """BatchedInferencePipeline around the CTranslate2 model (faster-whisper backend only)."""
+        if self._pipe is None:
+            self._pipe = BatchedInferencePipeline(model=self.model)
+        return self._pipe
+
     def transcribe_file(self, audio_path: str, language: Optional[str] = None) -> AdapterOutput:
         if not os.path.exists(audio_path):
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        return self._transcribe(audio_path, language, {"audio_path": audio_path})
+
+    def decode_bytes(self, data: bytes) -> "np.ndarray":
+        """
+        Decode an in-memory audio file (any container ffmpeg understands) into a float32
+        16 kHz mono PCM array by piping it through ffmpeg, without touching disk.
+        """
+        if not _HAS_NUMPY:
+            raise RuntimeError("numpy is required for in-memory decoding. Install with: pip install numpy")
+        cmd = [
+            "ffmpeg", "-nostdin", "-loglevel", "error",
+            "-i", "pipe:0",
+            "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE),
+            "pipe:1",
+        ]
+        try:
+            proc = subprocess.Popen(
+                cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=_PIPE_CHUNK
+            )
+        except FileNotFoundError:
+            raise RuntimeError("ffmpeg not found in PATH; it is required to decode audio uploads")
+
+        # feed stdin from a helper thread in 1 MiB slices while this thread drains stdout in 1 MiB reads
+        # (communicate() moves data in PIPE_BUF/32 KiB pieces -> many more syscalls on large uploads)
+        def _feed():
+            view = memoryview(data)
+            try:
+                for off in range(0, len(view), _PIPE_CHUNK):
+                    proc.stdin.write(view[off:off + _PIPE_CHUNK])
+            except (BrokenPipeError, OSError):
+                pass
+            finally:
+                try:
+                    proc.stdin.close()
+                except OSError:
+                    pass
+
+        feeder = threading.Thread(target=_feed, daemon=True)
+        feeder.start()
+        pcm = bytearray()
+        for chunk in iter(lambda: proc.stdout.read(_PIPE_CHUNK), b""):
+            pcm += chunk
+        feeder.join()
+        err = proc.stderr.read()
+        proc.wait()
+        if proc.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed to decode audio: {err.decode(errors='ignore').strip()}")
+        return np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+
+    def transcribe_audio(self, audio: "np.ndarray", language: Optional[str] = None) -> AdapterOutput:
+        """Transcribe a float32 16 kHz mono PCM array (as returned by decode_bytes)."""
+        return self._transcribe(audio, language, {"duration": len(audio) / SAMPLE_RATE})
+
+    def transcribe_bytes(self, data: bytes, language: Optional[str] = None) -> AdapterOutput:
+        """Decode an uploaded audio file in memory and transcribe it."""
+        return self.transcribe_audio(self.decode_bytes(data), language=language)
+
+    def _transcribe(self, audio: Union[str, "np.ndarray"], language: Optional[str], extra_meta: Dict[str, Any]) -> AdapterOutput:
+        # both backends accept either a file path or a float32 16 kHz ndarray
+        if self.backend == "faster-whisper":
+            segments, info = self.pipeline.transcribe(
+                audio,
+                language=language,
+                batch_size=self.batch_size,
+                word_timestamps=False,
+                vad_filter=True,
+            )
+            # segments is a lazy generator; joining it runs the batched decode
+            text = "".join(seg.text for seg in segments).strip()
+            raw_result = {"language": info.language, "duration": info.duration}
+        else:
+            # whisper transcribe returns dict with 'text' key
+            result = self.model.transcribe(audio, language=language) if language else self.model.transcribe(audio)
+            text = result.get("text", "").strip()
+            raw_result = {k: v for k, v in result.items() if k != "segments"}  # keep small
 
-        # whisper transcribe returns dict with 'text' key
-        result = self.model.transcribe(audio_path, language=language) if language else self.model.transcribe(audio_path)
-        text = result.get("text", "").strip()
         meta: Dict[str, Any] = {
             "model": self.model_name,
-            "audio_path": audio_path,
-            "raw_result": {k: v for k, v in result.items() if k != "segments"},  # keep small
+            "backend": self.backend,
+            **extra_meta,
+            "raw_result": raw_result,
         }
         return AdapterOutput(text=text, source="voice", meta=meta)
 
+    def transcribe_many(self, audios: List[Union[str, "np.ndarray"]], language: Optional[str] = None) -> List[Union[AdapterOutput, Exception]]:
+        """
+        Transcribe several inputs (file paths or decoded PCM arrays) back-to-back on the
+        already-loaded pipeline.
+        Errors are returned in place (not raised) so one bad upload doesn't fail the whole batch.
+        """
+        results: List[Union[AdapterOutput, Exception]] = []
+        for audio in audios:
+            try:
+                if isinstance(audio, str):
+                    results.append(self.transcribe_file(audio, language=language))
+                else:
+                    results.append(self.transcribe_audio(audio, language=language))
+            except Exception as exc:
+                results.append(exc)
+        return results
+
     def record_and_transcribe(self, record_seconds: int = 4, samplerate: int = 44100, channels: int = 1) -> AdapterOutput:
         """
         Record a short clip from mic (blocking) and transcribe.
@@ -9,7 +9,6 @@ Run:
 python -m examples.adapter_demo
 """
 from kyrax_core.adapters.text_adapter import CLITextAdapter
-from kyrax_core.adapters.voice_adapter import WhisperVoiceAdapter
 from kyrax_core.adapters.base import AdapterOutput
 
 def demo_cli_text():
@@ -18,11 +17,14 @@ def demo_cli_text():
     print("AdapterOutput:", out)
 
 def demo_voice_file(path):
+    # Whisper (torch / CTranslate2) is only imported when a voice demo actually runs
+    from kyrax_core.adapters.voice_adapter import WhisperVoiceAdapter
     va = WhisperVoiceAdapter(model_name="base")
     out = va.listen(mode="file", audio_path=path)
     print("Voice AdapterOutput:", out)
 
 def demo_voice_mic(seconds=3):
+    from kyrax_core.adapters.voice_adapter import WhisperVoiceAdapter
     va = WhisperVoiceAdapter(model_name="tiny")
     out = va.listen(mode="mic", record_seconds=seconds)
     print("Voice (mic) AdapterOutput:", out)
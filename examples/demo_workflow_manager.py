@@ -3,25 +3,54 @@
 Simple demo showing creation of a workflow, executing step-by-step with updates to WorkflowStore.
 """
 
+import logging
+import logging.handlers
+import sys
+
 from kyrax_core.command import Command
-from kyrax_core.workflow_manager import WorkflowStore, STATUS_COMPLETED, STATUS_FAILED
-import time
+from kyrax_core.workflow_manager import WorkflowStore, STATUS_FAILED, STATUS_PENDING, apply_template_plan
+
+log = logging.getLogger(__name__)
+
+def _unknown_intent(cmd: Command):
+    return {"ok": True}
+
 
 class DummyDispatcher:
+    # simulated behaviour per intent: one dict lookup instead of an if-chain of string compares
+    _HANDLERS = {
+        "download_file": lambda c: {"file_path": "/tmp/report.pdf", "size": 12_345},
+        # expect file_path entity
+        "attach_file": lambda c: {"attachment_id": "att-100", "file_path": c.entities.get("file_path")},
+        "send_email": lambda c: {"sent": True, "to": c.entities.get("to")},
+    }
+
     def dispatch(self, cmd: Command):
-        print(f"[DISPATCH] {cmd.intent} => {cmd.entities}")
-        # simulate behaviour
-        if cmd.intent == "download_file":
-            return {"file_path": "/tmp/report.pdf", "size": 12_345}
-        if cmd.intent == "attach_file":
-            # expect file_path entity
-            return {"attachment_id": "att-100", "file_path": cmd.entities.get("file_path")}
-        if cmd.intent == "send_email":
-            return {"sent": True, "to": cmd.entities.get("to")}
-        # unknown
-        return {"ok": True}
+        log.info("[DISPATCH] %s => %s", cmd.intent, cmd.entities)
+        return self._HANDLERS.get(cmd.intent, _unknown_intent)(cmd)
+
+def _buffer_demo_output() -> logging.handlers.MemoryHandler:
+    """Route this module's log lines to stdout through a buffer that is written out in one go."""
+    out = logging.StreamHandler(sys.stdout)
+    out.setFormatter(logging.Formatter("%(message)s"))
+    buf = logging.handlers.MemoryHandler(capacity=1000, flushLevel=logging.ERROR, target=out)
+    log.addHandler(buf)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    return buf
+
 
 def run_workflow_demo():
+    buf = _buffer_demo_output()
+    try:
+        _run_workflow_demo()
+    finally:
+        buf.flush()
+        log.removeHandler(buf)
+        buf.close()
+
+
+def _run_workflow_demo():
     store = WorkflowStore(path=":memory:")  # use file path to persist
     dispatcher = DummyDispatcher()
 
@@ -33,43 +62,47 @@ def run_workflow_demo():
     ]
 
     wf_id = store.create_workflow(goal="Send report to Rohit", commands=cmds)
-    print("created workflow:", wf_id)
+    log.info("created workflow: %s", wf_id)
 
-    # naive executor loop: get next pending step, execute, update store
-    while True:
-        step = store.get_next_pending_step(wf_id)
-        if not step:
-            print("no more pending steps")
-            break
-
-        print("executing step:", step.step_id, step.command.intent)
+    # executor loop: the steps are all known up front, so they are read once (iter_steps) instead of
+    # querying for the next pending step each time; completing N and starting N+1 is one store
+    # transaction (advance_step)
+    # result of the most recently completed step (non-None when resuming a partly-run workflow)
+    last_done = store.get_last_completed_step(wf_id)
+    last_result = last_done.result if last_done else None
+    pending = store.iter_steps(wf_id, statuses=(STATUS_PENDING, STATUS_FAILED))
+    step = next(pending, None)
+    if step:
         store.mark_step_in_progress(wf_id, step.step_id)
+    while step:
+        log.info("executing step: %s %s", step.step_id, step.command.intent)
 
-        # IMPORTANT in your real code: resolve placeholders ({{ last.xxx }}) with outputs from previous steps.
-        # For demo simplicity we will do manual resolution here.
-        # load previous completed step result for basic substitution
-        steps_all = store.get_all_steps(wf_id)
-        last_result = None
-        for s in steps_all:
-            if s.status == STATUS_COMPLETED:
-                last_result = s.result
-
-        # simple manual resolve for demo
-        cmd = Command.from_json(step.command.to_json())
-        if isinstance(cmd.entities.get("file_path"), str) and "{{ last.file_path }}" in cmd.entities.get("file_path"):
-            if last_result and last_result.get("file_path"):
-                cmd.entities["file_path"] = last_result["file_path"]
+        # resolve {{ last.xxx }} placeholders from the plan pre-parsed at create_workflow time;
+        # untemplated steps (no plan) are dispatched as-is
+        cmd = apply_template_plan(step.command, step.plan, last_result)
 
         try:
             res = dispatcher.dispatch(cmd)
-            store.mark_step_completed(wf_id, step.step_id, result=res)
+            last_result = res
         except Exception as e:
-            store.mark_step_failed(wf_id, step.step_id, error=str(e))
+            # one commit for the step + workflow state
+            with store.transaction():
+                store.mark_step_failed(wf_id, step.step_id, error=str(e))
+                store.mark_workflow_state(wf_id, "failed")
             # policy: stop on failure for demo
             break
 
-    print("final workflow state:")
-    print(store.explain_workflow(wf_id))
+        nxt = next(pending, None)
+        with store.transaction():
+            store.advance_step(wf_id, step.step_id, res, nxt.step_id if nxt else None)
+            if nxt is None:
+                store.mark_workflow_state(wf_id, "completed")
+        step = nxt
+    else:
+        log.info("no more pending steps")
+
+    log.info("final workflow state:")
+    log.info("%s", store.explain_workflow(wf_id))
 
 if __name__ == "__main__":
     run_workflow_demo()
@@ -1,8 +1,15 @@
 # examples/nlu_demo.py
-from kyrax_core.nlu.nlu_engine import NLUEngine
+from kyrax_core.nlu.regex_engine import RegexNLUEngine
+
+
+def _spacy_engine():
+    # NLUEngine now lives in archive/ (superseded by LLMNLU in the main pipeline); imported only
+    # if an utterance misses every regex pattern
+    from archive.nlu_engine import NLUEngine
+    return NLUEngine()
 
 def run_examples():
-    engine = NLUEngine()   # will try to load spaCy if installed
+    engine = RegexNLUEngine(fallback=_spacy_engine)   # spaCy only for utterances no pattern matches
     samples = [
         "Send hi to Rohit on whatsapp",
         "Open VSCode",
@@ -11,8 +18,8 @@ def run_examples():
         "Remember that my password is 1234",
         "Search for nearest coffee shop"
     ]
-    for s in samples:
-        r = engine.analyze(s)
+    # one batched call: regex misses are forwarded to the fallback together (nlp.pipe)
+    for s, r in zip(samples, engine.analyze_many(samples)):
         cmd = engine.map_to_command(r)
         print("INPUT:", s)
         print("NLU:", r)
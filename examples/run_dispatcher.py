@@ -7,21 +7,30 @@ python -m examples.run_dispatcher
 This demonstrates:
 - Creating Command objects (manually via intent mapper)
 - Registering skills
-- Dispatching commands via Dispatcher
+- Dispatching commands via Dispatcher (independent commands run concurrently)
 - Receiving SkillResult objects
 """
 
+import asyncio
+import logging
+import logging.handlers
+import sys
+
 from kyrax_core.skill_registry import SkillRegistry
 from kyrax_core.dispatcher import Dispatcher
 from kyrax_core.intent_mapper import map_nlu_to_command
 
-# Skills (example implementations included previously)
-from skills.whatsapp_skill import WhatsAppSkill
-from skills.os_skill import OSSkill
-from skills.iot_skill import IoTSkill
+
+log = logging.getLogger(__name__)
 
 
-def demo():
+async def demo():
+    # skills are imported here, not at module top, so importing this module stays cheap
+    # (WhatsAppSkill pulls in Playwright)
+    from skills.whatsapp_skill import WhatsAppSkill
+    from skills.os_skill import OSSkill
+    from skills.iot_skill import IoTSkill
+
     registry = SkillRegistry()
     # register skills in order of priority
     registry.register(WhatsAppSkill())
@@ -33,24 +42,38 @@ def demo():
     # 1) WhatsApp send_message
     nlu1 = {"intent": "send_message", "slots": {"contact": "Rohit", "message": "Hello buddy", "app": "whatsapp"}, "confidence": 0.95}
     cmd1 = map_nlu_to_command(nlu1, source="voice")
-    res1 = dispatcher.execute(cmd1)
-    print("CMD1:", cmd1)
-    print("RES1:", res1)
 
     # 2) OS open app (safe dry run)
     nlu2 = {"intent": "open_app", "slots": {"app": "code"}, "confidence": 0.90}
     cmd2 = map_nlu_to_command(nlu2, source="voice")
-    res2 = dispatcher.execute(cmd2)
-    print("CMD2:", cmd2)
-    print("RES2:", res2)
 
     # 3) IoT: turn on light (simulated)
     nlu3 = {"intent": "turn_on", "slots": {"device": "bedroom_light"}, "confidence": 0.99}
     cmd3 = map_nlu_to_command(nlu3, source="voice")
-    res3 = dispatcher.execute(cmd3)
-    print("CMD3:", cmd3)
-    print("RES3:", res3)
+
+    # the three commands are independent: overlap their I/O (browser, process spawn, MQTT)
+    res1, res2, res3 = await asyncio.gather(
+        dispatcher.execute_async(cmd1),
+        dispatcher.execute_async(cmd2),
+        dispatcher.execute_async(cmd3),
+    )
+    log.info("CMD1: %s", cmd1)
+    log.info("RES1: %s", res1)
+    log.info("CMD2: %s", cmd2)
+    log.info("RES2: %s", res2)
+    log.info("CMD3: %s", cmd3)
+    log.info("RES3: %s", res3)
 
 
 if __name__ == "__main__":
-    demo()
\ No newline at end of file
+    # buffered: the result lines are written to stdout in one flush at the end
+    out = logging.StreamHandler(sys.stdout)
+    out.setFormatter(logging.Formatter("%(message)s"))
+    buf = logging.handlers.MemoryHandler(capacity=100, flushLevel=logging.ERROR, target=out)
+    log.addHandler(buf)
+    log.setLevel(logging.INFO)
+    try:
+        asyncio.run(demo())
+    finally:
+        buf.flush()
+        log.removeHandler(buf)
\ No newline at end of file
@@ -22,14 +22,29 @@ Notes:
  - WhatsApp profile directory: set WHATSAPP_PROFILE_DIR env var or edit code
  - OS skill runs in dry_run mode by default (set KYRAX_OS_DRY_RUN=false to enable)
  - Workflows are persisted to kyrax_workflows.db (SQLite)
+ - Pass --verbose to log the OS policy and LLM env-detection diagnostics, or --quiet to hide
+   per-step progress and results (warnings only)
 """
 
+import asyncio
+import inspect
 import os
+import random
+import sys
 import time
 import logging
-import json
 import re
-from typing import List
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Optional Hyperscan (pip install hyperscan; Linux only) for the send-safety gate; falls back to `re`
+try:
+    import hyperscan
+    _HAS_HYPERSCAN = True
+except Exception:
+    hyperscan = None
+    _HAS_HYPERSCAN = False
 # if os.environ.get("KYRAX_MODE", "").lower() == "regex":
 #     os.environ.pop("GEMINI_API_KEY", None)
 #     os.environ.pop("GOOGLE_API_KEY", None)
@@ -42,96 +57,186 @@ from typing import List
 # after LLM env detection prints in examples/run_pipeline.py
 from kyrax_core.os_policy import dry_run_enabled, ALLOWED_OS_INTENTS, HIGH_RISK_INTENTS
 
-print("KYRAX OS policy:")
-print("  KYRAX_OS_DRY_RUN =", dry_run_enabled())
-print("  allowed_os_intents =", ALLOWED_OS_INTENTS)
-print("  high_risk_intents =", HIGH_RISK_INTENTS)
-
 from kyrax_core.intent_mapper import map_nlu_to_command
+from kyrax_core.command import Command
 from kyrax_core.command_builder import CommandBuilder
 from kyrax_core.context_logger import ContextLogger
 from kyrax_core.skill_registry import SkillRegistry
 from kyrax_core.dispatcher import Dispatcher
-from kyrax_core.command import Command
 # from kyrax_core.ai_reasoner import AIReasoner
 from kyrax_core.chain_executor import ChainExecutor
-from kyrax_core.workflow_manager import WorkflowStore, STATUS_COMPLETED, STATUS_FAILED
 # utils we added
 from kyrax_core.contact_resolver import ContactResolver
-
-# skills
-from skills.whatsapp_skill import WhatsAppSkill
-from skills.os_skill import OSSkill
-from skills.iot_skill import IoTSkill
 from kyrax_core.guards import GuardManager  # Ensure GuardManager is imported
-from kyrax_core.dispatcher import Dispatcher
-from kyrax_core.command import Command
 
-logging.basicConfig(level=logging.INFO)
+# skills and the workflow store are imported inside main(), so startup (and sessions that
+# never reach them) don't pay for Playwright / OS backends / SQLite
+
 log = logging.getLogger("run_pipeline")
+
 # ---------- Execution policy (single canonical flow) ----------
 # Regex is ALWAYS first.
 USE_REGEX = True
 
-# LLM is used ONLY if regex fails AND API key exists
-USE_LLM = bool(
-    os.environ.get("GEMINI_API_KEY")
-    or os.environ.get("GOOGLE_API_KEY")
-    or os.environ.get("OPENAI_API_KEY")
-)
+# If LLM fails, we DO NOT guess with regex again
+REGEX_FALLBACK_IF_LLM_UNAVAILABLE = False
 
-# diagnostic: print env detection immediately so we can see what's visible to Python
-print("=== LLM env detection (startup) ===")
-print("GEMINI_API_KEY present:", bool(os.environ.get("GEMINI_API_KEY")))
-print("OPENAI_API_KEY present:", bool(os.environ.get("OPENAI_API_KEY")))
-print("GOOGLE_API_KEY present:", bool(os.environ.get("GOOGLE_API_KEY")))
-# Also show short prefixes so we can confirm value (safe: print only first 8 chars)
-print("GEMINI prefix:", (os.environ.get("GEMINI_API_KEY") or "")[:8])
-print("OPENAI prefix:", (os.environ.get("OPENAI_API_KEY") or "")[:8])
-print("GOOGLE prefix:", (os.environ.get("GOOGLE_API_KEY") or "")[:8])
-print("Computed USE_LLM =", USE_LLM)
-print("==================================")
+_LLM_KEY_VARS = ("GEMINI_API_KEY", "GOOGLE_API_KEY", "OPENAI_API_KEY")
 
 
-# If LLM fails, we DO NOT guess with regex again
-REGEX_FALLBACK_IF_LLM_UNAVAILABLE = False
+def _detect_llm_env() -> bool:
+    """
+    LLM is used ONLY if regex fails AND an API key exists. Called from main(), not at import,
+    so importing this module neither reads the environment nor logs anything.
+    """
+    keys = {k: os.environ.get(k) or "" for k in _LLM_KEY_VARS}
+    use_llm = any(keys.values())
+    if log.isEnabledFor(logging.DEBUG):
+        # short prefixes only, so values can be confirmed without dumping keys
+        log.debug(
+            "LLM env detection: %s -> USE_LLM=%s",
+            " ".join(f"{k}={v[:8] or '<unset>'}" for k, v in keys.items()), use_llm,
+        )
+        log.debug("Execution policy: USE_REGEX=%s, USE_LLM=%s", USE_REGEX, use_llm)
+    return use_llm
 
-log.debug(
-    "Execution policy: USE_REGEX=%s, USE_LLM=%s",
-    USE_REGEX, USE_LLM
-)
+# rate-limited LLM: cool-down grows 0.5s, 1s, 2s, ... up to the cap, reset by the next success
+LLM_BACKOFF_BASE = 0.5
+LLM_BACKOFF_CAP = 60.0
+_RETRY_DELAY_RE = re.compile(r'retry[_ ]?(?:delay|after|in)\W*(\d+(?:\.\d+)?)\s*s', re.I)
+
+
+def _retry_after_seconds(e: Exception) -> Optional[float]:
+    """Server-suggested wait from a rate-limit error: a Retry-After header, else a "retryDelay: 23s" hint."""
+    for holder in (e, getattr(e, "response", None)):
+        headers = getattr(holder, "headers", None)
+        try:
+            value = headers.get("Retry-After") if headers else None
+            if value is not None:
+                return float(value)
+        except (AttributeError, TypeError, ValueError):
+            pass
+    m = _RETRY_DELAY_RE.search(str(e))
+    return float(m.group(1)) if m else None
+
+
+def llm_backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Seconds to keep the LLM disabled after `attempt` consecutive rate-limit failures (0-based)."""
+    delay = min(LLM_BACKOFF_CAP, LLM_BACKOFF_BASE * (2 ** attempt))
+    delay += random.uniform(0, 0.25 * delay)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
 # -------------------------------------------------------------
 
-GeminiClient = None
-LLMNLU = None
-AIReasoner = None
+# -------------------------
+# Precompiled patterns (hot path: run on every user turn before any LLM call)
+# -------------------------
+_AND_SPLIT_RE = re.compile(r'\band\b', re.I)
+_AND_COMMA_SPLIT_RE = re.compile(r'\band\b|,', re.I)
+_DIGITS_RE = re.compile(r'\d+')
+_PUNCT_ONLY_RE = re.compile(r'[^a-zA-Z0-9]+')
+_SUBORDINATE_RE = re.compile(r'\b(that|if|whether|who|what|when|why|could you|would you|please|do you)\b', re.I)
+_MIXED_DOMAIN_RE = re.compile(r'\b(open|launch|turn on|turn off|start|close|play|stop)\b', re.I)
+_SEND_VERB_RE = re.compile(r'\b(send|text|message|notify|ping|to)\b', re.I)
+_SEND_START_RE = re.compile(r'^(send|text|message)\b', re.I)
+_SHORTHAND_RE = re.compile(r'^(?P<contact>[A-Za-z0-9 _\-\+]{1,60})\s+(?P<msg>.+)$')
+_QUESTION_RE = re.compile(r'\b(that|if|whether|who|what|when|why)\b|\?', re.I)
+_TEXT_TO_CONTACT_RE = re.compile(r'^.+\s+to\s+[^,;]+$')
+_SAYING_RE = re.compile(r'\bsaying\b', re.I)
+_CLAUSE_BOUNDARY_RE = re.compile(r'\b(?:and then|then|, then|,|;|\band\b|\bthen\b)\b', re.I)
+_CLAUSE_SPLIT_RE = re.compile(r',\s*|\s+\band\b\s+|\s+\band then\b\s+|\s+\bthen\b\s+', re.I)
+
+# Single-word rejects the gates can decide from a whitespace token set, before any regex runs.
+# Multi-word forms ("could you", "turn on", ...) and punctuation-adjacent words are still left to
+# the patterns below.
+_SUBORDINATE_WORDS = frozenset({"that", "if", "whether", "who", "what", "when", "why", "please"})
+_MIXED_DOMAIN_WORDS = frozenset({"open", "launch", "start", "close", "play", "stop"})
+# looks_like_direct_send only rejects the question/clause words; a leading "please" is handled
+# by its prefix check.
+_DIRECT_SEND_REJECT_WORDS = _SUBORDINATE_WORDS - {"please"}
+
+# is_safe_for_regex_execution's keyword tests, answered by one scan of the input.
+# Bit i is set when _GATE_PATTERNS[i] matches anywhere.
+_GATE_SUBORDINATE, _GATE_MIXED_DOMAIN, _GATE_SEND_VERB, _GATE_QUESTION = range(4)
+_GATE_PATTERNS = (
+    _SUBORDINATE_RE,
+    _MIXED_DOMAIN_RE,
+    _SEND_VERB_RE,
+    re.compile(r'\?'),
+)
+_GATE_DB = None
+
+
+def _gate_db():
+    """Compile the gate patterns into one Hyperscan block-mode database (once)."""
+    global _GATE_DB
+    if _GATE_DB is None:
+        db = hyperscan.Database()
+        n = len(_GATE_PATTERNS)
+        db.compile(
+            expressions=[rx.pattern.encode() for rx in _GATE_PATTERNS],
+            ids=list(range(n)),
+            elements=n,
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+                   | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP] * n,
+        )
+        _GATE_DB = db
+    return _GATE_DB
+
+
+def _gate_bits(s: str) -> int:
+    """Bitmap of the _GATE_* features present in `s`: one DFA pass with Hyperscan, else one `re` search per feature."""
+    if not _HAS_HYPERSCAN:
+        bits = 0
+        for i, rx in enumerate(_GATE_PATTERNS):
+            if rx.search(s):
+                bits |= 1 << i
+        return bits
+    hits = [0]
+
+    def _on_match(id_, start, end, flags, context):
+        hits[0] |= 1 << id_
+
+    _gate_db().scan(s.encode("utf-8"), match_event_handler=_on_match)
+    return hits[0]
+
 
-if USE_LLM:
-    from kyrax_core.llm.gemini_client import GeminiClient
-    from kyrax_core.nlu.llm_nlu import LLMNLU
-    from kyrax_core.ai_reasoner import AIReasoner
+def _has(bits: int, feature: int) -> bool:
+    return bool(bits >> feature & 1)
+
+
+# extract_send_commands clause shapes, tried in this order
+_TO_CONTACT_TEXT_RE = re.compile(r'^to\s+(?P<contact>[A-Za-z0-9 _\-\+]{1,60}?)\s+(?P<text>.+)$', re.I)
+_VERB_CONTACT_TEXT_RE = re.compile(
+    r'^(?:send\s+(?:a\s+message\s+)?)?(?:message|text|notify|ping)\s+(?P<contact>[^:,\-]+?)[\s,:-]+\s*(?P<text>.+)$',
+    re.I,
+)
+_TEXT_TO_RE = re.compile(r'^(?:send|text|message)?\s*(?P<text>.+?)\s+to\s+(?P<contact>[^,;]++)$', re.I)
+# _TEXT_TO_RE's contact has no ';', so its " to " must follow the clause's last ';'
+_TO_WORD_RE = re.compile(r'\sto\s', re.I)
+_CONTACT_TEXT_RE = re.compile(r'^(?:send\s+)?(?P<contact>[A-Za-z0-9 _\-\+]{1,60}?)\s+[,\-]?\s*(?P<text>.+)$', re.I)
+_CONTACT_COLON_TEXT_RE = re.compile(r'^(?P<contact>[A-Za-z0-9 _\-\+]{1,60})\s*[:\-]\s*(?P<text>.+)$', re.I)
 
 # -------------------------
 # Helper clause splitter
 # -------------------------
-def extract_multiple_contacts(raw: str, resolver):
+def extract_multiple_contacts(raw: Union[str, "ParsedInput"], resolver):
     """
     Extract multiple contacts using ContactResolver.
     Returns a list of resolved contact names.
     """
     names = []
-    tokens = re.split(r'\band\b|,', raw, flags=re.I)
-    for t in tokens:
-        t = t.strip()
-        if not t:
-            continue
-        # Ask resolver for best match
-        cands = resolver.candidates(t, n=1, cutoff=0.4)
-        if cands:
-            names.append(cands[0][0])
-        else:
-            names.append(t)  # fallback to raw token
-    return list(dict.fromkeys(names))  # dedupe, preserve order
+    seen = set()
+    tokens = [t.strip() for t in _AND_COMMA_SPLIT_RE.split(_as_parsed(raw).stripped) if t.strip()]
+    # Ask resolver for the best match of every token at once
+    for t, cands in zip(tokens, resolver.candidates_many(tokens, n=1, cutoff=0.4)):
+        name = cands[0][0] if cands else t  # fallback to raw token
+        # dedupe, preserve order
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
 
 def _looks_like_suspect_contact(contact: str) -> bool:
     """
@@ -147,11 +252,11 @@ def _looks_like_suspect_contact(contact: str) -> bool:
         return True
 
     # phone-like numeric token: accept if length >= 7 (reasonable phone)
-    if re.fullmatch(r'\d+', low):
+    if _DIGITS_RE.fullmatch(low):
         return False if len(low) >= 7 else True
 
     # single-token numeric-ish or punctuation-only -> suspect
-    if re.fullmatch(r'[^a-zA-Z0-9]+', low):
+    if _PUNCT_ONLY_RE.fullmatch(low):
         return True
 
     # very short tokens (1-2 characters) are suspicious (e.g., "ok", "hi")
@@ -162,7 +267,7 @@ def _looks_like_suspect_contact(contact: str) -> bool:
     return False
 
 
-def is_safe_for_regex_execution(raw: str) -> bool:
+def is_safe_for_regex_execution(raw: Union[str, "ParsedInput"]) -> bool:
     """
     Strict semantic gate for deterministic execution.
     Regex execution is allowed ONLY for trivial, unambiguous,
@@ -174,38 +279,42 @@ def is_safe_for_regex_execution(raw: str) -> bool:
 
     Rejects subordinate clauses, questions, mixed-domain verbs, pronouns, and long/clausey inputs.
     """
-    if not raw or not raw.strip():
+    return _is_safe_for_regex_execution(_as_parsed(raw).stripped)
+
+
+@lru_cache(maxsize=128)
+def _is_safe_for_regex_execution(stripped: str) -> bool:
+    p = parse_input(stripped)
+    if not p.stripped or p.has_question:
         return False
 
-    s = raw.strip()
-    s_l = s.lower()
+    s_l, tokens = p.lower, p.tokens
+    if not _SUBORDINATE_WORDS.isdisjoint(tokens) or not _MIXED_DOMAIN_WORDS.isdisjoint(tokens):
+        return False
+
+    bits = _gate_bits(s_l)
 
     # Quick rejects: subordinate / explanatory / interrogative / politeness forms
-    if re.search(r'\b(that|if|whether|who|what|when|why|could you|would you|please|do you)\b', s_l):
-        return False
-    if "?" in s:
+    if _has(bits, _GATE_SUBORDINATE) or _has(bits, _GATE_QUESTION):
         return False
 
     # Mixed-domain verbs (open/launch/turn/play etc.) are not allowed in deterministic send mode
-    if re.search(r'\b(open|launch|turn on|turn off|start|close|play|stop)\b', s_l):
+    if _has(bits, _GATE_MIXED_DOMAIN):
         return False
 
     # Must contain a send-like verb somewhere (conservative)
-    if not re.search(r'\b(send|text|message|notify|ping|to)\b', s_l):
+    if not _has(bits, _GATE_SEND_VERB):
         return False
 
     # Limit length to avoid greedy captures
-    if len(s.split()) > 30:
+    if len(tokens) > 30:
         return False
 
     # ----- Fan-out handling: allow shorthand on subsequent clauses -----
-    if " and " in s_l:
-        clauses = [c.strip() for c in re.split(r'\band\b', s, flags=re.I) if c.strip()]
-        if not clauses:
-            return False
-
+    if p.has_and:
+        clauses = p.and_clauses
         # First clause MUST be a send/text/message style command (explicit)
-        if not re.match(r'^(send|text|message)\b', clauses[0].lower()):
+        if not p.first_is_send:
             return False
 
         # Validate subsequent clauses conservatively:
@@ -213,19 +322,19 @@ def is_safe_for_regex_execution(raw: str) -> bool:
             c_l = c.lower()
             # Allowed forms for subsequent clauses:
             # 1) explicit send/text/message ... (safe)
-            if re.match(r'^(send|text|message)\b', c_l):
+            if _SEND_START_RE.match(c_l):
                 continue
             # 2) "<contact> <message>" shorthand where contact is short (<=4 tokens) and message non-empty
-            m = re.match(r'^(?P<contact>[A-Za-z0-9 _\-\+]{1,60})\s+(?P<msg>.+)$', c)
+            m = _SHORTHAND_RE.match(c)
             if m:
                 contact = m.group("contact").strip()
                 msg = m.group("msg").strip()
                 if 0 < len(msg) <= 200 and len(contact.split()) <= 4:
                     # message part must NOT contain subordinate/question words
-                    if not re.search(r'\b(that|if|whether|who|what|when|why)\b|\?', msg.lower()):
+                    if not _QUESTION_RE.search(msg):
                         continue
             # 3) "<text> to <contact>" form e.g., "hello to gautam"
-            if re.match(r'^.+\s+to\s+[^,;]+$', c_l):
+            if _TEXT_TO_CONTACT_RE.match(c_l):
                 # be conservative: ensure 'to' isn't at the very start (that's separate)
                 continue
 
@@ -234,13 +343,12 @@ def is_safe_for_regex_execution(raw: str) -> bool:
 
     # For single-clause inputs (no 'and'): ensure starts with send|text|message or is short shorthand with clear structure
     else:
-        s_stripped = s.strip()
-        if re.match(r'^(send|text|message)\b', s_l):
+        if _SEND_START_RE.match(s_l):
             # ok
             pass
         else:
             # Allow short shorthand like "alice hi" OR "hi to alice" (<= 2-3 tokens for contact)
-            m = re.match(r'^(?P<contact>[A-Za-z0-9 _\-\+]{1,60})\s+(?P<msg>.+)$', s_stripped)
+            m = _SHORTHAND_RE.match(p.stripped)
             if m:
                 contact = m.group("contact").strip()
                 msg = m.group("msg").strip()
@@ -252,22 +360,25 @@ def is_safe_for_regex_execution(raw: str) -> bool:
     return True
 
 
-def looks_like_direct_send(raw: str) -> bool:
+def looks_like_direct_send(raw: Union[str, "ParsedInput"]) -> bool:
     """
     Return True only for clear imperative 'send/text' commands that are
     almost certainly single-step direct sends and safe to run without LLM.
     Be conservative: if the sentence contains subordinating words (that/if/whether)
     or question marks or long/clausey phrasing, return False so LLM can handle it.
     """
-    if not raw or not raw.strip():
-        return False
-    s = raw.strip()
-    s_l = s.lower()
+    return _looks_like_direct_send(_as_parsed(raw).stripped)
 
-    # Quick rejects: explicit subordinate clauses or question-like inputs
-    if " that " in s_l or " if " in s_l or " whether " in s_l or " who " in s_l or " what " in s_l or " when " in s_l or " why " in s_l:
+
+@lru_cache(maxsize=128)
+def _looks_like_direct_send(stripped: str) -> bool:
+    p = parse_input(stripped)
+    if not p.stripped or p.has_question:
         return False
-    if "?" in s:
+    s_l, tokens = p.lower, p.tokens
+
+    # Quick rejects: explicit subordinate clauses, including a trailing "... that"
+    if not _DIRECT_SEND_REJECT_WORDS.isdisjoint(tokens):
         return False
     if s_l.startswith(("ask ", "tell ", "please ", "could ", "would ")):
         return False
@@ -278,17 +389,19 @@ def looks_like_direct_send(raw: str) -> bool:
         return False
 
     # Strong positive indicator: presence of the keyword 'saying' (explicit direct content)
-    if re.search(r'\bsaying\b', s_l):
+    if _SAYING_RE.search(s_l):
         return True
 
     # Conservative fallback: short sentences (<= 7 tokens) that start with send/text/message
-    tokens = s_l.split()
     if len(tokens) <= 7 and any(s_l.startswith(pref) for pref in ("send ", "text ", "message ")):
         return True
 
     # Anything longer or clausey → do not fast-path
     return False
 
+_CONTACT_REFERENCES = frozenset(("previous contact", "last contact", "previous one", "last one"))
+
+
 def resolve_contact_reference(contact: str, ctx_logger):
     """
     Resolve references like 'previous contact', 'last contact'.
@@ -297,7 +410,7 @@ def resolve_contact_reference(contact: str, ctx_logger):
         return contact
 
     c = contact.lower().strip()
-    if c in ("previous contact", "last contact", "previous one", "last one"):
+    if c in _CONTACT_REFERENCES:
         if ctx_logger:
             last = ctx_logger.get_most_recent("last_contact")
             if last:
@@ -305,12 +418,228 @@ def resolve_contact_reference(contact: str, ctx_logger):
     return contact
 
 
+def send_steps_to_nlu(steps: List[Dict[str, str]], ctx_logger) -> List[Dict[str, Any]]:
+    """
+    NLU-like send_message dicts for extract_send_commands() steps, with contact references resolved.
+    A "last contact" in a later step means the previous step of this turn.
+    """
+    out = []
+    prev_contact = None
+    for step in steps:
+        contact = step["contact"]
+        if prev_contact and contact.lower().strip() in _CONTACT_REFERENCES:
+            contact = prev_contact
+        else:
+            contact = resolve_contact_reference(contact, ctx_logger)
+        prev_contact = contact
+        out.append({
+            "intent": "send_message",
+            "entities": {"contact": contact, "text": step["text"]},
+            "confidence": 0.9,
+            "source": "local_parser",
+        })
+    return out
+
+
+def _fanout_nlu(contact: str, nlu_res: Dict[str, Any]) -> Dict[str, Any]:
+    """One recipient's send_message NLU dict when an LLM send_message names several contacts."""
+    return {
+        "intent": "send_message",
+        "entities": {"contact": contact, "text": nlu_res["entities"].get("text")},
+        "confidence": nlu_res.get("confidence", 0.9),
+        "source": "llm_fanout",
+    }
+
+
+def merge_sends_by_contact(cmds: list) -> list:
+    """
+    Fold send_message commands for the same contact/app into one command carrying
+    entities["messages"] (in typed order), so the skill opens that chat once. "text" holds the
+    messages joined by newlines for skills and loggers that only read text. Other commands pass through.
+    """
+    groups: Dict[Any, list] = {}
+    for cmd in cmds:
+        ents = cmd.entities or {}
+        if cmd.intent == "send_message" and isinstance(ents.get("text"), str):
+            key = (str(ents.get("contact") or "").lower(), ents.get("app"))
+        else:
+            key = id(cmd)
+        groups.setdefault(key, []).append(cmd)
+
+    out = []
+    for group in groups.values():
+        first = group[0]
+        if len(group) == 1:
+            out.append(first)
+            continue
+        texts = [c.entities["text"] for c in group]
+        out.append(Command(
+            intent=first.intent,
+            domain=first.domain,
+            entities={**first.entities, "text": "\n".join(texts), "messages": texts},
+            confidence=min(c.confidence for c in group),
+            source=first.source,
+            meta=dict(first.meta or {}),
+        ))
+    return out
+
+
+async def _gather_dispatches(aws) -> list:
+    return await asyncio.gather(*aws, return_exceptions=True)
+
+
+def dispatch_concurrently(dispatcher, cmds) -> list:
+    """
+    Dispatcher.execute_async() for independent commands under one asyncio.gather, results in
+    cmds order. A dispatch that raised comes back as the exception instead of a SkillResult.
+    """
+    if not cmds:
+        return []
+    return asyncio.run(_gather_dispatches([dispatcher.execute_async(c) for c in cmds]))
+
+
+def guard_and_dispatch_many(guard_manager, cmds, user, dispatcher, confirm_fn=None) -> List[Dict[str, Any]]:
+    """
+    guard_and_dispatch() for independent commands (e.g. one message fanned out to several contacts).
+    Guard checks and confirmation prompts run in order on this thread; every command they allow is
+    then dispatched concurrently via dispatch_concurrently(). Returns the guard results in cmds order.
+    """
+    allowed = []
+
+    def _defer(c):
+        allowed.append(c)
+
+    guarded = [
+        guard_manager.guard_and_dispatch(cmd, user, dispatcher_callable=_defer, confirm_fn=confirm_fn)
+        for cmd in cmds
+    ]
+    results = iter(dispatch_concurrently(dispatcher, allowed))
+    for g in guarded:
+        if g.get("status") != "executed":
+            continue
+        res = next(results)
+        if isinstance(res, BaseException):
+            g.clear()
+            g.update(status="error", reason=str(res))
+        else:
+            g["result"] = res
+    return guarded
+
+
+def run_plan_stream(step_stream, guard_manager, user, dispatcher, ctx_logger, confirm_fn=None) -> Tuple[bool, List[Command]]:
+    """
+    Guard and dispatch each step of a reasoner.propose_stream() plan as soon as it arrives.
+    Returns (handled, executed_commands): handled is True once the planner produced any step,
+    including an ask_clarify (printed here), so the caller ends the turn instead of falling back
+    to NLU on a compound input the planner declined. A stream that fails before its first step
+    is not handled.
+    """
+    handled = False
+    commands_to_execute = []
+    chain_issues = []
+    idx = 0
+    while True:
+        # only consuming the stream is guarded here: a failing step must not be reported as a
+        # reasoner error or end the rest of the plan
+        try:
+            pc, cmd, issues = next(step_stream)
+        except StopIteration:
+            break
+        except Exception as e:
+            log.warning("Reasoner proposal failed: %s", e)
+            break
+        idx += 1
+        handled = True
+        if pc.intent == "ask_clarify":
+            print("🤖 I need clarification:")
+            print(pc.entities.get("question") or "Clarification required")
+            break
+        # Skip steps with issues; keep going with the rest of the plan
+        if issues:
+            print(f" ⚠️  Step {idx}: Skipped due to issues: {issues}")
+            continue
+        if not cmd:
+            continue
+        commands_to_execute.append(cmd)
+        log.info(" ✓ Step %d: %s -> %s", idx, cmd.intent, cmd.entities)
+
+        # Execute each step guarded individually (so destructive OS intents are confirmed)
+        guard_res = guard_manager.guard_and_dispatch(
+            cmd,
+            user,
+            dispatcher_callable=lambda c: dispatcher.execute(c),
+            confirm_fn=confirm_fn
+        )
+
+        if guard_res.get("status") == "executed":
+            res = guard_res["result"]
+            if getattr(res, "success", False):
+                log.info(" ✓ Step %d completed: %s", idx, res.message or "OK")
+                try:
+                    ctx_logger.update_from_command(cmd)
+                except Exception:
+                    pass
+            else:
+                print(f" ✗ Step {idx} failed: {getattr(res,'message', 'Unknown error')}")
+                chain_issues.append({"step": idx, "cmd": cmd, "result": res})
+                # continue to next step (non-fatal, keep going)
+        else:
+            # Guard blocked or confirmation denied
+            print(f" ⚠️ Step {idx} skipped by guard: {guard_res}")
+            chain_issues.append({"step": idx, "cmd": cmd, "guard": guard_res})
+    if chain_issues:
+        print(f" ⚠️  Chain execution issues: {len(chain_issues)}")
+    return handled, commands_to_execute
+
+
 def split_clauses(raw: str) -> List[str]:
-    parts = re.split(r'\b(?:and then|then|, then|,|;|\band\b|\bthen\b)\b', raw, flags=re.I)
+    parts = _CLAUSE_BOUNDARY_RE.split(raw)
     return [p.strip() for p in parts if p.strip()]
 
 
-def extract_send_commands(raw: str):
+@dataclass(frozen=True)
+class ParsedInput:
+    """
+    One user turn, stripped / lowercased / split once and shared by the gate and extractor helpers.
+    Frozen (tuples, not lists) because parse_input() hands the same instance to repeated inputs.
+    """
+    raw: str
+    stripped: str
+    lower: str
+    tokens: Tuple[str, ...]
+    and_clauses: Tuple[str, ...]   # stripped, non-empty pieces of `stripped` split on the word "and"
+    first_is_send: bool            # and_clauses[0] starts with send/text/message (False when there are none)
+    clauses: Tuple[str, ...]       # split_clauses(raw)
+    has_question: bool
+    has_and: bool                  # " and " occurs in `lower`
+
+
+# The gate/extractor helpers below depend only on the stripped text, so they (and the parse) are
+# memoized on it: calls repeated within a turn, and commands repeated across turns, are lookups.
+@lru_cache(maxsize=128)
+def parse_input(raw: str) -> ParsedInput:
+    raw = raw or ""
+    stripped = raw.strip()
+    lower = stripped.lower()
+    and_clauses = tuple(c.strip() for c in _AND_SPLIT_RE.split(stripped) if c.strip())
+    return ParsedInput(
+        raw=raw,
+        stripped=stripped,
+        lower=lower,
+        tokens=tuple(lower.split()),
+        and_clauses=and_clauses,
+        first_is_send=bool(and_clauses) and _SEND_START_RE.match(and_clauses[0].lower()) is not None,
+        clauses=tuple(split_clauses(raw)),
+        has_question="?" in raw,
+        has_and=" and " in lower,
+    )
+
+
+def _as_parsed(raw: Union[str, ParsedInput]) -> ParsedInput:
+    return raw if isinstance(raw, ParsedInput) else parse_input(raw)
+
+
+def extract_send_commands(raw: Union[str, ParsedInput]) -> List[Dict[str, str]]:
     """
     Conservative extractor returning list of dicts {contact, text}.
     Handles:
@@ -323,22 +652,29 @@ def extract_send_commands(raw: str):
       - send hi to alice and hello to bob  (after fan-out)
       - send alice hi and bob hello
     """
-    out = []
-    if not raw or not raw.strip():
-        return out
-    # 🔧 NORMALIZE "saying" → ":" to avoid greedy regex corruption
-    # "send to Akshat saying hi" → "send to Akshat: hi"
-    normalized = re.sub(
-        r'\bsaying\s+',
-        ': ',
-        raw,
-        flags=re.I
-    )
+    # fresh dicts per call; the memoized pairs are shared
+    return [{"contact": c, "text": t} for c, t in _extract_send_pairs(_as_parsed(raw).stripped)]
+
+
+def _split_send_clauses(s: str) -> List[str]:
+    """
+    _CLAUSE_SPLIT_RE.split(s). Comma-only batches ("alice hi, bob yo, ...") need no word-boundary
+    checks, so they are split with str.split when neither "and" nor "then" occurs.
+    """
+    low = s.lower()
+    if "and" not in low and "then" not in low:
+        first, *rest = s.split(",")
+        return [first] + [p.lstrip() for p in rest]
+    return _CLAUSE_SPLIT_RE.split(s)
+
 
-    s = normalized.strip()
-    s = raw.strip()
+@lru_cache(maxsize=128)
+def _extract_send_pairs(s: str) -> Tuple[Tuple[str, str], ...]:
+    out = []
+    if not s:
+        return ()
     # split on commas/and/then but keep clause pieces
-    clauses = re.split(r',\s*|\s+\band\b\s+|\s+\band then\b\s+|\s+\bthen\b\s+', s, flags=re.I)
+    clauses = _split_send_clauses(s)
 
     for c in clauses:
         c = c.strip()
@@ -347,47 +683,45 @@ def extract_send_commands(raw: str):
 
         # shorthand: "to Alice hi" -> "to <contact> <text>"
         if c.lower().startswith("to "):
-            m = re.match(r'^to\s+(?P<contact>[A-Za-z0-9 _\-\+]{1,60}?)\s+(?P<text>.+)$', c, flags=re.I)
+            m = _TO_CONTACT_TEXT_RE.match(c)
             if m:
-                out.append({"contact": m.group("contact").strip(), "text": m.group("text").strip()})
+                out.append((m.group("contact").strip(), m.group("text").strip()))
             continue
 
         # pattern: "send a message to Alice saying hi" OR "message Alice: hi" OR "message Alice, hi"
-        m = re.search(
-            r'^(?:send\s+(?:a\s+message\s+)?)?(?:message|text|notify|ping)\s+(?P<contact>[^:,\-]+?)[\s,:-]+\s*(?P<text>.+)$',
-            c, flags=re.I
-        )
+        m = _VERB_CONTACT_TEXT_RE.search(c)
         if m:
-            out.append({"contact": m.group("contact").strip(), "text": m.group("text").strip()})
+            out.append((m.group("contact").strip(), m.group("text").strip()))
             continue
 
         # pattern: "send hi to Alice" or "text hi to Alice" OR "hi to alice"
-        m = re.search(r'^(?:send|text|message)?\s*(?P<text>.+?)\s+to\s+(?P<contact>[^,;]+)$', c, flags=re.I)
+        # (pre-checked so clauses without a usable " to " skip the lazy text scan entirely)
+        m = _TEXT_TO_RE.search(c) if _TO_WORD_RE.search(c.rpartition(";")[2]) else None
         if m:
-            out.append({"contact": m.group("contact").strip(), "text": m.group("text").strip()})
+            out.append((m.group("contact").strip(), m.group("text").strip()))
             continue
 
         # pattern: "send Alice hi" or "Alice hi" (shorthand contact first)
-        m = re.search(r'^(?:send\s+)?(?P<contact>[A-Za-z0-9 _\-\+]{1,60}?)\s+[,\-]?\s*(?P<text>.+)$', c, flags=re.I)
+        m = _CONTACT_TEXT_RE.search(c)
         if m:
             contact = m.group("contact").strip()
             text = m.group("text").strip()
             # conservative checks to avoid greedy capture
             if contact and text and len(contact.split()) <= 4 and 0 < len(text) <= 200:
-                if not re.search(r'\b(that|if|whether|who|what|when|why)\b|\?', text, flags=re.I):
-                    out.append({"contact": contact, "text": text})
+                if not _QUESTION_RE.search(text):
+                    out.append((contact, text))
             continue
 
         # fallback: "Alice: hi" or "Alice - hi"
-        m = re.match(r'^(?P<contact>[A-Za-z0-9 _\-\+]{1,60})\s*[:\-]\s*(?P<text>.+)$', c, flags=re.I)
+        m = _CONTACT_COLON_TEXT_RE.match(c)
         if m:
             contact = m.group("contact").strip()
             text = m.group("text").strip()
             if contact and text and len(text) <= 200:
-                out.append({"contact": contact, "text": text})
+                out.append((contact, text))
             continue
 
-    return out
+    return tuple(out)
 
 
 
@@ -397,21 +731,45 @@ def extract_send_commands(raw: str):
 # Main CLI pipeline
 # -------------------------
 def main():
+    # per-step progress and results are shown by default (piped input too);
+    # --verbose adds the policy / env-detection diagnostics, --quiet keeps only warnings
+    if "--verbose" in sys.argv:
+        level = logging.DEBUG
+    elif "--quiet" in sys.argv:
+        level = logging.WARNING
+    else:
+        level = logging.INFO
+    logging.basicConfig(level=level)
+
     print("Starting KYRAX pipeline (examples/run_pipeline.py)")
     print("=" * 60)
 
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(
+            "KYRAX OS policy: KYRAX_OS_DRY_RUN=%s allowed_os_intents=%s high_risk_intents=%s",
+            dry_run_enabled(), ALLOWED_OS_INTENTS, HIGH_RISK_INTENTS,
+        )
+    use_llm = _detect_llm_env()
+    if use_llm:
+        from kyrax_core.llm.gemini_client import GeminiClient
+        from kyrax_core.nlu.llm_nlu import LLMNLU
+        from kyrax_core.ai_reasoner import AIReasoner
+
     # lazy-init LLM adapter (prevents import-time side-effects)
     llm_callable = None
-    if USE_LLM:
+    llm_stream = None
+    if use_llm:
         try:
-            from kyrax_core.llm_adapters import get_llm_callable, gemini_llm_callable
+            from kyrax_core.llm_adapters import get_llm_callable, gemini_llm_stream_callable
             try:
                 llm_callable = get_llm_callable(prefer="gemini")
-                print("LLM adapter: get_llm_callable returned:", bool(llm_callable))
+                log.debug("LLM adapter: get_llm_callable returned: %s", bool(llm_callable))
+                # streamed plans (None without Gemini; the reasoner then uses llm_callable)
+                llm_stream = gemini_llm_stream_callable()
                 # if llm_callable is a callable object, show repr
-                if llm_callable:
+                if llm_callable and log.isEnabledFor(logging.DEBUG):
                     try:
-                        print("LLM adapter repr:", repr(llm_callable)[:200])
+                        log.debug("LLM adapter repr: %s", repr(llm_callable)[:200])
                     except Exception:
                         pass
             except Exception as e:
@@ -444,7 +802,7 @@ def main():
     # NLU: Still need GeminiClient directly for LLMNLU (can refactor later)
     gemini = None
     nlu = None
-    if USE_LLM and llm_callable:
+    if use_llm and llm_callable:
         try:
             gemini = GeminiClient()
             nlu = LLMNLU(gemini_client=gemini)
@@ -459,10 +817,23 @@ def main():
     # Contact resolver
     resolver = ContactResolver("data/contacts.json")
 
+    # builder.build() keywords beyond the base (nlu_result, source, context_logger) signature are
+    # detected once here rather than by retrying on TypeError at every call
+    build_params = inspect.signature(builder.build).parameters
+    build_extras = {k for k in ("raw_text", "contacts_registry") if k in build_params}
+
+    def call_builder(nlu_result, *, source, raw_text=None):
+        kw = {}
+        if "raw_text" in build_extras:
+            kw["raw_text"] = raw_text
+        if "contacts_registry" in build_extras:
+            kw["contacts_registry"] = resolver
+        return builder.build(nlu_result, source=source, context_logger=ctx_logger, **kw)
+
     # AI reasoner (uses LLM adapter abstraction)
     reasoner = None
-    if USE_LLM and llm_callable:
-        reasoner = AIReasoner(llm=llm_callable)
+    if use_llm and llm_callable:
+        reasoner = AIReasoner(llm=llm_callable, llm_stream=llm_stream)
 
     # Chain executor for multi-step tasks with data dependencies
     chain_executor = ChainExecutor(global_ctx={})
@@ -470,34 +841,44 @@ def main():
     # Workflow store for persistence (optional, can disable by setting to None)
     workflow_store = None
     try:
+        from kyrax_core.workflow_manager import WorkflowStore
         workflow_store = WorkflowStore(path="kyrax_workflows.db")
-        print("✓ Workflow persistence enabled")
+        log.info("✓ Workflow persistence enabled")
     except Exception as e:
         log.warning("Workflow store initialization failed: %s (continuing without persistence)", e)
 
     # keep a flag/timer to avoid repeatedly hitting LLM when quota is exhausted
     llm_available = llm_callable is not None
     llm_disabled_until = 0.0
-    LLM_DISABLE_DEFAULT = 60
+    llm_backoff_attempt = 0
 
     # Register skills
     wa_profile = os.environ.get("WHATSAPP_PROFILE_DIR", r"C:\Users\HP\kyrax_wa_profile")
     try:
+        from skills.whatsapp_skill import WhatsAppSkill
         wa_skill = WhatsAppSkill(profile_dir=wa_profile, headless=False, close_on_finish=False, browser_type="chromium")
         registry.register(wa_skill)
-        print("✓ WhatsApp skill registered")
+        log.info("✓ WhatsApp skill registered")
     except Exception as e:
         log.warning("WhatsApp skill registration failed: %s", e)
 
     # Register OS skill (dry_run=True for safety, set to False to allow real app launches)
-    os_skill = OSSkill(dry_run=os.environ.get("KYRAX_OS_DRY_RUN", "true").lower() == "true")
-    registry.register(os_skill)
-    print("✓ OS skill registered (dry_run={})".format(os_skill.dry_run))
+    try:
+        from skills.os_skill import OSSkill
+        os_skill = OSSkill(dry_run=os.environ.get("KYRAX_OS_DRY_RUN", "true").lower() == "true")
+        registry.register(os_skill)
+        log.info("✓ OS skill registered (dry_run=%s)", os_skill.dry_run)
+    except Exception as e:
+        log.warning("OS skill registration failed: %s", e)
 
     # Register IoT skill (simulated by default, pass MQTT client if available)
-    iot_skill = IoTSkill(mqtt_client=None)  # Set mqtt_client if you have one
-    registry.register(iot_skill)
-    print("✓ IoT skill registered (simulated mode)")
+    try:
+        from skills.iot_skill import IoTSkill
+        iot_skill = IoTSkill(mqtt_client=None)  # Set mqtt_client if you have one
+        registry.register(iot_skill)
+        log.info("✓ IoT skill registered (simulated mode)")
+    except Exception as e:
+        log.warning("IoT skill registration failed: %s", e)
 
     # # Dispatcher (NO guard logic inside; GuardManager is used externally)
     # dispatcher = Dispatcher(registry=registry)
@@ -569,8 +950,15 @@ def main():
                 break
             if not raw:
                 continue
+            parsed = parse_input(raw)
+            s_l = parsed.lower
+            # pick up edits to contacts.json (one stat per turn; resets the resolver memos)
+            try:
+                resolver.refresh_if_changed()
+            except Exception as e:
+                log.warning("Contacts reload failed: %s", e)
             # developer / test convenience: role switching
-            if raw.lower().startswith("become "):
+            if s_l.startswith("become "):
                 # commands: "become admin" or "become user" or "become role <role>"
                 parts = raw.split()
                 if len(parts) >= 2:
@@ -581,15 +969,16 @@ def main():
                     print("Usage: become <role> (e.g. become admin)")
                 continue
 
-            if raw.lower().startswith("show role"):
+            if s_l.startswith("show role"):
                 print("Current role(s):", user.get("roles"))
                 continue
 
-            if raw.lower() in ("exit", "quit"):
+            if s_l in ("exit", "quit"):
                 break
 
             # ---- deterministic multi-send handler (MUST RUN FIRST) ----
-            multi_cmds = extract_send_commands(raw)
+            send_cmds = extract_send_commands(parsed)
+            multi_cmds = send_cmds
             # HARD RULE: regex mode does NOT support mixed-domain commands
             # HARD BLOCK: no AI usage in regex mode
             # if MODE == "regex":
@@ -601,88 +990,46 @@ def main():
 
             # Hard reject fan-out unless ALL clauses are send-like
             # Relaxed fan-out check: allow send-first + shorthand subsequent clauses
-            s_l = raw.lower()
-            if " and " in s_l:
-                clauses = [c.strip() for c in re.split(r'\band\b', raw, flags=re.I) if c.strip()]
-                if clauses:
-                    # first clause must be explicit send/text/message
-                    if not re.match(r'^(send|text|message)\b', clauses[0].lower()):
-                        multi_cmds = []
-                    else:
-                        # leave multi_cmds intact; extract_send_commands will parse each clause
-                        pass
-
-            if multi_cmds and is_safe_for_regex_execution(raw) and USE_REGEX:
-
-                if looks_like_direct_send(raw):
-                    validated_cmds = []
-                    regex_blocked = False
-
-                    for step in multi_cmds:
-                        nlu_like = {
-                            "intent": "send_message",
-                            "entities": {
-                                "contact": resolve_contact_reference(step["contact"], ctx_logger),
-                                "text": step["text"],
-                            },
-                            "confidence": 0.9,
-                            "source": "local_parser",
-                        }
-
-                        try:
-                            cmd, issues = builder.build(
-                                nlu_like,
-                                source="local_parser",
-                                context_logger=ctx_logger,
-                                raw_text=raw,
-                                contacts_registry=resolver,
-                            )
-                        except TypeError:
-                            cmd, issues = builder.build(
-                                nlu_like,
-                                source="local_parser",
-                                context_logger=ctx_logger,
-                            )
-
-                        # if cmd and _looks_like_suspect_contact(cmd.entities.get("contact")):
-                        #     issues = (issues or []) + ["suspect_contact"]
-
-                        if issues:
-                            # Only block on REAL structural issues, not heuristic ones
-                            hard_issues = [
-                                i for i in issues
-                                if not i.startswith("suspect_")
-                            ]
-                            if hard_issues:
-                                regex_blocked = True
-                                break
-
-                        validated_cmds.append(cmd)
+            # (first clause must be explicit send/text/message; otherwise extract_send_commands
+            # parses each clause)
+            if parsed.has_and and parsed.and_clauses and not parsed.first_is_send:
+                multi_cmds = []
+
+            if multi_cmds and is_safe_for_regex_execution(parsed) and USE_REGEX:
+
+                if looks_like_direct_send(parsed):
+                    validated_cmds, issues_per_step = builder.build_batch(
+                        send_steps_to_nlu(multi_cmds, ctx_logger),
+                        source="local_parser",
+                        context_logger=ctx_logger,
+                        raw_text=raw,
+                        contacts_registry=resolver,
+                    )
+                    # Only block on REAL structural issues, not heuristic ones
+                    regex_blocked = any(
+                        not i.startswith("suspect_")
+                        for issues in issues_per_step for i in issues
+                    )
 
                     # --- DECISION POINT ---
                     if regex_blocked:
                         log.info("Regex matched but execution unsafe — deferring entire input to LLM")
                         # DO NOT execute ANY regex steps
                     else:
-                        print(f"Detected {len(validated_cmds)} send-message task(s) (local parser). Executing sequentially.")
-                        for cmd in validated_cmds:
-                            print("Executing:", cmd)
-
-                            guard_res = guard_manager.guard_and_dispatch(
-                                cmd,
-                                user,
-                                dispatcher_callable=lambda c: dispatcher.execute(c),
-                                confirm_fn=cli_confirm_fn
-                            )
-
+                        log.info("Detected %d send-message task(s) (local parser). Executing concurrently.", len(validated_cmds))
+                        validated_cmds = merge_sends_by_contact(validated_cmds)
+                        for cmd, guard_res in zip(validated_cmds, guard_and_dispatch_many(
+                            guard_manager, validated_cmds, user, dispatcher, confirm_fn=cli_confirm_fn
+                        )):
+                            log.info("Executing: %s", cmd)
                             if guard_res.get("status") == "executed":
                                 res = guard_res["result"]
-                                print("Result:", res)
+                                log.info("Result: %s", res)
                                 if getattr(res, "success", False):
                                     ctx_logger.update_from_command(cmd)
                             else:
                                 # guard blocked or required confirmation but user said no
-                                print("Guard result:", guard_res)
+                                log.info("Guard result: %s", guard_res)
 
 
                         regex_consumed = True
@@ -699,122 +1046,36 @@ def main():
                 #     log.info("Regex matched but semantic gate failed — deferring to LLM.")
 
             # If user input looks like a multi-step compound, prefer AI Reasoner to propose a plan
-            clauses = split_clauses(raw)
+            clauses = parsed.clauses
             is_compound = (
                 len(clauses) > 1
-                and not extract_send_commands(raw)
+                and not send_cmds
             )
 
 
-            # If we have an LLM and the user wrote a compound sentence, ask reasoner for proposals
-            if is_compound and USE_LLM and reasoner:
+            # If we have an LLM and the user wrote a compound sentence, ask reasoner for a plan.
+            # Steps are streamed: each validated step is guarded and dispatched as soon as the LLM has
+            # finished generating it, while the following steps are still being produced.
+            if is_compound and use_llm and reasoner:
+                got_plan, commands_to_execute = run_plan_stream(
+                    reasoner.propose_stream(raw, context=ctx_logger.get_all(), command_builder=builder),
+                    guard_manager,
+                    user,
+                    dispatcher,
+                    ctx_logger,
+                    confirm_fn=cli_confirm_fn,
+                )
 
-                try:
-                    proposals = reasoner.propose_and_validate_plan(
-                        raw, 
-                        context=ctx_logger.get_all(), 
-                        command_builder=builder, 
-                        max_candidates=1
-                    )
-                except Exception as e:
-                    log.warning("Reasoner proposal failed: %s", e)
-                    proposals = []
-
-                if proposals:
-                    # proposals is list of tuples (PlanProposal, [(Command|None, issues), ...])
-                    # PlanProposal.proposed_commands is the LLM's steps (not `steps`).
-                    plan, validated = proposals[0]
-
-                    # Normal form: plan.proposed_commands contains the proposed steps.
-                    # Treat empty proposals or a single ask_clarify as "need clarification".
-                    need_clarify = False
-                    if not getattr(plan, "proposed_commands", None):
-                        need_clarify = True
-                    elif (
-                        len(plan.proposed_commands) == 1
-                        and getattr(plan.proposed_commands[0], "intent", "") == "ask_clarify"
-                    ):
-                        need_clarify = True
-
-                    if need_clarify:
-                        # prefer a question string from the plan or fall back to explanation
-                        question = ""
-                        if getattr(plan, "proposed_commands", None) and len(plan.proposed_commands) == 1:
-                            question = plan.proposed_commands[0].entities.get("question", "")
-                        print("🤖 I need clarification:")
-                        print(question or plan.explanation or "Clarification required")
-                        pass
+                # Persist workflow if store is available (one batched write at the end of the turn)
+                if commands_to_execute and workflow_store:
+                    try:
+                        wf_id = workflow_store.create_and_complete_workflow(raw, commands_to_execute)
+                        log.debug("Workflow persisted: %s", wf_id)
+                    except Exception as e:
+                        log.warning("Failed to persist workflow: %s", e)
 
-                    # print(f"🤖 AI proposed plan: {plan.explanation} (score={plan.score:.2f})")
-                    
-                    # Extract validated commands (skip ones with issues)
-                    commands_to_execute = []
-                    for idx, (cmd_obj, issues) in enumerate(validated, start=1):
-                        if issues:
-                            print(f" ⚠️  Step {idx}: Skipped due to issues: {issues}")
-                        elif cmd_obj:
-                            commands_to_execute.append(cmd_obj)
-                            print(f" ✓ Step {idx}: {cmd_obj.intent} -> {cmd_obj.entities}")
-                    
-                    if commands_to_execute:
-                        # Use chain_executor for multi-step execution with placeholder resolution
-                        if len(commands_to_execute) > 1:
-                            print(f"\n📋 Executing {len(commands_to_execute)} steps sequentially...")
-                            # Execute each step guarded individually (so destructive OS intents are confirmed)
-                            results = []
-                            chain_issues = []
-
-                            for idx, cmd in enumerate(commands_to_execute, start=1):
-                                print(f"Executing step {idx}: {cmd}")
-
-                                guard_res = guard_manager.guard_and_dispatch(
-                                    cmd,
-                                    user,
-                                    dispatcher_callable=lambda c: dispatcher.execute(c),
-                                    confirm_fn=cli_confirm_fn
-                                )
-
-                                if guard_res.get("status") == "executed":
-                                    res = guard_res["result"]
-                                    results.append(res)
-                                    if getattr(res, "success", False):
-                                        print(f" ✓ Step {idx} completed: {res.get('message', 'OK')}")
-                                        try:
-                                            ctx_logger.update_from_command(cmd)
-                                        except Exception:
-                                            pass
-                                    else:
-                                        print(f" ✗ Step {idx} failed: {getattr(res,'message', 'Unknown error')}")
-                                        chain_issues.append({"step": idx, "cmd": cmd, "result": res})
-                                        # continue to next step (non-fatal, keep going)
-                                else:
-                                    # Guard blocked or confirmation denied
-                                    print(f" ⚠️ Step {idx} skipped by guard: {guard_res}")
-                                    chain_issues.append({"step": idx, "cmd": cmd, "guard": guard_res})
-                                    results.append(None)
-
-                            
-                            if chain_issues:
-                                print(f" ⚠️  Chain execution issues: {len(chain_issues)}")
-                        else:
-                            # Single command, execute directly
-                            cmd_obj = commands_to_execute[0]
-                            print(f" Executing: {cmd_obj}")
-                            res = dispatcher.execute(cmd_obj)
-                            print(" Result:", res)
-                            if res.success:
-                                ctx_logger.update_from_command(cmd_obj)
-                        
-                        # Persist workflow if store is available
-                        if workflow_store:
-                            try:
-                                wf_id = workflow_store.create_workflow(raw, commands_to_execute)
-                                workflow_store.mark_workflow_state(wf_id, "completed")
-                                log.debug("Workflow persisted: %s", wf_id)
-                            except Exception as e:
-                                log.warning("Failed to persist workflow: %s", e)
-                    
-                    # After handling the plan, go to next user input
+                if got_plan:
+                    # After handling the plan (or asking for clarification), go to next user input
                     continue
 
             # --- Single-clause / fallback path: NLU -> map -> build -> dispatch
@@ -824,20 +1085,26 @@ def main():
             #   (b) the strict regex gate rejected the input (not safe for regex execution).
             need_llm = (
                 not regex_consumed
-                and not is_safe_for_regex_execution(raw)
+                and not is_safe_for_regex_execution(parsed)
             )
 
-            if USE_LLM and llm_available and time.time() >= llm_disabled_until and nlu and need_llm:
+            if use_llm and llm_available and time.time() >= llm_disabled_until and nlu and need_llm:
 
                 try:
-                    nlu_res = nlu.analyze(raw)
+                    # repeated inputs reuse the stored NLU result instead of another LLM round-trip
+                    nlu_res = workflow_store.get_cached_response("nlu", raw) if workflow_store else None
+                    if nlu_res is None:
+                        nlu_res = nlu.analyze(raw)
+                        llm_backoff_attempt = 0
+                        if workflow_store and nlu_res.get("intent"):
+                            workflow_store.put_cached_response("nlu", raw, nlu_res)
                 except Exception as e:
                     # handle Resource Exhausted / rate limit specifically
                     msg = str(e)
                     if "RESOURCE_EXHAUSTED" in msg or "quota" in msg.lower() or "Too Many Requests" in msg:
-                        # disable LLM for a short period (backoff)
-                        llm_available = False
-                        llm_disabled_until = time.time() + LLM_DISABLE_DEFAULT
+                        # disable LLM for a growing, jittered period (re-enabled once it passes)
+                        llm_disabled_until = time.time() + llm_backoff_delay(llm_backoff_attempt, _retry_after_seconds(e))
+                        llm_backoff_attempt += 1
                         print("⚠️ AI quota exhausted or rate-limited — falling back to local parsing for now.")
                         log.warning("LLM temporarily disabled due to error: %s", e)
                         # Try to fallback to non-LLM parsing (regex) if configured to do so
@@ -846,45 +1113,24 @@ def main():
                             # reuse your validated_cmds logic (preflight) — call the same preflight/execute steps
                             # we can reuse the existing "preflight / validated_cmds" flow by jumping to the same section.
                             # minimal, inline fallback: validate & execute deterministic multi_cmds
-                            validated_cmds = []
-                            regex_blocked = False
-                            for step in multi_cmds:
-                                nlu_like = {
-                                    "intent": "send_message",
-                                    "entities": {
-                                        "contact": resolve_contact_reference(step["contact"], ctx_logger),
-                                        "text": step["text"],
-                                    },
-                                    "confidence": 0.9,
-                                    "source": "local_parser",
-                                }
-                                try:
-                                    cmd, issues = builder.build(
-                                        nlu_like,
-                                        source="local_parser",
-                                        context_logger=ctx_logger,
-                                        raw_text=raw,
-                                        contacts_registry=resolver,
-                                    )
-                                except TypeError:
-                                    cmd, issues = builder.build(
-                                        nlu_like,
-                                        source="local_parser",
-                                        context_logger=ctx_logger,
-                                    )
-
-                                # Only block on real issues (not 'suspect_' heuristics)
-                                hard_issues = [i for i in (issues or []) if not i.startswith("suspect_")]
-                                if hard_issues:
-                                    regex_blocked = True
-                                    break
-                                validated_cmds.append(cmd)
+                            validated_cmds, issues_per_step = builder.build_batch(
+                                send_steps_to_nlu(multi_cmds, ctx_logger),
+                                source="local_parser",
+                                context_logger=ctx_logger,
+                                raw_text=raw,
+                                contacts_registry=resolver,
+                            )
+                            # Only block on real issues (not 'suspect_' heuristics)
+                            regex_blocked = any(
+                                not i.startswith("suspect_")
+                                for issues in issues_per_step for i in issues
+                            )
 
                             if not regex_blocked and validated_cmds:
-                                print(f"Detected {len(validated_cmds)} send-message task(s) (regex-fallback). Executing sequentially.")
-                                for cmd in validated_cmds:
-                                    res = dispatcher.execute(cmd)
-                                    print("Result:", res)
+                                log.info("Detected %d send-message task(s) (regex-fallback). Executing concurrently.", len(validated_cmds))
+                                validated_cmds = merge_sends_by_contact(validated_cmds)
+                                for cmd, res in zip(validated_cmds, dispatch_concurrently(dispatcher, validated_cmds)):
+                                    log.info("Result: %s", res)
                                     if getattr(res, "success", False):
                                         ctx_logger.update_from_command(cmd)
                                 continue  # input consumed by regex fallback
@@ -914,58 +1160,36 @@ def main():
 
             # 🔹 LLM multi-contact fan-out handling
             if nlu_res.get("intent") == "send_message":
-                raw_text = raw.lower()
-
-                # naive but safe split for "and"
-                contacts = []
-                if " and " in raw_text:
-                    parts = re.split(r'\band\b', raw, flags=re.I)
-                    for p in parts:
-                        # try extracting a name-like token
-                        m = re.search(r'\b([A-Z][a-z]+)\b', p)
-                        if m:
-                            contacts.append(m.group(1))
+                # contact-book names mentioned anywhere in the input (one scan, any case, multi-word);
+                # fewer than two falls through to extract_multiple_contacts below
+                contacts = resolver.mentions(raw) if parsed.has_and else []
 
                 # If multiple contacts detected → fan out
                 if len(contacts) >= 2:
-                    print(f"Detected {len(contacts)} recipients (LLM fan-out). Executing sequentially.")
-                    for c in contacts:
-                        nlu_like = {
-                            "intent": "send_message",
-                            "entities": {
-                                "contact": c,
-                                "text": nlu_res["entities"].get("text"),
-                            },
-                            "confidence": nlu_res.get("confidence", 0.9),
-                            "source": "llm_fanout",
-                        }
-
-                        cmd, issues = builder.build(
-                            nlu_like,
-                            source="llm_fanout",
-                            context_logger=ctx_logger,
-                            raw_text=raw,
-                            contacts_registry=resolver,
-                        )
-
+                    log.info("Detected %d recipients (LLM fan-out). Executing concurrently.", len(contacts))
+                    fanout_cmds = []
+                    for cmd, issues in zip(*builder.build_batch(
+                        [_fanout_nlu(c, nlu_res) for c in contacts],
+                        source="llm_fanout",
+                        context_logger=ctx_logger,
+                        raw_text=raw,
+                        contacts_registry=resolver,
+                    )):
                         if issues:
                             print("Skipped due to issues:", issues)
                             continue
+                        fanout_cmds.append(cmd)
 
-                        guard_res = guard_manager.guard_and_dispatch(
-                            cmd,
-                            user,
-                            dispatcher_callable=lambda c: dispatcher.execute(c),
-                            confirm_fn=cli_confirm_fn
-                        )
-
+                    for cmd, guard_res in zip(fanout_cmds, guard_and_dispatch_many(
+                        guard_manager, fanout_cmds, user, dispatcher, confirm_fn=cli_confirm_fn
+                    )):
                         if guard_res.get("status") == "executed":
                             res = guard_res["result"]
-                            print("Result:", res)
+                            log.info("Result: %s", res)
                             if getattr(res, "success", False):
                                 ctx_logger.update_from_command(cmd)
                         else:
-                            print("Guard result:", guard_res)
+                            log.info("Guard result: %s", guard_res)
 
 
                     continue  # IMPORTANT: stop normal single-command flow
@@ -974,7 +1198,7 @@ def main():
             # Use the bridge to get a Command-like object
             # 🔥 LLM fan-out handling
             if nlu_res.get("intent") == "send_message":
-                contacts = extract_multiple_contacts(raw, resolver)
+                contacts = extract_multiple_contacts(parsed, resolver)
 
                 # ---- 🔒 UNKNOWN CONTACT GATE (PUT IT HERE) ----
                 # unknown = [
@@ -992,45 +1216,31 @@ def main():
 
                 # If multiple contacts → fan out
                 if len(contacts) > 1:
-                    print(f"Detected {len(contacts)} recipients (LLM fan-out). Executing sequentially.")
-
-                    for contact in contacts:
-                        nlu_like = {
-                            "intent": "send_message",
-                            "entities": {
-                                "contact": contact,
-                                "text": nlu_res["entities"].get("text"),
-                            },
-                            "confidence": nlu_res.get("confidence", 0.9),
-                            "source": "llm_fanout",
-                        }
-
-                        cmd, issues = builder.build(
-                            nlu_like,
-                            source="llm_fanout",
-                            context_logger=ctx_logger,
-                            raw_text=raw,
-                            contacts_registry=resolver,
-                        )
-
+                    log.info("Detected %d recipients (LLM fan-out). Executing concurrently.", len(contacts))
+
+                    fanout_cmds = []
+                    for contact, cmd, issues in zip(contacts, *builder.build_batch(
+                        [_fanout_nlu(c, nlu_res) for c in contacts],
+                        source="llm_fanout",
+                        context_logger=ctx_logger,
+                        raw_text=raw,
+                        contacts_registry=resolver,
+                    )):
                         if issues:
                             print(f"⚠️ Skipping {contact}: {issues}")
                             continue
+                        fanout_cmds.append(cmd)
 
-                        guard_res = guard_manager.guard_and_dispatch(
-                            cmd,
-                            user,
-                            dispatcher_callable=lambda c: dispatcher.execute(c),
-                            confirm_fn=cli_confirm_fn
-                        )
-
+                    for cmd, guard_res in zip(fanout_cmds, guard_and_dispatch_many(
+                        guard_manager, fanout_cmds, user, dispatcher, confirm_fn=cli_confirm_fn
+                    )):
                         if guard_res.get("status") == "executed":
                             res = guard_res["result"]
-                            print("Result:", res)
+                            log.info("Result: %s", res)
                             if getattr(res, "success", False):
                                 ctx_logger.update_from_command(cmd)
                         else:
-                            print("Guard result:", guard_res)
+                            log.info("Guard result: %s", guard_res)
 
 
                     continue  # 🔴 CRITICAL: prevents falling into single-command path
@@ -1043,43 +1253,12 @@ def main():
                 "meta": {"source": nlu_res.get("source")}
             }, source="voice")
             # Build & validate using CommandBuilder. Be tolerant of different builder signatures:
-            built_kwargs = {
-                "nlu_result": {
-                    "intent": cmd_bridge.intent,
-                    "entities": cmd_bridge.entities,
-                    "confidence": cmd_bridge.confidence,
-                    "source": cmd_bridge.source
-                },
-                "source": cmd_bridge.source,
-                "context_logger": ctx_logger,
-            }
-
-            # The official builder.build signature may accept `raw_text` and `contacts_registry`.
-            # Try to pass them; if builder doesn't accept them, fall back gracefully.
-            try:
-                cmd_validated, issues = builder.build(
-                    built_kwargs["nlu_result"],
-                    source=built_kwargs["source"],
-                    context_logger=built_kwargs["context_logger"],
-                    raw_text=raw,
-                    contacts_registry=resolver
-                )
-            except TypeError:
-                # try without contacts_registry and raw_text
-                try:
-                    cmd_validated, issues = builder.build(
-                        built_kwargs["nlu_result"],
-                        source=built_kwargs["source"],
-                        context_logger=built_kwargs["context_logger"],
-                    )
-                except TypeError:
-                    # older builder that expects the nlu_result as simple dict positional - try minimal call
-                    cmd_validated, issues = builder.build({
-                        "intent": cmd_bridge.intent,
-                        "entities": cmd_bridge.entities,
-                        "confidence": cmd_bridge.confidence,
-                        "source": cmd_bridge.source
-                    }, source=cmd_bridge.source, context_logger=ctx_logger)
+            cmd_validated, issues = call_builder({
+                "intent": cmd_bridge.intent,
+                "entities": cmd_bridge.entities,
+                "confidence": cmd_bridge.confidence,
+                "source": cmd_bridge.source
+            }, source=cmd_bridge.source, raw_text=raw)
 
             # Normalize return shape if builder returns 3-tuple by mistake
             if isinstance(cmd_validated, tuple) and len(cmd_validated) == 3:
@@ -1135,20 +1314,12 @@ def main():
                         if sel:
                             # patch cmd_bridge and rebuild
                             cmd_bridge.entities["contact"] = sel
-                            try:
-                                cmd_validated, issues = builder.build({
-                                    "intent": cmd_bridge.intent,
-                                    "entities": cmd_bridge.entities,
-                                    "confidence": cmd_bridge.confidence,
-                                    "source": cmd_bridge.source
-                                }, source=cmd_bridge.source, context_logger=ctx_logger, raw_text=raw, contacts_registry=resolver)
-                            except TypeError:
-                                cmd_validated, issues = builder.build({
-                                    "intent": cmd_bridge.intent,
-                                    "entities": cmd_bridge.entities,
-                                    "confidence": cmd_bridge.confidence,
-                                    "source": cmd_bridge.source
-                                }, source=cmd_bridge.source, context_logger=ctx_logger)
+                            cmd_validated, issues = call_builder({
+                                "intent": cmd_bridge.intent,
+                                "entities": cmd_bridge.entities,
+                                "confidence": cmd_bridge.confidence,
+                                "source": cmd_bridge.source
+                            }, source=cmd_bridge.source, raw_text=raw)
                             if issues:
                                 print("Builder issues after clarification:", issues)
                                 if cmd_validated is None:
@@ -1166,7 +1337,7 @@ def main():
                     continue
 
             # If we reached here, we have a validated Command
-            print("Command:", cmd_validated)
+            log.info("Command: %s", cmd_validated)
 
             # Execute the command through dispatcher
             # ---- Guarded execution (OS safety) ----
@@ -1196,7 +1367,7 @@ def main():
 
             if guard_result.get("status") == "executed":
                 result = guard_result.get("result")
-                print("Result:", result)
+                log.info("Result: %s", result)
 
                 if result and getattr(result, "success", False):
                     try:
@@ -1208,8 +1379,7 @@ def main():
                 # Persist workflow if store is available (single command = single-step workflow)
                 if workflow_store:
                     try:
-                        wf_id = workflow_store.create_workflow(raw, [cmd_validated])
-                        workflow_store.mark_workflow_state(wf_id, "completed")
+                        wf_id = workflow_store.create_and_complete_workflow(raw, [cmd_validated])
                         log.debug("Single-command workflow persisted: %s", wf_id)
                     except Exception as e:
                         log.warning("Failed to persist workflow: %s", e)
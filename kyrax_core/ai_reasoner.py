@@ -12,8 +12,9 @@ Important: The reasoner must NOT execute commands. Always validate proposals wit
 dispatcher / workflow manager before executing.
 """
 
-from typing import Callable, Dict, Any, List, Optional, Tuple
+from typing import Awaitable, Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass, field
+import asyncio
 import uuid
 import logging
 import re
@@ -26,6 +27,60 @@ logger = logging.getLogger(__name__)
 # Type for an optional LLM callable:
 # llm_callable(prompt: str, max_tokens: int = 512) -> str (raw text)
 LLMCallable = Callable[[str, int], str]
+# async variant: await llm_async(prompt, max_tokens) -> str
+AsyncLLMCallable = Callable[[str, int], Awaitable[str]]
+# streaming variant: llm_stream(prompt, max_tokens) -> iterator of text chunks
+StreamLLMCallable = Callable[[str, int], Iterable[str]]
+
+
+def iter_json_array_objects(chunks: Iterable[str], key: str = "steps") -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally parse streamed JSON text and yield each object of the first array stored
+    under `key` (e.g. the first proposal's "steps") as soon as its closing brace arrives.
+    String contents (including braces and escaped quotes) are skipped correctly. The rest of
+    the stream is drained after that array closes so the producer can finish cleanly.
+    """
+    text = ""
+    pos = 0
+    depth = 0
+    in_str = False
+    esc = False
+    array_depth = None  # nesting depth of the target array once found
+    obj_start = None
+    key_token = f'"{key}"'
+    it = iter(chunks)
+    for chunk in it:
+        text += chunk
+        while pos < len(text):
+            ch = text[pos]
+            if in_str:
+                if esc:
+                    esc = False
+                elif ch == "\\":
+                    esc = True
+                elif ch == '"':
+                    in_str = False
+            elif ch == '"':
+                in_str = True
+            elif ch in "[{":
+                depth += 1
+                if array_depth is None and ch == "[":
+                    before = text[:pos].rstrip()
+                    if before.endswith(":") and before[:-1].rstrip().endswith(key_token):
+                        array_depth = depth
+                elif array_depth is not None and ch == "{" and depth == array_depth + 1:
+                    obj_start = pos
+            elif ch in "]}":
+                if array_depth is not None:
+                    if ch == "}" and depth == array_depth + 1 and obj_start is not None:
+                        yield json.loads(text[obj_start:pos + 1])
+                        obj_start = None
+                    elif ch == "]" and depth == array_depth:
+                        for _ in it:
+                            pass
+                        return
+                depth -= 1
+            pos += 1
 
 
 @dataclass
@@ -65,9 +120,20 @@ class AIReasoner:
     Otherwise it falls back to deterministic template-based planner (safe).
     """
 
-    def __init__(self, llm: Optional[LLMCallable] = None, llm_max_tokens: int = 512):
+    def __init__(
+        self,
+        llm: Optional[LLMCallable] = None,
+        llm_max_tokens: int = 512,
+        llm_async: Optional[AsyncLLMCallable] = None,
+        max_concurrency: int = 8,
+        llm_stream: Optional[StreamLLMCallable] = None,
+    ):
         self.llm = llm
         self.llm_max_tokens = llm_max_tokens
+        self.llm_async = llm_async
+        self.llm_stream = llm_stream
+        # bounds in-flight LLM requests across concurrent *_async calls (rate limits)
+        self._llm_semaphore = asyncio.Semaphore(max_concurrency)
 
     # -------------------------
     # Public methods
@@ -84,19 +150,24 @@ class AIReasoner:
                 return self._suggest_plans_llm(goal_text, context, n=n)
             except Exception as e:
                 logger.warning("LLM failed, switching to clarification mode: %s", e)
-                return [
-                    PlanProposal(
-                        plan_id=str(uuid.uuid4()),
-                        proposed_commands=[
-                            ProposedCommand(
-                                intent="ask_clarify",
-                                entities={"question": f"I’m not sure what you want to do. Can you rephrase?"}
-                            )
-                        ],
-                        explanation="Clarification required",
-                        score=0.9,
-                    )
-                ]
+                return self._clarification_fallback()
+
+        return self._suggest_plans_deterministic(goal_text, context, n=n)
+
+    async def suggest_plans_async(self, goal_text: str, context: Optional[Dict[str, Any]] = None, n: int = 3) -> List[PlanProposal]:
+        """
+        Async variant of suggest_plans(). Uses `llm_async` when provided, otherwise runs the
+        sync `llm` in a worker thread so the event loop is never blocked on the network.
+        """
+        context = context or {}
+        if self.llm_async or self.llm:
+            try:
+                prompt = self._build_llm_prompt(goal_text, context, n=n)
+                raw = await self._call_llm_async(prompt)
+                return self._parse_llm_proposals(raw, goal_text)
+            except Exception as e:
+                logger.warning("LLM failed, switching to clarification mode: %s", e)
+                return self._clarification_fallback()
 
         return self._suggest_plans_deterministic(goal_text, context, n=n)
 
@@ -163,6 +234,28 @@ class AIReasoner:
         Returns list of tuples (PlanProposal, [ (validated_command_or_none, issues_list) , ... ])
         """
         proposals = self.suggest_plans(goal_text, context=context, n=max_candidates)
+        return self._validate_proposals(proposals, command_builder)
+
+    async def propose_and_validate_plan_async(
+        self,
+        goal_text: str,
+        context: Optional[Dict[str, Any]],
+        command_builder: CommandBuilder,
+        max_candidates: int = 1
+    ) -> List[Tuple[PlanProposal, List[Tuple[Command, List[str]]]]]:
+        """
+        Async variant of propose_and_validate_plan(); same return shape.
+        Several goals can be planned concurrently with asyncio.gather — in-flight LLM
+        calls are capped by the reasoner's semaphore.
+        """
+        proposals = await self.suggest_plans_async(goal_text, context=context, n=max_candidates)
+        return self._validate_proposals(proposals, command_builder)
+
+    def _validate_proposals(
+        self,
+        proposals: List[PlanProposal],
+        command_builder: CommandBuilder,
+    ) -> List[Tuple[PlanProposal, List[Tuple[Command, List[str]]]]]:
         result = []
         for p in proposals:
             # 🚨 Clarification-only plan: do NOT try to validate or execute
@@ -173,17 +266,64 @@ class AIReasoner:
                 result.append((p, []))
                 continue
 
-            validated_steps = []
-            for pc in p.proposed_commands:
-                cmd = pc.to_command(default_domain=pc.domain or "generic", source="ai")
-                # CommandBuilder expects NLU-shaped dict; we translate
-                nlu_like = {"intent": cmd.intent, "entities": cmd.entities, "confidence": cmd.confidence, "source": cmd.source}
-                built_cmd, issues = command_builder.build(nlu_like, source=cmd.source, context_logger=None)
-                # note: command_builder.build returns (Command|None, issues)
-                validated_steps.append((built_cmd, issues))
+            validated_steps = [self._validate_step(pc, command_builder) for pc in p.proposed_commands]
             result.append((p, validated_steps))
         return result
 
+    def _validate_step(self, pc: ProposedCommand, command_builder: CommandBuilder) -> Tuple[Optional[Command], List[str]]:
+        cmd = pc.to_command(default_domain=pc.domain or "generic", source="ai")
+        # CommandBuilder expects NLU-shaped dict; we translate
+        nlu_like = {"intent": cmd.intent, "entities": cmd.entities, "confidence": cmd.confidence, "source": cmd.source}
+        # note: command_builder.build returns (Command|None, issues)
+        return command_builder.build(nlu_like, source=cmd.source, context_logger=None)
+
+    def propose_stream(
+        self,
+        goal_text: str,
+        context: Optional[Dict[str, Any]],
+        command_builder: CommandBuilder,
+    ) -> Iterator[Tuple[ProposedCommand, Optional[Command], List[str]]]:
+        """
+        Streaming variant of propose_and_validate_plan() for a single plan: yields
+        (ProposedCommand, validated_command_or_none, issues) for each step as soon as the LLM
+        has finished generating it, so callers can start dispatching step k while step k+1
+        is still being produced. An ask_clarify step is yielded alone (command None) and ends
+        the stream; a plan with no steps yields the clarification fallback step the same way.
+        Without `llm_stream`, falls back to the blocking path.
+        """
+        context = context or {}
+        if not self.llm_stream:
+            plans = self.propose_and_validate_plan(goal_text, context, command_builder, max_candidates=1)
+            if not plans or not plans[0][0].proposed_commands:
+                yield self._clarification_fallback()[0].proposed_commands[0], None, []
+                return
+            plan, steps = plans[0]
+            if not steps:
+                yield plan.proposed_commands[0], None, []
+            for pc, (cmd, issues) in zip(plan.proposed_commands, steps):
+                yield pc, cmd, issues
+            return
+
+        prompt = self._build_llm_prompt(goal_text, context, n=1)
+        send_matches = self._send_matches_from_goal(goal_text)
+        got_step = False
+        try:
+            raw_steps = iter_json_array_objects(self.llm_stream(prompt, self.llm_max_tokens), key="steps")
+            for idx, step in enumerate(raw_steps):
+                got_step = True
+                pc = self._proposed_from_step(step, idx, send_matches)
+                if pc.intent == "ask_clarify":
+                    yield pc, None, []
+                    return
+                cmd, issues = self._validate_step(pc, command_builder)
+                yield pc, cmd, issues
+        except Exception as e:
+            logger.warning("LLM stream failed, switching to clarification mode: %s", e)
+            yield self._clarification_fallback()[0].proposed_commands[0], None, []
+            return
+        if not got_step:
+            yield self._clarification_fallback()[0].proposed_commands[0], None, []
+
     # -------------------------
     # Deterministic fallback planner (safe)
     # -------------------------
@@ -359,6 +499,16 @@ class AIReasoner:
         """
         prompt = self._build_llm_prompt(goal_text, context, n=n)
         raw = self.llm(prompt, self.llm_max_tokens)  # may raise
+        return self._parse_llm_proposals(raw, goal_text)
+
+    async def _call_llm_async(self, prompt: str) -> str:
+        async with self._llm_semaphore:
+            if self.llm_async:
+                return await self.llm_async(prompt, self.llm_max_tokens)
+            return await asyncio.to_thread(self.llm, prompt, self.llm_max_tokens)
+
+    def _parse_llm_proposals(self, raw: str, goal_text: str) -> List[PlanProposal]:
+        """Parse raw LLM output into PlanProposals (shared by the sync and async paths)."""
         logger.debug("LLM raw output: %s", raw)
 
 
@@ -379,6 +529,41 @@ class AIReasoner:
             raise ValueError("LLM output JSON must be an array of proposals")
 
         # 2) heuristic: extract "to <contact> saying <text>" occurrences from the goal_text
+        send_matches = self._send_matches_from_goal(goal_text)
+
+        # 3) build proposals, patching missing entities from send_matches when possible
+        proposals: List[PlanProposal] = []
+        for item in payload:
+            steps: List[ProposedCommand] = []
+            raw_steps = item.get("steps", []) or []
+
+            for idx, s in enumerate(raw_steps):
+                pc = self._proposed_from_step(s, idx, send_matches)
+                if pc.intent == "ask_clarify":
+                    # Make clarification plans have a single ProposedCommand so shape is consistent.
+                    return [
+                        PlanProposal(
+                            plan_id=str(uuid.uuid4()),
+                            proposed_commands=[pc],
+                            explanation=pc.entities["question"],
+                            score=0.0,
+                        )
+                    ]
+                steps.append(pc)
+
+            proposals.append(
+                PlanProposal(
+                    plan_id=str(uuid.uuid4()),
+                    proposed_commands=steps,
+                    explanation=item.get("explanation", "") or "",
+                    score=float(item.get("score", 0.5) or 0.5),
+                )
+            )
+
+        return proposals
+
+    def _send_matches_from_goal(self, goal_text: str) -> List[Dict[str, str]]:
+        """Heuristic "to <contact> saying <text>" pairs from the goal, used to fill sparse send steps."""
         send_matches = []
         try:
             # common patterns: to X saying Y  OR  to X, saying "Y"
@@ -407,76 +592,65 @@ class AIReasoner:
                     if cval and tval:
                         send_matches.append({"contact": cval, "text": tval})
 
-        # 3) build proposals, patching missing entities from send_matches when possible
-        proposals: List[PlanProposal] = []
-        for item in payload:
-            steps: List[ProposedCommand] = []
-            raw_steps = item.get("steps", []) or []
+        return send_matches
 
-            for idx, s in enumerate(raw_steps):
-                if s.get("intent") == "ask_clarify":
-                    # Make clarification plans have a single ProposedCommand so shape is consistent.
-                    question_text = s.get("entities", {}).get("question", "Clarification required")
-                    return [
-                        PlanProposal(
-                            plan_id=str(uuid.uuid4()),
-                            proposed_commands=[
-                                ProposedCommand(intent="ask_clarify", entities={"question": question_text}, domain="system", confidence=0.0, note="Clarification requested")
-                            ],
-                            explanation=question_text,
-                            score=0.0,
-                        )
-                    ]
+    def _proposed_from_step(self, s: Dict[str, Any], idx: int, send_matches: List[Dict[str, str]]) -> ProposedCommand:
+        """Turn one raw LLM step dict into a ProposedCommand (ask_clarify steps become a question)."""
+        if s.get("intent") == "ask_clarify":
+            question_text = s.get("entities", {}).get("question", "Clarification required")
+            return ProposedCommand(intent="ask_clarify", entities={"question": question_text}, domain="system", confidence=0.0, note="Clarification requested")
+
+        intent = s.get("intent")
+        domain = s.get("domain")
+        confidence = float(s.get("confidence", 0.6) or 0.6)
+        note = s.get("note")
+        entities = s.get("entities") or {}
+
+        # If intent is send_message and entities missing contact/text, try to fill from heuristics
+        if intent == "send_message":
+            contact = entities.get("contact")
+            text = entities.get("text")
+            if (not contact or not text) and idx < len(send_matches):
+                # apply the heuristic matches in order
+                cand = send_matches[idx]
+                # only fill missing parts (don't overwrite existing)
+                if not contact:
+                    entities["contact"] = cand.get("contact")
+                if not text:
+                    entities["text"] = cand.get("text")
+
+            # final small cleanup: strip common wrappers
+            if isinstance(entities.get("contact"), str):
+                entities["contact"] = entities["contact"].strip().strip(' "\'')
+            if isinstance(entities.get("text"), str):
+                entities["text"] = entities["text"].strip().strip(' "\'')
+
+        # ensure entities is a dict
+        if entities is None:
+            entities = {}
+
+        return ProposedCommand(
+            intent=(intent or ""),
+            entities=entities,
+            domain=domain,
+            confidence=confidence,
+            note=note,
+        )
 
-                intent = s.get("intent")
-                domain = s.get("domain")
-                confidence = float(s.get("confidence", 0.6) or 0.6)
-                note = s.get("note")
-                entities = s.get("entities") or {}
-
-                # If intent is send_message and entities missing contact/text, try to fill from heuristics
-                if intent == "send_message":
-                    contact = entities.get("contact")
-                    text = entities.get("text")
-                    if (not contact or not text) and idx < len(send_matches):
-                        # apply the heuristic matches in order
-                        cand = send_matches[idx]
-                        # only fill missing parts (don't overwrite existing)
-                        if not contact:
-                            entities["contact"] = cand.get("contact")
-                        if not text:
-                            entities["text"] = cand.get("text")
-
-                    # final small cleanup: strip common wrappers
-                    if isinstance(entities.get("contact"), str):
-                        entities["contact"] = entities["contact"].strip().strip(' "\'')
-                    if isinstance(entities.get("text"), str):
-                        entities["text"] = entities["text"].strip().strip(' "\'')
-
-                # ensure entities is a dict
-                if entities is None:
-                    entities = {}
-
-                steps.append(
+    def _clarification_fallback(self) -> List[PlanProposal]:
+        return [
+            PlanProposal(
+                plan_id=str(uuid.uuid4()),
+                proposed_commands=[
                     ProposedCommand(
-                        intent=(intent or ""),
-                        entities=entities,
-                        domain=domain,
-                        confidence=confidence,
-                        note=note,
+                        intent="ask_clarify",
+                        entities={"question": f"I’m not sure what you want to do. Can you rephrase?"}
                     )
-                )
-
-            proposals.append(
-                PlanProposal(
-                    plan_id=str(uuid.uuid4()),
-                    proposed_commands=steps,
-                    explanation=item.get("explanation", "") or "",
-                    score=float(item.get("score", 0.5) or 0.5),
-                )
+                ],
+                explanation="Clarification required",
+                score=0.9,
             )
-
-        return proposals
+        ]
 
     def _build_llm_prompt(self, goal_text: str, context: Dict[str, Any], n: int = 3) -> str:
         """
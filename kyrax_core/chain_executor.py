@@ -5,6 +5,17 @@ from kyrax_core.command import Command
 
 PLACEHOLDER_RE = re.compile(r"\{\{\s*([^}]+?)\s*\}\}")
 
+
+def _has_placeholder(value: Any) -> bool:
+    """Cheap '{{' scan over strings nested in dicts/lists; no regex, no copies."""
+    if isinstance(value, str):
+        return "{{" in value
+    if isinstance(value, dict):
+        return any(_has_placeholder(v) for v in value.values())
+    if isinstance(value, list):
+        return any(_has_placeholder(v) for v in value)
+    return False
+
 class ChainExecutionError(Exception):
     pass
 
@@ -82,6 +93,9 @@ class ChainExecutor:
         """
         issues: List[str] = []
         if isinstance(value, str):
+            if "{{" not in value:
+                return value, issues
+
             def _replace(m):
                 token = m.group(1).strip()
                 resolved = self._resolve_token(token, outputs)
@@ -141,20 +155,24 @@ class ChainExecutor:
 
         for idx, cmd in enumerate(commands):
             # 1) render placeholders in entities from previous outputs
-            rendered_entities, render_issues = self._render_entities(cmd.entities or {}, outputs)
-            if render_issues:
-                issues.append({"step": idx, "command": cmd.to_dict() if hasattr(cmd, "to_dict") else repr(cmd), "issues": [f"unresolved_placeholders:{t}" for t in render_issues]})
-                # decide: continue (with placeholders kept) or stop. We'll attempt to continue but mark issue
-            # build new command copy (do not mutate original)
-            cmd_copy = Command(
-                intent=cmd.intent,
-                domain=cmd.domain,
-                entities=rendered_entities,
-                confidence=cmd.confidence,
-                source=cmd.source,
-                context_id=cmd.context_id,
-                meta=cmd.meta.copy() if isinstance(cmd.meta, dict) else cmd.meta
-            )
+            if not _has_placeholder(cmd.entities):
+                # fast path: nothing to render, so nothing to copy — dispatch the command as-is
+                cmd_copy = cmd
+            else:
+                rendered_entities, render_issues = self._render_entities(cmd.entities or {}, outputs)
+                if render_issues:
+                    issues.append({"step": idx, "command": cmd.to_dict() if hasattr(cmd, "to_dict") else repr(cmd), "issues": [f"unresolved_placeholders:{t}" for t in render_issues]})
+                    # decide: continue (with placeholders kept) or stop. We'll attempt to continue but mark issue
+                # build new command copy (do not mutate original)
+                cmd_copy = Command(
+                    intent=cmd.intent,
+                    domain=cmd.domain,
+                    entities=rendered_entities,
+                    confidence=cmd.confidence,
+                    source=cmd.source,
+                    context_id=cmd.context_id,
+                    meta=cmd.meta.copy() if isinstance(cmd.meta, dict) else cmd.meta
+                )
 
             # 2) dispatch
             try:
@@ -1,7 +1,17 @@
 # kyrax_core/command.py
 from dataclasses import dataclass, field, asdict
 from typing import Dict, Any, Optional
+import copy
 import json
+import sys
+
+# Optional orjson (pip install orjson): Command.to_json/from_json run once per stored workflow step
+try:
+    import orjson
+    _HAS_ORJSON = True
+except Exception:
+    orjson = None
+    _HAS_ORJSON = False
 
 
 @dataclass
@@ -20,6 +30,14 @@ class Command:
     context_id: Optional[str] = None  # short id to link to context/memory
     meta: Dict[str, Any] = field(default_factory=dict)  # any transport metadata
 
+    def __post_init__(self):
+        # intent/domain are compared against literals on every dispatch (registry index, can_handle);
+        # interned, those == checks short-circuit on identity. type() check: sys.intern rejects str subclasses
+        if type(self.intent) is str:
+            self.intent = sys.intern(self.intent)
+        if type(self.domain) is str:
+            self.domain = sys.intern(self.domain)
+
     def is_valid(self) -> bool:
         """Basic sanity checks before dispatch."""
         if not self.intent or not isinstance(self.intent, str):
@@ -34,7 +52,23 @@ class Command:
 
     def to_json(self) -> str:
         """Serialize to stable JSON (useful for logging / storage)."""
-        return json.dumps(asdict(self), ensure_ascii=False, sort_keys=True)
+        # plain field dict: asdict() would deep-copy entities/meta just to serialize them
+        payload = {
+            "intent": self.intent,
+            "domain": self.domain,
+            "entities": self.entities,
+            "confidence": self.confidence,
+            "source": self.source,
+            "context_id": self.context_id,
+            "meta": self.meta,
+        }
+        if _HAS_ORJSON:
+            try:
+                # compact separators, otherwise same content as the json path (UTF-8, sorted keys)
+                return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+            except TypeError:
+                pass  # a value orjson doesn't serialize natively; let json try
+        return json.dumps(payload, ensure_ascii=False, sort_keys=True)
         # ensure_ascii=False → Keeps Unicode characters intact instead of escaping them.
         # Example: "café" stays "café" instead of "caf\u00e9".
         # sort_keys=True → Ensures dictionary keys are sorted alphabetically in the JSON output.
@@ -47,17 +81,41 @@ class Command:
     @staticmethod
     def from_json(payload: str) -> "Command":
         """Deserialize from JSON string."""
-        data = json.loads(payload)
+        data = orjson.loads(payload) if _HAS_ORJSON else json.loads(payload)
         return Command(
             intent=data.get("intent", ""),
             domain=data.get("domain", ""),
-            entities=data.get("entities", {}),
+            # keys parsed from JSON aren't interned like source literals; this dict is ours to rebuild
+            entities={sys.intern(k): v for k, v in (data.get("entities") or {}).items()},
             confidence=float(data.get("confidence", 1.0)),
             source=data.get("source", "text"),
             context_id=data.get("context_id"),
             meta=data.get("meta", {}),
         )
 
+    def __copy__(self) -> "Command":
+        """Copy with its own entities/meta dicts (values shared); no JSON round-trip."""
+        return Command(
+            intent=self.intent,
+            domain=self.domain,
+            entities=dict(self.entities),
+            confidence=self.confidence,
+            source=self.source,
+            context_id=self.context_id,
+            meta=dict(self.meta),
+        )
+
+    def __deepcopy__(self, memo) -> "Command":
+        return Command(
+            intent=self.intent,
+            domain=self.domain,
+            entities=copy.deepcopy(self.entities, memo),
+            confidence=self.confidence,
+            source=self.source,
+            context_id=self.context_id,
+            meta=copy.deepcopy(self.meta, memo),
+        )
+
     def get(self, key: str, default=None):
         return self.entities.get(key, default)
     # Looks up a value in the entities dictionary by key.
@@ -15,6 +15,11 @@ class CommandValidationError(Exception):
 # ------------ add near top, after imports ------------
 import re  # already present in file; ensure this remains
 
+# precompiled once: build() runs these normalizers on every call
+_RE_VOLUME_NUM = re.compile(r'(\d{1,3})')
+_RE_NON_WORD = re.compile(r'\W+')
+_RE_NON_DIGIT = re.compile(r'\D')
+
 def _parse_volume(raw_v):
     """
     Parse a volume value and return int 0..100.
@@ -25,7 +30,7 @@ def _parse_volume(raw_v):
         raise ValueError("volume missing")
     s = str(raw_v).strip()
     # find first integer 0-999 in the string
-    m = re.search(r'(\d{1,3})', s)
+    m = _RE_VOLUME_NUM.search(s)
     if not m:
         raise ValueError(f"could not parse volume from: {raw_v!r}")
     val = int(m.group(1))
@@ -37,6 +42,22 @@ def _parse_volume(raw_v):
 # --------------------------------------------------
 
 
+class _PreResolvedContacts:
+    """
+    find_best() view over a registry with some answers already known (from one resolve_batch call);
+    unknown queries fall through to the wrapped registry.
+    """
+
+    def __init__(self, registry: Any, resolved: Dict[str, Optional[str]]):
+        self._registry = registry
+        self._resolved = resolved
+
+    def find_best(self, query: str) -> Optional[str]:
+        if query in self._resolved:
+            return self._resolved[query]
+        return self._registry.find_best(query)
+
+
 class CommandBuilder:
     """
     Build & validate Command objects from NLU results.
@@ -185,6 +206,9 @@ class CommandBuilder:
         "telegram": {"telegram"}
     }
 
+    # APP_SYNONYMS with non-word chars stripped, for normalize_app's containment fallback
+    _APP_SQUASHED = [(canon, [_RE_NON_WORD.sub('', v) for v in variants]) for canon, variants in APP_SYNONYMS.items()]
+
     @staticmethod
     def normalize_app(raw_app: Optional[str]) -> Optional[str]:
         if raw_app is None:
@@ -193,11 +217,12 @@ class CommandBuilder:
         for canon, variants in CommandBuilder.APP_SYNONYMS.items():
             if a in variants:
                 return canon
-        an = re.sub(r'\W+', '', a)
-        for canon, variants in CommandBuilder.APP_SYNONYMS.items():
-            for v in variants:
-                if an and an in re.sub(r'\W+', '', v):
-                    return canon
+        an = _RE_NON_WORD.sub('', a)
+        if an:
+            for canon, squashed in CommandBuilder._APP_SQUASHED:
+                for v in squashed:
+                    if an in v:
+                        return canon
         return a
 
     @staticmethod
@@ -210,7 +235,7 @@ class CommandBuilder:
         if raw_contact is None:
             return None
         c = str(raw_contact).strip()
-        digits = re.sub(r'\D', '', c)
+        digits = _RE_NON_DIGIT.sub('', c)
         if digits and len(digits) >= 7:
             return digits
         return " ".join([p.capitalize() for p in c.split()])
@@ -258,13 +283,86 @@ class CommandBuilder:
         for k, v in (nlu_entities.items() if isinstance(nlu_entities, dict) else []):
             built_entities[k] = v
 
+        built_entities, issues = self._validate_entities(schema, built_entities, issues, contacts_registry)
+        if built_entities is None:
+            return None, issues
+
+        # final domain
+        domain = schema.get("domain", self.DEFAULT_DOMAIN_MAP.get(nlu_intent, "generic"))
+
+        # adjust confidence conservatively
+        adjusted_conf = nlu_conf
+        filled_from_default = [k for k in schema.get("required", []) if k in schema.get("optional", {}) and nlu_entities.get(k) is None]
+        if filled_from_default:
+            adjusted_conf = min(adjusted_conf, 0.85)
+        if context_logger and "contact" in schema.get("required", []):
+            original_contact = (nlu_entities or {}).get("contact")
+            if not original_contact:
+                adjusted_conf = min(adjusted_conf, 0.5)
+
+        cmd = Command(intent=nlu_intent, domain=domain, entities=built_entities, confidence=float(adjusted_conf), source=source)
+
+        # update context logger with newly built command
+        if context_logger:
+            try:
+                context_logger.update_from_command(cmd)
+            except Exception:
+                pass
+
+        return cmd, issues
+
+    def build_batch(self,
+                    nlu_list: List[Dict[str, Any]],
+                    source: Optional[str] = None,
+                    context_logger: Optional["ContextLogger"] = None,
+                    raw_text: Optional[str] = None,
+                    contacts_registry: Optional[Any] = None
+                    ) -> Tuple[List[Optional[Command]], List[List[str]]]:
+        """
+        build() over several NLU results (e.g. the fan-out steps of one utterance), in order.
+
+        Contacts present up front are canonicalized together through `contacts_registry.resolve_batch(names)`
+        when the registry has one, so a ContactResolver scores them in one batched pass instead of one
+        find_best() per step. Anything not covered by that pass (contacts filled from context) still goes
+        through find_best(). Results match calling build() on each item in turn.
+
+        Returns: ([Command | None, ...], [issues_list, ...]) — parallel to nlu_list.
+        """
+        registry = contacts_registry
+        names = [c for c in ((n.get("entities") or {}).get("contact") for n in nlu_list) if isinstance(c, str)]
+        if names and contacts_registry is not None and hasattr(contacts_registry, "resolve_batch"):
+            try:
+                registry = _PreResolvedContacts(contacts_registry, dict(zip(names, contacts_registry.resolve_batch(names))))
+            except Exception:
+                registry = contacts_registry
+
+        cmds: List[Optional[Command]] = []
+        issues_per_item: List[List[str]] = []
+        for nlu_result in nlu_list:
+            cmd, issues = self.build(nlu_result, source=source, context_logger=context_logger,
+                                     raw_text=raw_text, contacts_registry=registry)
+            cmds.append(cmd)
+            issues_per_item.append(issues)
+        return cmds, issues_per_item
+
+    def _validate_entities(self,
+                           schema: Dict[str, Any],
+                           built_entities: Dict[str, Any],
+                           issues: List[str],
+                           contacts_registry: Optional[Any] = None,
+                           resolve_contact: bool = True
+                           ) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        """
+        Defaults -> contact canonicalization -> normalizers -> ambiguity -> required checks.
+        Shared by build() and patch(). Returns (entities, issues) or (None, issues) on failure.
+        """
         # apply defaults for optional keys if missing
         for opt_key, opt_default in schema.get("optional", {}).items():
             if opt_key not in built_entities or built_entities.get(opt_key) is None:
                 built_entities[opt_key] = opt_default() if callable(opt_default) else opt_default
 
         # If a contacts_registry is provided, try to canonicalize the contact before normalization/ambiguity checks
-        if "contact" in built_entities and isinstance(built_entities.get("contact"), str) and contacts_registry is not None:
+        if resolve_contact and "contact" in built_entities and isinstance(built_entities.get("contact"), str) and contacts_registry is not None:
             try:
                 if hasattr(contacts_registry, "find_best"):
                     resolved = contacts_registry.find_best(built_entities["contact"])
@@ -328,26 +426,34 @@ class CommandBuilder:
                 issues.append(f"missing_required_entity:{m}")
             return None, issues
 
-        # final domain
-        domain = schema.get("domain", self.DEFAULT_DOMAIN_MAP.get(nlu_intent, "generic"))
+        return built_entities, issues
 
-        # adjust confidence conservatively
-        adjusted_conf = nlu_conf
-        filled_from_default = [k for k in schema.get("required", []) if k in schema.get("optional", {}) and nlu_entities.get(k) is None]
-        if filled_from_default:
-            adjusted_conf = min(adjusted_conf, 0.85)
-        if context_logger and "contact" in schema.get("required", []):
-            original_contact = (nlu_entities or {}).get("contact")
-            if not original_contact:
-                adjusted_conf = min(adjusted_conf, 0.5)
+    def patch(self,
+              cmd: Command,
+              updates: Dict[str, Any],
+              contacts_registry: Optional[Any] = None
+              ) -> Tuple[Optional[Command], List[str]]:
+        """
+        Apply entity updates (e.g. a clarified contact) to a command and re-validate it
+        without a full build(): no context-logger filling, and only an updated `contact`
+        goes through contacts_registry resolution. Normalizers are idempotent, so the merged
+        entities are re-checked against the schema as a whole.
 
-        cmd = Command(intent=nlu_intent, domain=domain, entities=built_entities, confidence=float(adjusted_conf), source=source)
+        Returns: (Command | None, issues_list) — same contract as build().
+        """
+        entities = dict(cmd.entities or {})
+        entities.update(updates)
+        schema = self.INTENT_SCHEMA.get(cmd.intent)
+        if schema is None:
+            return Command(intent=cmd.intent, domain=cmd.domain, entities=entities,
+                           confidence=cmd.confidence, source=cmd.source, meta=dict(cmd.meta or {})), \
+                [f"unknown_intent_schema:{cmd.intent}"]
 
-        # update context logger with newly built command
-        if context_logger:
-            try:
-                context_logger.update_from_command(cmd)
-            except Exception:
-                pass
+        entities, issues = self._validate_entities(schema, entities, [], contacts_registry,
+                                                   resolve_contact="contact" in updates)
+        if entities is None:
+            return None, issues
 
-        return cmd, issues
+        domain = schema.get("domain", self.DEFAULT_DOMAIN_MAP.get(cmd.intent, "generic"))
+        return Command(intent=cmd.intent, domain=domain, entities=entities, confidence=cmd.confidence,
+                       source=cmd.source, meta=dict(cmd.meta or {})), issues
@@ -6,16 +6,90 @@ Used by CommandBuilder to canonicalize contact names.
 """
 
 from __future__ import annotations
-from typing import Optional, List, Tuple, Dict, Any
+from typing import Optional, List, Tuple, Dict, Any, Callable
 import json
+import mmap
 import os
 import difflib
 import re
+import threading
 from difflib import SequenceMatcher
+from collections import defaultdict, Counter, OrderedDict
+from functools import lru_cache
+
+# Optional C++ scorer (pip install rapidfuzz); falls back to difflib
+try:
+    from rapidfuzz import fuzz as _rf_fuzz, process as _rf_process
+    _HAS_RAPIDFUZZ = True
+except Exception:
+    _rf_fuzz = None
+    _rf_process = None
+    _HAS_RAPIDFUZZ = False
+
+# Optional orjson (pip install orjson): faster parse of large contacts.json files
+try:
+    import orjson
+    _HAS_ORJSON = True
+except Exception:
+    orjson = None
+    _HAS_ORJSON = False
+
+# Optional numpy: with rapidfuzz, scores the whole variant table in one cdist call
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except Exception:
+    np = None
+    _HAS_NUMPY = False
+
+# Optional pyahocorasick (pip install pyahocorasick): one-pass contact-name scan for mentions();
+# falls back to a single compiled alternation
+try:
+    import ahocorasick
+    _HAS_AHOCORASICK = True
+except Exception:
+    ahocorasick = None
+    _HAS_AHOCORASICK = False
+
+
+def _load_contacts_file(path: str) -> Dict[str, Any]:
+    """
+    Parse a contacts JSON file. With orjson the file is memory-mapped and parsed straight from
+    the mapping (no intermediate str copy); otherwise stdlib json.
+    """
+    with open(os.path.abspath(path), "rb") as f:
+        if _HAS_ORJSON:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError(f"empty contacts file: {path}")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+        return json.load(f)
+
+
+# precompiled: _norm / phone-digit extraction run for every contact query
+_RE_WS = re.compile(r'\s+')
+_RE_NON_DIGIT = re.compile(r'\D')
 
 
 def _norm(s: str) -> str:
-    return re.sub(r'\s+', ' ', (s or "").strip().lower())
+    return _RE_WS.sub(' ', (s or "").strip().lower())
+
+
+def _exact_key(s: str) -> str:
+    """Key for the exact-name dict: _norm plus dropping ',' and '.' ("Dr. Rao," == "dr rao")."""
+    return _norm(s).replace(',', '').replace('.', '')
+
+
+def _is_word_char(s: str, i: int) -> bool:
+    """True if s[i] exists and is a regex word character (for whole-word checks on raw substring hits)."""
+    return 0 <= i < len(s) and (s[i].isalnum() or s[i] == "_")
+
+
+def _trigrams(s: str) -> set:
+    """Padded character trigrams ("  ab " style) so short names still produce grams."""
+    padded = f"  {s} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
 
 
 class ContactResolver:
@@ -30,47 +104,67 @@ class ContactResolver:
     Public methods:
      - find_best(query) -> canonical_name | None
      - candidates(query, n=5, cutoff=0.4) -> List[(canonical_name, score)]
+     - candidates_many(queries, n=5, cutoff=0.4) -> List[List[(canonical_name, score)]]
+     - resolve_batch(names, llm=None) -> List[canonical_name | None]
+     - refresh_if_changed() -> bool
     """
 
+    # contact books at least this large get a trigram prefilter before fuzzy scoring;
+    # smaller books keep the exhaustive scan (cheap, and no recall trade-off)
+    TRIGRAM_MIN_CONTACTS = 2000
+    # entries kept by the candidates_many() memo
+    MANY_MEMO_SIZE = 1024
+
     def __init__(self, contacts_path: Optional[str] = None, contacts_dict: Optional[Dict[str, Any]] = None):
         self.contacts_path = contacts_path
         self._contacts = {}
+        self._mtime = None
+        self._many_memo_lock = threading.Lock()
         if contacts_dict is not None:
             self._contacts = dict(contacts_dict)
         elif contacts_path:
+            self._mtime = self._stat_mtime()
             try:
-                with open(os.path.abspath(contacts_path), "r", encoding="utf-8") as f:
-                    self._contacts = json.load(f)
+                self._contacts = _load_contacts_file(contacts_path)
             except Exception:
                 self._contacts = {}
 
-        # build search indexes
-        self._keys = list(self._contacts.keys())
-        # precompute searchable name variants (lowercased)
-        self._variants = {}
-        for k, v in self._contacts.items():
-            names = set()
-            names.add(_norm(k))
-            if isinstance(v, dict):
-                for field in ("whatsapp_name", "name", "alias"):
-                    val = v.get(field)
-                    if val:
-                        names.add(_norm(val))
-                phone = v.get("phone")
-                if phone:
-                    names.add(re.sub(r'\D', '', str(phone)))
-            self._variants[k] = list(names)
+        self._build_index()
+
+    def _stat_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.contacts_path).st_mtime_ns
+        except (OSError, TypeError):
+            return None
+
+    def refresh_if_changed(self) -> bool:
+        """
+        Reload when the contacts file's mtime differs from the one seen at the last load (one stat
+        call; cheap enough to run every turn). Returns True if it reloaded.
+        """
+        if not self.contacts_path:
+            return False
+        mtime = self._stat_mtime()
+        if mtime == self._mtime:
+            return False
+        self.reload()
+        return True
 
     def reload(self, contacts_path: Optional[str] = None):
         """Reload from disk (useful during development)."""
         if contacts_path:
             self.contacts_path = contacts_path
         if self.contacts_path:
-            with open(os.path.abspath(self.contacts_path), "r", encoding="utf-8") as f:
-                self._contacts = json.load(f)
+            self._mtime = self._stat_mtime()
+            self._contacts = _load_contacts_file(self.contacts_path)
         else:
             self._contacts = {}
+        self._build_index()
+
+    def _build_index(self):
+        """(Re)build search indexes; also resets the candidates() memo since results depend on them."""
         self._keys = list(self._contacts.keys())
+        # precompute searchable name variants (lowercased)
         self._variants = {}
         for k, v in self._contacts.items():
             names = set()
@@ -82,11 +176,93 @@ class ContactResolver:
                         names.add(_norm(val))
                 phone = v.get("phone")
                 if phone:
-                    names.add(re.sub(r'\D', '', str(phone)))
+                    names.add(_RE_NON_DIGIT.sub('', str(phone)))
             self._variants[k] = list(names)
+        # O(1) happy paths checked before any fuzzy scoring (first key wins, like the old scans)
+        self._exact = {}
+        self._phones = {}
+        for k, v in self._contacts.items():
+            self._exact.setdefault(_exact_key(k), k)
+            ph = (v.get("phone") or "") if isinstance(v, dict) else ""
+            ph_digits = _RE_NON_DIGIT.sub('', str(ph))
+            if ph_digits:
+                self._phones.setdefault(ph_digits, k)
+        # flat struct-of-arrays view of every variant: _flat_names[j] belongs to contact
+        # position _flat_owner[j] (into self._keys); scored in one batch by _score_vectorized
+        self._flat_names = []
+        owners = []
+        for i, k in enumerate(self._keys):
+            for cand in self._variants[k]:
+                self._flat_names.append(cand)
+                owners.append(i)
+        self._flat_owner = np.asarray(owners, dtype=np.int64) if _HAS_NUMPY else owners
+        # trigram -> contact positions (into self._keys), only for large books
+        self._tri = None
+        if len(self._keys) >= self.TRIGRAM_MIN_CONTACTS:
+            self._tri = defaultdict(set)
+            for i, k in enumerate(self._keys):
+                for cand in self._variants[k]:
+                    for g in _trigrams(cand):
+                        self._tri[g].add(i)
+        # per-instance memo keyed by (normalized query, n, cutoff); a fresh cache per (re)load
+        self._candidates_cached = lru_cache(maxsize=1024)(self._candidates_uncached)
+        self._many_memo: "OrderedDict[Tuple[str, int, float], List[Tuple[str, float]]]" = OrderedDict()
+        # mentions() matcher over every name variant, built on first use
+        self._mention_index = None
+
+    def _mention_matcher(self):
+        """(automaton or alternation regex, variant -> contact key); first key wins for shared variants."""
+        if self._mention_index is None:
+            owner: Dict[str, str] = {}
+            for k in self._keys:
+                for cand in self._variants[k]:
+                    if cand:
+                        owner.setdefault(cand, k)
+            if not owner:
+                matcher = None
+            elif _HAS_AHOCORASICK:
+                matcher = ahocorasick.Automaton()
+                for cand in owner:
+                    matcher.add_word(cand, cand)
+                matcher.make_automaton()
+            else:
+                # longest alternatives first, so a regex scan also prefers the longest name at a position
+                alts = "|".join(re.escape(c) for c in sorted(owner, key=len, reverse=True))
+                matcher = re.compile(r'(?<!\w)(?:' + alts + r')(?!\w)')
+            self._mention_index = (matcher, owner)
+        return self._mention_index
+
+    def mentions(self, text: str) -> List[str]:
+        """
+        Contacts named verbatim in free text (case-insensitive, whole words), in order of first mention.
+        Overlapping names resolve to the longest one starting earliest ("Rohit Sharma" over "Rohit").
+        """
+        matcher, owner = self._mention_matcher()
+        low = _norm(text)
+        if matcher is None or not low:
+            return []
+        if _HAS_AHOCORASICK:
+            spans = []
+            for end, cand in matcher.iter(low):
+                start = end - len(cand) + 1
+                if not _is_word_char(low, start - 1) and not _is_word_char(low, end + 1):
+                    spans.append((start, -len(cand), cand))
+            spans.sort()
+            found, pos = [], 0
+            for start, neg_len, cand in spans:
+                if start >= pos:
+                    found.append(cand)
+                    pos = start - neg_len
+        else:
+            found = [m.group(0) for m in matcher.finditer(low)]
+        return list(dict.fromkeys(owner[c] for c in found))
 
     def _score_pair(self, query_norm: str, candidate_norm: str) -> float:
-        # sequence matcher ratio is a decent baseline
+        # rapidfuzz ratio is a normalized Indel (LCS-based) similarity, not difflib's Ratcliff-Obershelp
+        # matching, so scores can differ slightly from SequenceMatcher.ratio (usually equal or a bit
+        # higher); both are 0..1 over the whole strings, so the cutoffs stay in the same range
+        if _HAS_RAPIDFUZZ:
+            return _rf_fuzz.ratio(query_norm, candidate_norm) / 100.0
         return float(SequenceMatcher(None, query_norm, candidate_norm).ratio())
 
     def candidates(self, query: str, n: int = 5, cutoff: float = 0.40) -> List[Tuple[str, float]]:
@@ -96,24 +272,86 @@ class ContactResolver:
         q = _norm(query)
         if not q:
             return []
+        # copy so callers can't mutate the memoized list
+        return list(self._candidates_cached(q, n, cutoff))
 
-        scored: List[Tuple[str, float]] = []
+    def candidates_many(self, queries: List[str], n: int = 5, cutoff: float = 0.40) -> List[List[Tuple[str, float]]]:
+        """
+        candidates() for several queries (same order as `queries`). Results are memoized per
+        normalized query (LRU, reset on reload). With rapidfuzz + numpy and no trigram index, every
+        memo miss that needs fuzzy scoring is scored against the variant table in a single cdist
+        call instead of one call per query.
+        """
+        qs = [_norm(q) for q in queries]
+        found: Dict[str, List[Tuple[str, float]]] = {}
+        misses = []
+        seen = set()
+        with self._many_memo_lock:
+            for q in qs:
+                if not q or q in seen:
+                    continue
+                seen.add(q)
+                hit = self._many_memo.get((q, n, cutoff))
+                if hit is not None:
+                    self._many_memo.move_to_end((q, n, cutoff))
+                    found[q] = hit
+                else:
+                    misses.append(q)
+
+        computed: Dict[str, List[Tuple[str, float]]] = {}
+        if misses and _HAS_RAPIDFUZZ and _HAS_NUMPY and self._tri is None and self._flat_names:
+            pending = []
+            for q in misses:
+                hit = self._direct_hit(q)
+                if hit is not None:
+                    computed[q] = [(hit, 1.0)]
+                else:
+                    pending.append(q)
+            if pending:
+                matrix = _rf_process.cdist(pending, self._flat_names, scorer=_rf_fuzz.ratio, dtype=np.float64) / 100.0
+                for q, ratios in zip(pending, matrix):
+                    computed[q] = self._rank(q, self._flat_names, self._flat_owner, ratios, n, cutoff)
+        else:
+            for q in misses:
+                computed[q] = self._candidates_uncached(q, n, cutoff)
+
+        if computed:
+            with self._many_memo_lock:
+                for q, res in computed.items():
+                    self._many_memo[(q, n, cutoff)] = res
+                while len(self._many_memo) > self.MANY_MEMO_SIZE:
+                    self._many_memo.popitem(last=False)
+            found.update(computed)
+        # copies, so callers can't mutate the memoized lists
+        return [list(found[q]) if q else [] for q in qs]
 
-        # phone exact match check
-        digits = re.sub(r'\D', '', query)
+    def _direct_hit(self, q: str) -> Optional[str]:
+        """Exact phone or exact-name match for a normalized query, without any fuzzy scoring."""
+        digits = _RE_NON_DIGIT.sub('', q)
         if digits:
-            for k, v in self._contacts.items():
-                ph = (v.get("phone") or "") if isinstance(v, dict) else ""
-                if digits == re.sub(r'\D', '', str(ph)):
-                    return [(k, 1.0)]
+            hit = self._phones.get(digits)
+            if hit is not None:
+                return hit
+        # exact key match (case-insensitive, ignoring ',' / '.')
+        return self._exact.get(_exact_key(q))
 
-        # exact key match (case-insensitive)
-        for k in self._keys:
-            if q == _norm(k):
-                return [(k, 1.0)]
+    def _candidates_uncached(self, q: str, n: int, cutoff: float) -> List[Tuple[str, float]]:
+        scored: List[Tuple[str, float]] = []
+
+        # phone / exact key match -> skip the fuzzy scan
+        hit = self._direct_hit(q)
+        if hit is not None:
+            return [(hit, 1.0)]
+
+        positions = self._fuzzy_positions(q)
+        if _HAS_RAPIDFUZZ and _HAS_NUMPY:
+            return self._score_vectorized(q, positions, n, cutoff)
 
         # scan variants for substring or fuzzy
-        for k, variants in self._variants.items():
+        pool = range(len(self._keys)) if positions is None else positions
+        for i in pool:
+            k = self._keys[i]
+            variants = self._variants[k]
             best = 0.0
             for cand in variants:
                 if q in cand or cand in q:
@@ -126,11 +364,62 @@ class ContactResolver:
         scored.sort(key=lambda x: x[1], reverse=True)
         return scored[:n]
 
+    def _fuzzy_positions(self, q: str) -> Optional[List[int]]:
+        """
+        Contact positions worth fuzzy-scoring, or None for the whole book. With a trigram index,
+        only contacts sharing >= 2 trigrams with the query (fewer for very short queries),
+        in contact-book order.
+        """
+        if self._tri is None:
+            return None
+        qgrams = _trigrams(q)
+        hits = Counter()
+        for g in qgrams:
+            hits.update(self._tri.get(g, ()))
+        need = min(2, len(qgrams))
+        return sorted(i for i, c in hits.items() if c >= need)
+
+    def _score_vectorized(self, q: str, positions: Optional[List[int]], n: int, cutoff: float) -> List[Tuple[str, float]]:
+        """
+        Same scoring as the scalar loop (0.8 for substring hits, else ratio; best variant per
+        contact; ties in contact order) but over the flat variant arrays: one rapidfuzz cdist
+        call plus a numpy per-contact max.
+        """
+        if positions is None:
+            names, owner = self._flat_names, self._flat_owner
+        else:
+            names, owners = [], []
+            for i in positions:
+                for cand in self._variants[self._keys[i]]:
+                    names.append(cand)
+                    owners.append(i)
+            owner = np.asarray(owners, dtype=np.int64)
+        if not names:
+            return []
+
+        ratios = _rf_process.cdist([q], names, scorer=_rf_fuzz.ratio, dtype=np.float64)[0] / 100.0
+        return self._rank(q, names, owner, ratios, n, cutoff)
+
+    def _rank(self, q: str, names: List[str], owner, ratios, n: int, cutoff: float) -> List[Tuple[str, float]]:
+        """Top-n contacts from per-variant ratios (substring hits score 0.8; best variant per contact)."""
+        substr = np.fromiter((q in c or c in q for c in names), dtype=bool, count=len(names))
+        scores = np.where(substr, 0.8, ratios)
+
+        best = np.full(len(self._keys), -1.0)
+        np.maximum.at(best, owner, scores)
+        hit = np.flatnonzero(best >= cutoff)
+        order = hit[np.argsort(-best[hit], kind="stable")][:n]
+        return [(self._keys[i], float(best[i])) for i in order]
+
     def find_best(self, query: str, cutoff: float = 0.6) -> Optional[str]:
         """
         Return a single canonical name if a candidate surpasses cutoff; otherwise None.
         """
-        cand = self.candidates(query, n=5, cutoff=cutoff)
+        return self._accept(self.candidates(query, n=5, cutoff=cutoff), cutoff)
+
+    @staticmethod
+    def _accept(cand: List[Tuple[str, float]], cutoff: float) -> Optional[str]:
+        """find_best()'s acceptance heuristic over a ranked candidate list."""
         if not cand:
             return None
         # If top candidate is sufficiently better than second, accept it
@@ -146,5 +435,43 @@ class ContactResolver:
             return top_name
         return None
 
+    def resolve_batch(
+        self,
+        names: List[str],
+        llm: Optional[Callable[[str, int], str]] = None,
+        cutoff: float = 0.6,
+    ) -> List[Optional[str]]:
+        """
+        Resolve several contact queries at once (same order as `names`).
+        Each distinct name is resolved locally once (one candidates_many() pass, then find_best()'s
+        acceptance rule); names still unresolved are marshalled
+        into ONE `llm(prompt, max_tokens)` call that must return a JSON array of canonical
+        names (or null). LLM answers not present in the contact book are discarded.
+        """
+        distinct = list(dict.fromkeys(names))
+        ranked = self.candidates_many(distinct, n=5, cutoff=cutoff)
+        local: Dict[str, Optional[str]] = {name: self._accept(cand, cutoff) for name, cand in zip(distinct, ranked)}
+
+        pending = [n for n, r in local.items() if r is None and _norm(n)]
+        if pending and llm is not None and self._keys:
+            prompt = (
+                "Map each query to exactly one canonical contact name from the list, or null if none fits.\n"
+                f"Contacts: {json.dumps(self._keys)}\n"
+                f"Queries: {json.dumps(pending)}\n"
+                "Return only a JSON array of canonical names (or null), one per query, in order.\n"
+            )
+            try:
+                raw = llm(prompt, 256)
+                m = re.search(r'\[.*\]', raw or "", re.S)
+                answers = json.loads(m.group(0)) if m else []
+            except Exception:
+                answers = []
+            if isinstance(answers, list):
+                for name, ans in zip(pending, answers):
+                    if isinstance(ans, str) and ans in self._contacts:
+                        local[name] = ans
+
+        return [local[n] for n in names]
+
     def get_raw_contacts(self) -> Dict[str, Any]:
         return self._contacts.copy()
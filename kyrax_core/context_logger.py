@@ -11,6 +11,17 @@ if TYPE_CHECKING:
 
 _PRONOUNS = {"him", "her", "them", "it", "that", "this", "they", "he", "she", "itself", "himself", "herself", "previous", "last", "earlier", "recent", "again", "previous contact", "previously"}
 
+# precompiled: the contact cleaners and the previous-reference check run on every build()
+_RE_LEAD_NOISE = re.compile(r'^(my\s+friend\s+|my\s+|friend\s+|the\s+|a\s+)', re.I)
+_RE_TRAIL_NOISE = re.compile(r'\b(again|please|now|earlier|previous|previously)\b', re.I)
+_RE_CTX_LEAD_NOISE = re.compile(r'^(my\s+friend\s+|my\s+pal\s+|the\s+)', re.I)
+_RE_CTX_NOISE_WORDS = re.compile(r'\b(again|please|previous contact|previous|last)\b', re.I)
+_RE_WS = re.compile(r'\s+')
+_RE_LETTER = re.compile(r'[A-Za-z]')
+_RE_MENTIONS_PREVIOUS = re.compile(
+    r'\b(previous(?:\s+contact)?|last|earlier|again|one I messaged|one I texted|recent(?:ly)?)\b', re.I
+)
+
 def _clean_contact_str(s: str) -> str:
     """
     Remove common speech prefixes like 'my friend', 'my', 'friend', 'the', 'a', and trailing words like 'again'.
@@ -20,11 +31,11 @@ def _clean_contact_str(s: str) -> str:
         return s
     ss = s.strip()
     # remove repeated noise at beginning
-    ss = re.sub(r'^(my\s+friend\s+|my\s+|friend\s+|the\s+|a\s+)', '', ss, flags=re.I).strip()
+    ss = _RE_LEAD_NOISE.sub('', ss).strip()
     # remove trailing conversational tokens
-    ss = re.sub(r'\b(again|please|now|earlier|previous|previously)\b', '', ss, flags=re.I).strip()
+    ss = _RE_TRAIL_NOISE.sub('', ss).strip()
     # collapse multiple spaces
-    ss = re.sub(r'\s+', ' ', ss)
+    ss = _RE_WS.sub(' ', ss)
     # title case as final normalization
     return " ".join([p.capitalize() for p in ss.split()])
 
@@ -42,6 +53,13 @@ class ContextLogger:
         while len(self._store) > self.max_entries:
             self._store.popleft()
 
+    def prune(self) -> int:
+        """Drop expired / overflow entries now (instead of on the next write); returns how many."""
+        with self._lock:
+            before = len(self._store)
+            self._trim()
+            return before - len(self._store)
+
     def update_from_command(self, cmd: "Command"):
         rec = {
             "last_intent": getattr(cmd, "intent", None),
@@ -83,11 +101,11 @@ class ContextLogger:
             return None
         s = str(s).strip()
         # remove common noisy prefixes/suffixes like "my friend", "again", "please", "the", "previous"
-        s = re.sub(r'^(my\s+friend\s+|my\s+pal\s+|the\s+)', '', s, flags=re.I)
-        s = re.sub(r'\b(again|please|previous contact|previous|last)\b', '', s, flags=re.I)
-        s = re.sub(r'\s+', ' ', s).strip()
+        s = _RE_CTX_LEAD_NOISE.sub('', s)
+        s = _RE_CTX_NOISE_WORDS.sub('', s)
+        s = _RE_WS.sub(' ', s).strip()
         # Titlecase name-like tokens (keep numbers as-is)
-        if re.search(r'[A-Za-z]', s):
+        if _RE_LETTER.search(s):
             return " ".join([p.capitalize() for p in s.split()])
         return s
 
@@ -105,7 +123,7 @@ class ContextLogger:
         def _mentions_previous(s: str) -> bool:
             if not s:
                 return False
-            return bool(re.search(r'\b(previous(?:\s+contact)?|last|earlier|again|one I messaged|one I texted|recent(?:ly)?)\b', s, re.I))
+            return bool(_RE_MENTIONS_PREVIOUS.search(s))
 
         for k in required_keys:
             val = out.get(k)
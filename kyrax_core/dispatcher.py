@@ -1,5 +1,9 @@
 # File: kyrax_core/dispatcher.py
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, Tuple
+from collections import OrderedDict
+import asyncio
+import dataclasses
+import threading
 import time
 import traceback
 
@@ -32,7 +36,8 @@ class Dispatcher:
     def __init__(self, registry: Optional[SkillRegistry] = None, min_confidence: float = 0.0,
                  guard_manager: Optional[GuardManager] = None,
                  default_user: Optional[Dict[str, Any]] = None,
-                 default_confirm_fn: Optional[Callable[[str], bool]] = None):
+                 default_confirm_fn: Optional[Callable[[str], bool]] = None,
+                 result_cache_size: int = 512):
         self.registry = registry or SkillRegistry()
         self.min_confidence = float(min_confidence)
         self.guard_manager = guard_manager
@@ -41,6 +46,10 @@ class Dispatcher:
         # default confirm function used for interactive confirmations when not supplied by caller
         # signature: confirm_fn(prompt: str) -> bool
         self.default_confirm_fn = default_confirm_fn
+        # LRU of successful results from skills with cacheable=True, keyed by _cache_key(); 0 disables
+        self.result_cache_size = int(result_cache_size)
+        self._result_cache: "OrderedDict[Tuple, SkillResult]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
 
     def execute(self, command: Command, context: Optional[Dict[str, Any]] = None,
                 timeout_s: Optional[float] = None, user: Optional[Dict[str, Any]] = None,
@@ -53,6 +62,77 @@ class Dispatcher:
         - user: optional actor dict {id, roles, name} used for Guard checks
         - confirm_fn: optional confirmation callable for Guard-required confirmations
         """
+        handler, early = self._prepare(command, context=context, user=user, confirm_fn=confirm_fn)
+        if early is not None:
+            return early
+
+        key = self._cache_key(handler, command, context)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        # Execute (Phase-1: blocking, simple timeout via polling)
+        start = time.time()
+        try:
+            result = handler.execute(command, context=context or {})
+            if not isinstance(result, SkillResult):
+                # Normalize fallback
+                return SkillResult(False, f"Skill '{handler.name}' returned invalid result type")
+        except Exception as exc:
+            tb = traceback.format_exc()
+            return SkillResult(False, f"Skill '{handler.name}' raised exception: {exc}", {"traceback": tb})
+
+        # Timeout check (best-effort)
+        if timeout_s is not None:
+            elapsed = time.time() - start
+            if elapsed > timeout_s:
+                return SkillResult(False, f"Execution exceeded timeout {timeout_s}s (elapsed {elapsed:.2f}s)")
+
+        self._cache_put(key, result)
+        return result
+
+    # ---------- result cache (cacheable skills only) ----------
+    def _cache_key(self, handler, command: Command, context: Optional[Dict[str, Any]]) -> Optional[Tuple]:
+        """None means "don't cache": non-cacheable skill, caller context, or unhashable entity values."""
+        if self.result_cache_size <= 0 or not getattr(handler, "cacheable", False) or context:
+            return None
+        try:
+            return (handler.name, command.intent, command.domain, frozenset(command.entities.items()))
+        except TypeError:
+            return None
+
+    def _cache_get(self, key) -> Optional[SkillResult]:
+        if key is None:
+            return None
+        with self._result_cache_lock:
+            val = self._result_cache.get(key)
+            if val is None:
+                return None
+            self._result_cache.move_to_end(key)
+        # hand out a copy so callers can't mutate the cached data dict
+        return dataclasses.replace(val, data=dict(val.data) if val.data is not None else None)
+
+    def _cache_put(self, key, result: SkillResult) -> None:
+        if key is None or not result.success:
+            return
+        with self._result_cache_lock:
+            self._result_cache[key] = dataclasses.replace(
+                result, data=dict(result.data) if result.data is not None else None)
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > self.result_cache_size:
+                self._result_cache.popitem(last=False)
+
+    def clear_result_cache(self) -> None:
+        with self._result_cache_lock:
+            self._result_cache.clear()
+
+    def _prepare(self, command: Command, context: Optional[Dict[str, Any]] = None,
+                 user: Optional[Dict[str, Any]] = None,
+                 confirm_fn: Optional[Callable[[str], bool]] = None):
+        """
+        Validation, confidence gating, guards and handler lookup shared by execute()/execute_async().
+        Returns (handler, None) when the command may run, else (None, SkillResult) to return as-is.
+        """
         if not isinstance(command, Command):
             raise DispatchError("Invalid command object")
 
@@ -61,7 +141,7 @@ class Dispatcher:
 
         # Confidence gating (optional)
         if command.confidence < self.min_confidence:
-            return SkillResult(False, f"Low confidence ({command.confidence:.2f}) — refusing to execute")
+            return None, SkillResult(False, f"Low confidence ({command.confidence:.2f}) — refusing to execute")
 
         # ---------- guard checks (Phase 2) ----------
         if self.guard_manager:
@@ -70,47 +150,66 @@ class Dispatcher:
                 res = self.guard_manager.validate(command, u, context=context)
             except Exception as e:
                 # If guard fails badly, fail-safe: block
-                return SkillResult(False, f"Guard validation error: {e}")
+                return None, SkillResult(False, f"Guard validation error: {e}")
 
             if res.blocked:
-                return SkillResult(False, f"Blocked by guard: {res.reason}", {"actions": res.actions})
+                return None, SkillResult(False, f"Blocked by guard: {res.reason}", {"actions": res.actions})
 
             if res.require_confirmation:
                 # Prefer function provided at call time, else default_confirm_fn, else reject
                 fn = confirm_fn or self.default_confirm_fn
                 if not fn:
-                    return SkillResult(False, f"Confirmation required: {res.reason}", {"actions": res.actions})
+                    return None, SkillResult(False, f"Confirmation required: {res.reason}", {"actions": res.actions})
                 prompt = f"Confirm action: {res.reason}. Command: {command}. Proceed?"
                 try:
                     ok = fn(prompt)
                 except Exception as e:
-                    return SkillResult(False, f"Confirmation function failed: {e}")
+                    return None, SkillResult(False, f"Confirmation function failed: {e}")
                 if not ok:
-                    return SkillResult(False, "User declined confirmation", {"actions": ["user_declined"]})
+                    return None, SkillResult(False, "User declined confirmation", {"actions": ["user_declined"]})
                 # if confirmed, continue to dispatch normally
 
         # Find handler
         handler = self.registry.find_handler(command)
         if handler is None:
-            return SkillResult(False, f"No skill registered to handle intent '{command.intent}' in domain '{command.domain}'")
+            return None, SkillResult(False, f"No skill registered to handle intent '{command.intent}' in domain '{command.domain}'")
+
+        return handler, None
+
+    async def execute_async(self, command: Command, context: Optional[Dict[str, Any]] = None,
+                            timeout_s: Optional[float] = None, user: Optional[Dict[str, Any]] = None,
+                            confirm_fn: Optional[Callable[[str], bool]] = None) -> SkillResult:
+        """
+        Awaitable execute(): same checks and result normalization, but awaits the skill's
+        execute_async() so independent commands can be dispatched with asyncio.gather.
+        """
+        handler, early = self._prepare(command, context=context, user=user, confirm_fn=confirm_fn)
+        if early is not None:
+            return early
+
+        key = self._cache_key(handler, command, context)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
 
-        # Execute (Phase-1: blocking, simple timeout via polling)
         start = time.time()
         try:
-            result = handler.execute(command, context=context or {})
+            if hasattr(handler, "execute_async"):
+                result = await handler.execute_async(command, context=context or {})
+            else:
+                result = await asyncio.to_thread(handler.execute, command, context or {})
             if not isinstance(result, SkillResult):
-                # Normalize fallback
                 return SkillResult(False, f"Skill '{handler.name}' returned invalid result type")
         except Exception as exc:
             tb = traceback.format_exc()
             return SkillResult(False, f"Skill '{handler.name}' raised exception: {exc}", {"traceback": tb})
 
-        # Timeout check (best-effort)
         if timeout_s is not None:
             elapsed = time.time() - start
             if elapsed > timeout_s:
                 return SkillResult(False, f"Execution exceeded timeout {timeout_s}s (elapsed {elapsed:.2f}s)")
 
+        self._cache_put(key, result)
         return result
 
     def dispatch(self, command: Command, context: Optional[Dict[str, Any]] = None,
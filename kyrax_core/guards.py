@@ -33,6 +33,10 @@ DESTRUCTIVE_INTENT_PATTERNS = [
     r"delete", r"remove", r"wipe", r"format", r"factory_reset", r"uninstall",
     r"shutdown", r"reboot", r"erase"
 ]
+# precompiled for the per-command checks in GuardManager
+_RE_DESTRUCTIVE_INTENT = re.compile("|".join(DESTRUCTIVE_INTENT_PATTERNS))
+_RE_BULK_PATH = re.compile(r"\b(all|everything|recursive|--all)\b")
+_RE_URL = re.compile(r"https?://")
 
 SENSITIVE_INTENTS = [
     "send_message",     # sensitive if contacting external recipients
@@ -99,16 +103,15 @@ class GuardManager:
     # ---------- checks ----------
     def _is_destructive(self, cmd) -> bool:
         name = (cmd.intent or "").lower()
-        for p in DESTRUCTIVE_INTENT_PATTERNS:
-            if re.search(p, name):
-                return True
+        if _RE_DESTRUCTIVE_INTENT.search(name):
+            return True
         # also check entities for dangerous path tokens
         if cmd.domain == "file":
             path = str(cmd.entities.get("path") or cmd.entities.get("target") or "")
             if path:
                 if path in ("/", "C:\\") or path.lower().startswith("c:\\windows"):
                     return True
-                if re.search(r"\b(all|everything|recursive|--all)\b", path.lower()):
+                if _RE_BULK_PATH.search(path.lower()):
                     return True
         return False
 
@@ -117,7 +120,7 @@ class GuardManager:
         if cmd.intent in ("send_email", "send_message"):
             contact = cmd.entities.get("contact") or cmd.entities.get("to")
             if contact and isinstance(contact, str):
-                if "@" in contact or re.search(r"https?://", contact):
+                if "@" in contact or _RE_URL.search(contact):
                     return True
         if cmd.intent in ("transfer_money", "open_port", "exfiltrate_data"):
             return True
@@ -1,11 +1,23 @@
 # kyrax_core/llm/gemini_client.py
 from google import genai
+import asyncio
 import os
 import logging
-from typing import List
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Iterator, List, Optional, Tuple
 from google.genai.errors import ClientError
 
 log = logging.getLogger(__name__)
+
+# HTTP/2 for the SDK's pooled httpx transport needs the optional `h2` package (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    _HAS_H2 = True
+except Exception:
+    _HAS_H2 = False
 def _normalize_model_name(name: str) -> str:
     # google.genai REQUIRES full resource name
     if name.startswith("models/"):
@@ -27,6 +39,9 @@ class GeminiClient:
         "models/gemini-flash-latest",
         # "models/gemini-2.5-flash",
     ]
+
+    # max cached (prompt, max_tokens) -> text entries; only temperature 0 responses are cached
+    CACHE_SIZE = 2048
     
 
     def __init__(self, model: str | None = None):
@@ -36,7 +51,23 @@ class GeminiClient:
                 "GEMINI_API_KEY not set. Get it from https://aistudio.google.com/app/apikey"
             )
 
-        self.client = genai.Client(api_key=api_key)
+        # genai.Client owns one pooled httpx client (sync + async) for its lifetime, so keep a
+        # single instance per GeminiClient; with h2 available, multiplex requests over HTTP/2
+        self.client = None
+        if _HAS_H2:
+            try:
+                self.client = genai.Client(
+                    api_key=api_key,
+                    http_options={"client_args": {"http2": True}, "async_client_args": {"http2": True}},
+                )
+            except Exception as e:
+                log.info("GeminiClient: HTTP/2 transport unavailable (%s); using default", e)
+        if self.client is None:
+            self.client = genai.Client(api_key=api_key)
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # cache key -> Future of the complete() call currently fetching it (single-flight)
+        self._inflight: Dict[tuple, Future] = {}
 
         # ✅ ENV VAR HAS ABSOLUTE PRIORITY
         env_model = os.getenv("GEMINI_MODEL")
@@ -83,12 +114,115 @@ class GeminiClient:
                 texts.append(t)
         return "".join(texts)
 
+    def close(self):
+        """Release the pooled HTTP connections (the client is unusable afterwards)."""
+        close = getattr(self.client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                log.debug("GeminiClient: close failed: %s", e)
+
+    def warmup(self) -> bool:
+        """
+        Cheap metadata request (no tokens generated) that opens / refreshes the pooled HTTPS
+        connection, so the next real completion doesn't pay the TLS handshake. Never raises.
+        """
+        try:
+            self.client.models.get(model=self.model_candidates[0])
+            return True
+        except Exception as e:
+            log.debug("GeminiClient: warmup failed: %s", e)
+            return False
+
+    # ---- bounded LRU for deterministic (temperature 0) prompts ----
+    def _cache_get(self, key):
+        if key is None:
+            return None
+        with self._cache_lock:
+            val = self._cache.get(key)
+            if val is not None:
+                self._cache.move_to_end(key)
+            return val
+
+    def _cache_put(self, key, value: str):
+        if key is None:
+            return
+        with self._cache_lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    # ---- single-flight for cacheable prompts ----
+    def _claim(self, key) -> Tuple[Optional[str], Optional[Future], bool]:
+        """
+        Cache lookup + in-flight registration under one lock. Returns (text, None, False) on a cache hit,
+        (None, future, False) when an identical complete() is already running (wait on the future), or
+        (None, future, True) when this caller has to make the request and then _settle() the future.
+        """
+        if key is None:
+            return None, None, True
+        with self._cache_lock:
+            val = self._cache.get(key)
+            if val is not None:
+                self._cache.move_to_end(key)
+                return val, None, False
+            fut = self._inflight.get(key)
+            if fut is not None:
+                return None, fut, False
+            fut = self._inflight[key] = Future()
+            return None, fut, True
+
+    def _settle(self, key, fut: Optional[Future], result: Optional[str] = None,
+                exc: Optional[BaseException] = None):
+        if fut is None:
+            return
+        with self._cache_lock:
+            self._inflight.pop(key, None)
+        if exc is not None:
+            fut.set_exception(exc)
+        else:
+            fut.set_result(result)
+
+    def _result_text(self, response) -> str | None:
+        """Join candidate text parts; None means 'empty content, try the next model'."""
+        if not response.candidates:
+            raise RuntimeError("No candidates returned")
+
+        parts = response.candidates[0].content.parts
+        if not parts:
+            log.warning("Gemini returned empty content; treating as no-op")
+            return None
+
+        return "".join(p.text for p in parts if hasattr(p, "text"))
+
+    def _no_model_error(self, errors) -> RuntimeError:
+        return RuntimeError(
+            "Gemini: no usable model found. Tried models:\n"
+            + "\n".join(f"- {m}: {err}" for m, err in errors)
+        )
+
     def complete(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
-        self._cache = getattr(self, "_cache", {})
-        key = (prompt, max_tokens, temperature)
-        if key in self._cache:
-            return self._cache[key]
+        """
+        Cacheable (temperature 0) prompts are single-flight: a call made while an identical one is
+        still waiting on the API shares that request's result (or error) instead of sending another.
+        """
+        key = (prompt, max_tokens) if temperature == 0 else None
+        cached, fut, owner = self._claim(key)
+        if cached is not None:
+            return cached
+        if not owner:
+            return fut.result()
+        try:
+            result = self._complete_uncached(prompt, max_tokens, temperature, key)
+        except BaseException as e:
+            self._settle(key, fut, exc=e)
+            raise
+        self._settle(key, fut, result)
+        return result
 
+    def _complete_uncached(self, prompt: str, max_tokens: int, temperature: float, key) -> str:
         errors = []
 
         for model in self.model_candidates:
@@ -104,27 +238,171 @@ class GeminiClient:
                     },
                 )
 
-                if not response.candidates:
-                    raise RuntimeError("No candidates returned")
+                result = self._result_text(response)
+                if result is None:
+                    continue   # try next model or fallback
+
+                self._cache_put(key, result)
+                return result
+
+            except Exception as e:
+                log.warning("GeminiClient: model %s failed with %s", model, e)
+                errors.append((model, str(e)))
+
+        raise self._no_model_error(errors)
 
-                parts = response.candidates[0].content.parts
-                if not parts:
-                  log.warning("Gemini returned empty content; treating as no-op")
-                  continue   # try next model or fallback
+    async def complete_async(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+        """
+        Async twin of complete() using google.genai's native aio client, so several
+        prompts can be in flight on one event loop (e.g. under asyncio.gather).
+        Shares the response cache, in-flight requests and model fallback order with complete().
+        """
+        key = (prompt, max_tokens) if temperature == 0 else None
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        # join an identical sync complete() already in flight (only sync calls register, so a
+        # blocking caller never ends up waiting on a coroutine of its own event loop)
+        with self._cache_lock:
+            fut = self._inflight.get(key) if key is not None else None
+        if fut is not None:
+            return await asyncio.wrap_future(fut)
 
-                
-                result = "".join(p.text for p in parts if hasattr(p, "text"))
-                self._cache[key] = result
+        errors = []
+
+        for model in self.model_candidates:
+            try:
+                log.info("GeminiClient: trying model %s (async)", model)
+
+                response = await self.client.aio.models.generate_content(
+                    model=model,
+                    contents=prompt,
+                    config={
+                        "temperature": temperature,
+                        "max_output_tokens": max_tokens,
+                    },
+                )
+
+                result = self._result_text(response)
+                if result is None:
+                    continue
+
+                self._cache_put(key, result)
                 return result
 
-                
+            except Exception as e:
+                log.warning("GeminiClient: model %s failed with %s", model, e)
+                errors.append((model, str(e)))
 
+        raise self._no_model_error(errors)
+
+    def stream(self, prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> Iterator[str]:
+        """
+        Yield response text chunks as Gemini generates them (generate_content_stream).
+        Model fallback only applies before the first chunk; once text has been yielded a
+        failure is raised to the consumer. A fully consumed temperature-0 stream is cached
+        like complete(), and a cache hit is yielded as a single chunk.
+        """
+        key = (prompt, max_tokens) if temperature == 0 else None
+        cached = self._cache_get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        errors = []
+
+        for model in self.model_candidates:
+            parts: List[str] = []
+            try:
+                log.info("GeminiClient: streaming from model %s", model)
+                for chunk in self.client.models.generate_content_stream(
+                    model=model,
+                    contents=prompt,
+                    config={
+                        "temperature": temperature,
+                        "max_output_tokens": max_tokens,
+                    },
+                ):
+                    text = getattr(chunk, "text", None)
+                    if text:
+                        parts.append(text)
+                        yield text
             except Exception as e:
+                if parts:
+                    raise
                 log.warning("GeminiClient: model %s failed with %s", model, e)
                 errors.append((model, str(e)))
+                continue
 
-        raise RuntimeError(
-            "Gemini: no usable model found. Tried models:\n"
-            + "\n".join(f"- {m}: {err}" for m, err in errors)
-        )
+            if parts:
+                self._cache_put(key, "".join(parts))
+                return
+            log.warning("Gemini returned empty content; treating as no-op")
+
+        raise self._no_model_error(errors)
+
+    # terminal states of a batch job (google.genai JobState names)
+    _BATCH_DONE_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
+    def complete_batch(
+        self,
+        prompts: List[str],
+        max_tokens: int = 512,
+        temperature: float = 0.0,
+        poll_interval: float = 10.0,
+        timeout: float = 24 * 3600,
+    ) -> List[str]:
+        """
+        Complete many prompts through Gemini's batch endpoint (inline requests): one job,
+        roughly half the per-token cost and no per-minute sync rate limit, but minutes-to-hours
+        of latency — use for non-interactive bulk runs only.
+
+        Results are returned in prompt order. Cached prompts are not resubmitted; prompts whose
+        batch entry failed (or the whole job, if it cannot be created/finished) fall back to
+        complete() one by one.
+        """
+        results: List[str | None] = []
+        pending: List[int] = []
+        for i, prompt in enumerate(prompts):
+            key = (prompt, max_tokens) if temperature == 0 else None
+            cached = self._cache_get(key)
+            results.append(cached)
+            if cached is None:
+                pending.append(i)
+
+        if pending:
+            config = {"temperature": temperature, "max_output_tokens": max_tokens}
+            src = [
+                {"contents": [{"parts": [{"text": prompts[i]}], "role": "user"}], "config": config}
+                for i in pending
+            ]
+            try:
+                job = self.client.batches.create(
+                    model=self.model_candidates[0],
+                    src=src,
+                    config={"display_name": f"kyrax-batch-{int(time.time())}"},
+                )
+                deadline = time.monotonic() + timeout
+                while job.state.name not in self._BATCH_DONE_STATES:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"batch job {job.name} still {job.state.name} after {timeout}s")
+                    time.sleep(poll_interval)
+                    job = self.client.batches.get(name=job.name)
+
+                if job.state.name != "JOB_STATE_SUCCEEDED":
+                    raise RuntimeError(f"batch job {job.name} ended in {job.state.name}")
+
+                for i, inline in zip(pending, job.dest.inlined_responses or []):
+                    if getattr(inline, "response", None) is None:
+                        continue
+                    text = self._result_text(inline.response)
+                    if text is not None:
+                        results[i] = text
+                        self._cache_put((prompts[i], max_tokens) if temperature == 0 else None, text)
+            except Exception as e:
+                log.warning("GeminiClient: batch submission failed (%s); falling back to sync calls", e)
 
+        for i in pending:
+            if results[i] is None:
+                results[i] = self.complete(prompts[i], max_tokens=max_tokens, temperature=temperature)
+        return results
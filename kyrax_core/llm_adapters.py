@@ -6,7 +6,7 @@ All LLM usage should go through adapters here for consistency and easy swapping.
 """
 import json
 import os
-from typing import Callable, Any, Optional
+from typing import Callable, Any, Iterable, Optional
 
 # Gemini adapter (primary LLM for KYRAX)
 def gemini_llm_callable(model: Optional[str] = None) -> Optional[Callable[[str, int], str]]:
@@ -35,6 +35,33 @@ def gemini_llm_callable(model: Optional[str] = None) -> Optional[Callable[[str,
     
     return llm
 
+def gemini_llm_stream_callable(model: Optional[str] = None) -> Optional[Callable[[str, int], Iterable[str]]]:
+    """
+    Create a streaming Gemini callable: llm_stream(prompt, max_tokens) -> iterator of text chunks
+    (pass as AIReasoner(llm_stream=...) so plan steps can be used while later ones generate).
+
+    Requires GEMINI_API_KEY environment variable.
+    Returns None if Gemini is not available.
+    """
+    try:
+        from kyrax_core.llm.gemini_client import GeminiClient
+    except ImportError:
+        return None
+
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        return None
+
+    try:
+        client = GeminiClient(model=model)
+    except Exception:
+        return None
+
+    def llm_stream(prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> Iterable[str]:
+        return client.stream(prompt, max_tokens=max_tokens, temperature=temperature)
+
+    return llm_stream
+
 # OpenAI adapter (optional alternative)
 def openai_llm_callable(api_key: Optional[str] = None) -> Optional[Callable[[str, int], str]]:
     """
@@ -1,10 +1,12 @@
 # kyrax_core/nlu/llm_nlu.py
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 import json
 import re
 import logging
 logger = logging.getLogger(__name__)
-from kyrax_core.llm.gemini_client import GeminiClient
+if TYPE_CHECKING:
+    # google-genai is heavy; the runtime import happens lazily in LLMNLU.__init__
+    from kyrax_core.llm.gemini_client import GeminiClient
 
 # small safe prompt template to ask Gemini to return strict JSON
 _PROMPT_TEMPLATE = """
@@ -39,7 +41,7 @@ User utterance:
 
 
 class LLMNLU:
-    def __init__(self, gemini_client: Optional[GeminiClient] = None, model: str = "gemini-pro"):
+    def __init__(self, gemini_client: Optional["GeminiClient"] = None, model: str = "gemini-pro"):
         # lazy import the Gemini client only when actually instantiating
         if gemini_client is not None:
             self.client = gemini_client
@@ -57,7 +59,18 @@ class LLMNLU:
     def analyze(self, text: str) -> Dict[str, Any]:
         prompt = _PROMPT_TEMPLATE.format(text=text)
         raw = self.client.complete(prompt, max_tokens=512, temperature=0.0)
+        return self._parse(raw)
 
+    def analyze_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        analyze() for many utterances via the client's batch endpoint (one job instead of N
+        sync calls). Meant for offline/bulk runs — batch latency is far higher than a sync call.
+        """
+        prompts = [_PROMPT_TEMPLATE.format(text=t) for t in texts]
+        raws = self.client.complete_batch(prompts, max_tokens=512, temperature=0.0)
+        return [self._parse(raw) for raw in raws]
+
+    def _parse(self, raw: str) -> Dict[str, Any]:
         # try to extract JSON portion
         m = re.search(r"\{.*\}", raw, re.S)
         if not m:
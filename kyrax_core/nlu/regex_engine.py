@@ -0,0 +1,113 @@
+# kyrax_core/nlu/regex_engine.py
+"""
+Regex NLU for the small, fixed set of command shapes the demos use.
+
+No model load and no tokenizer: each utterance is matched against one compiled alternation of
+anchored patterns and the first alternative that matches wins. Utterances that match nothing can be handed to a heavier
+fallback engine (e.g. the spaCy NLUEngine), which is only constructed on the first miss.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import re
+
+from kyrax_core.command import Command
+from kyrax_core.intent_mapper import map_nlu_to_command
+
+# (pattern, intent, entity name per capture group) — first match wins, so order matters.
+# Patterns are implicitly anchored at both ends.
+_INTENTS: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = (
+    (r"(?:send|message|text|tell)\s+(.+?)\s+to\s+(.+?)(?:\s+on\s+(\w+))?", "send_message", ("text", "contact", "app")),
+    (r"(?:open|launch|start)\s+(.+)", "open_app", ("app",)),
+    (r"(?:turn|switch)\s+on\s+(?:the\s+)?(.+)", "turn_on", ("device",)),
+    (r"(?:turn|switch)\s+off\s+(?:the\s+)?(.+)", "turn_off", ("device",)),
+    (r"play\s+(?:some\s+)?(.+)", "play_music", ("query",)),
+    (r"(?:remember|note)\s+(?:that\s+)?(.+)", "take_note", ("text",)),
+    (r"(?:search(?:\s+for)?|google|look\s+up)\s+(.+)", "search_web", ("query",)),
+)
+
+
+def _compile_intents():
+    """
+    Fuse _INTENTS into one alternation so a lookup is a single C-level fullmatch instead of a Python
+    loop over patterns. Alternatives are tried in order, so first-match-wins is preserved. Returns
+    (regex, {outer group index: (intent, ((entity, group index), ...))}).
+    """
+    parts, table, group = [], {}, 1
+    for pat, intent, slots in _INTENTS:
+        outer = group
+        parts.append(f"({pat})")
+        # inner capture groups follow the wrapping group, in order
+        table[outer] = (intent, tuple((name, outer + 1 + i) for i, name in enumerate(slots)))
+        group = outer + 1 + re.compile(pat).groups
+    return re.compile("|".join(parts), re.I), table
+
+
+_INTENT_RE, _INTENT_GROUPS = _compile_intents()
+
+REGEX_CONFIDENCE = 0.9
+
+
+def _no_match() -> Dict[str, Any]:
+    return {"intent": None, "entities": {}, "confidence": 0.0, "source": "nlu.regex"}
+
+
+class RegexNLUEngine:
+    def __init__(self, fallback: Optional[Callable[[], Any]] = None):
+        """
+        fallback: optional zero-arg factory returning an engine with .analyze(text) (and optionally
+        .analyze_many(texts)); it is only called the first time an utterance matches no pattern.
+        """
+        self._fallback_factory = fallback
+        self._fallback = None
+
+    def _match(self, text: str) -> Optional[Dict[str, Any]]:
+        m = _INTENT_RE.fullmatch(text)
+        if not m:
+            return None
+        # the wrapping group of the matched alternative closes last
+        intent, slots = _INTENT_GROUPS[m.lastindex]
+        entities = {name: val.strip() for name, idx in slots if (val := m.group(idx))}
+        return {"intent": intent, "entities": entities, "confidence": REGEX_CONFIDENCE, "source": "nlu.regex"}
+
+    def _get_fallback(self):
+        if self._fallback is None and self._fallback_factory is not None:
+            self._fallback = self._fallback_factory()
+        return self._fallback
+
+    def analyze(self, text: str) -> Dict[str, Any]:
+        """Returns {intent, entities, confidence, source}; intent None / confidence 0.0 on a miss."""
+        text = (text or "").strip()
+        hit = self._match(text) if text else None
+        if hit is not None:
+            return hit
+        fallback = self._get_fallback() if text else None
+        if fallback is not None:
+            return fallback.analyze(text)
+        return _no_match()
+
+    def analyze_many(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Batch variant of analyze(). Misses are forwarded to the fallback in one analyze_many call
+        when it has one (so spaCy can pipe them together).
+        """
+        results: List[Optional[Dict[str, Any]]] = []
+        misses: List[Tuple[int, str]] = []
+        for raw in texts:
+            text = (raw or "").strip()
+            hit = self._match(text) if text else None
+            if hit is None and text:
+                misses.append((len(results), text))
+            results.append(hit)
+
+        fallback = self._get_fallback() if misses else None
+        if fallback is not None:
+            miss_texts = [t for _, t in misses]
+            if hasattr(fallback, "analyze_many"):
+                analyzed = fallback.analyze_many(miss_texts)
+            else:
+                analyzed = [fallback.analyze(t) for t in miss_texts]
+            for (i, _), r in zip(misses, analyzed):
+                results[i] = r
+        return [r if r is not None else _no_match() for r in results]
+
+    def map_to_command(self, nlu_result: Dict[str, Any]) -> Command:
+        return map_nlu_to_command(nlu_result, source=nlu_result.get("source") or "nlu.regex")
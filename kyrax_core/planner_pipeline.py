@@ -1,10 +1,11 @@
 # kyrax_core/planner_pipeline.py
 from typing import List, Dict, Any, Optional, Tuple
-from archive.planner import TaskPlanner
+from concurrent.futures import ThreadPoolExecutor
+import time
+from archive.planner import TaskPlanner, PlanSoA
 from .command_builder import CommandBuilder
 from .context_logger import ContextLogger
 from .command import Command
-from kyrax_core.chain_executor import ChainExecutor
 
 # Type-hinted protocol for dispatcher: anything implementing dispatch(command) works.
 class DispatcherProtocol:
@@ -12,21 +13,37 @@ class DispatcherProtocol:
         raise NotImplementedError
 
 
+def _most_recent_from_snapshot(snapshot: List[Dict[str, Any]], key: str, ttl: Optional[float] = None) -> Optional[Any]:
+    """Same lookup as ContextLogger.get_most_recent, but over an already-taken snapshot (newest last)."""
+    now = time.time()
+    for rec in reversed(snapshot):
+        if ttl is not None and (now - rec.get("timestamp", now)) > ttl:
+            continue
+        val = rec.get(key)
+        if val not in (None, "", []):
+            return val
+    return None
+
+
 def build_context_dict_from_logger(ctx_logger: Optional[ContextLogger]) -> Dict[str, Any]:
     """
     Convert context logger state into a simple context dict planner can use.
     Add keys you need (last_file, last_contact, last_app, etc).
+    The logger is read once (one snapshot); every key is derived from it.
     """
     if not ctx_logger:
         return {}
+    snap = ctx_logger.snapshot()
+    ttl = getattr(ctx_logger, "ttl", None)
+    last_file = _most_recent_from_snapshot(snap, "last_file", ttl)
     return {
-        "last_file": ctx_logger.get_most_recent("last_file"),
-        "presentation_file": ctx_logger.get_most_recent("last_file"),
-        "last_contact": ctx_logger.get_most_recent("last_contact"),
-        "last_app": ctx_logger.get_most_recent("last_app"),
-        "last_device": ctx_logger.get_most_recent("last_device"),
+        "last_file": last_file,
+        "presentation_file": last_file,
+        "last_contact": _most_recent_from_snapshot(snap, "last_contact", ttl),
+        "last_app": _most_recent_from_snapshot(snap, "last_app", ttl),
+        "last_device": _most_recent_from_snapshot(snap, "last_device", ttl),
         # snapshot fallback
-        "snapshot": ctx_logger.snapshot()
+        "snapshot": snap
     }
 
 
@@ -36,6 +53,7 @@ def plan_validate_and_dispatch(
     planner: Optional[TaskPlanner] = None,
     builder: Optional[CommandBuilder] = None,
     context_logger: Optional[ContextLogger] = None,
+    max_workers: int = 1,
 ) -> Tuple[List[Any], List[Dict[str, Any]]]:
     """
     End-to-end helper:
@@ -43,6 +61,8 @@ def plan_validate_and_dispatch(
       2. For each planned Command, run CommandBuilder to validate/normalize (uses context_logger)
       3. If builder returns issues, try a single automatic patch using context_logger where possible
       4. Dispatch validated commands with dispatcher.dispatch(command)
+    max_workers > 1 runs steps concurrently in a thread pool; only use it for plans whose
+    steps are independent (no step relies on a previous one having run).
     Returns: (results_list, issues_list)
     Each issue item is {'command': cmd.to_dict(), 'issues': issues}
     """
@@ -53,51 +73,66 @@ def plan_validate_and_dispatch(
     results: List[Any] = []
     issues_report: List[Dict[str, Any]] = []
 
-    # 1) plan
-    planned_commands: List[Command] = planner.plan(goal_text, context=context)
-
-    chain_executor = ChainExecutor(global_ctx={})
-    results, issues = chain_executor.execute_chain(planned_commands, dispatcher)
+    # 1) plan (as parallel columns; planners that only implement plan() are converted once)
+    if hasattr(planner, "plan_soa"):
+        plan: PlanSoA = planner.plan_soa(goal_text, context=context)
+    else:
+        plan = PlanSoA.from_commands(planner.plan(goal_text, context=context))
 
-    # 2) iterate, validate, optionally patch, dispatch
-    for planned_cmd in planned_commands:
-        # convert planned command into NLU-like dict for CommandBuilder
+    # 2) validate, optionally patch, dispatch (single pass: each command runs once)
+    def _handle(row: Tuple[str, Dict[str, Any], float, str]) -> Tuple[str, Any]:
+        """Process one planned step -> ("result", dispatcher_output) or ("issue", issue_item)."""
+        intent, ents, conf, src = row
+        # NLU-like dict for CommandBuilder
         nlu_like = {
-            "intent": planned_cmd.intent,
-            "entities": planned_cmd.entities or {},
-            "confidence": planned_cmd.confidence,
-            "source": planned_cmd.source or "planner"
+            "intent": intent,
+            "entities": ents or {},
+            "confidence": conf,
+            "source": src or "planner"
         }
-
-        validated_cmd, issues = builder.build(nlu_like, source=planned_cmd.source, context_logger=context_logger)
+        validated_cmd, issues = builder.build(nlu_like, source=src, context_logger=context_logger)
 
         # If builder returned issues and no command, attempt a single automatic patch:
         if validated_cmd is None and issues:
             # Attempt to patch missing entities from context_logger heuristics
-            patched_entities = dict(planned_cmd.entities or {})
+            patched_entities = dict(ents or {})
             if context_logger:
-                # for each missing_required_entity:<key> try fill
+                # for each missing_required_entity:<key> try fill (from the context built above, no new logger reads)
                 for iss in issues:
                     if iss.startswith("missing_required_entity:"):
                         key = iss.split(":", 1)[1]
-                        candidate = context_logger.get_most_recent(f"last_{key}")
+                        candidate = context.get(f"last_{key}") or _most_recent_from_snapshot(
+                            context.get("snapshot") or [], f"last_{key}", getattr(context_logger, "ttl", None)
+                        )
                         if candidate:
                             patched_entities[key] = candidate
                 # re-run builder with patched entities
             nlu_like["entities"] = patched_entities
-            validated_cmd, issues = builder.build(nlu_like, source=planned_cmd.source, context_logger=context_logger)
+            validated_cmd, issues = builder.build(nlu_like, source=src, context_logger=context_logger)
 
         # If still no validated command -> record issue and skip dispatch (caller could ask user)
         if validated_cmd is None:
-            issues_report.append({"command": nlu_like, "issues": issues})
-            continue
+            return "issue", {"command": nlu_like, "issues": issues}
 
         # Dispatch and collect results (dispatcher should return something)
         try:
-            res = dispatcher.execute(validated_cmd)
-            results.append(res)
+            return "result", dispatcher.dispatch(validated_cmd)
         except Exception as e:
             # record error as an issue and continue
-            issues_report.append({"command": validated_cmd.to_dict(), "issues": [f"dispatch_error:{e}"]})
+            return "issue", {"command": validated_cmd.to_dict(), "issues": [f"dispatch_error:{e}"]}
+
+    rows = zip(plan.intents, plan.entities, plan.confidences, plan.sources)
+    if max_workers > 1 and len(plan) > 1:
+        # independent steps only: outputs still come back in plan order
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(plan))) as ex:
+            outcomes = list(ex.map(_handle, rows))
+    else:
+        outcomes = [_handle(row) for row in rows]
+
+    for kind, value in outcomes:
+        if kind == "result":
+            results.append(value)
+        else:
+            issues_report.append(value)
 
     return results, issues_report
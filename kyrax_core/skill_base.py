@@ -1,8 +1,9 @@
 # kyrax_core/skill_base.py
 from __future__ import annotations
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 from kyrax_core.command import Command
 
 
@@ -26,6 +27,9 @@ class Skill(ABC):
     """
 
     name: str = "base"
+    # True only for idempotent skills: the Dispatcher may then reuse a successful SkillResult for an
+    # identical command (same intent/domain/entities) instead of executing again
+    cacheable: bool = False
 
     @abstractmethod
     def can_handle(self, command: Command) -> bool:
@@ -35,6 +39,14 @@ class Skill(ABC):
         """
         raise NotImplementedError
 
+    def supported_intents(self) -> Optional[Iterable[str]]:
+        """
+        Intents this skill may accept, used by SkillRegistry to index skills by intent.
+        Must cover every intent can_handle() can return True for. None (the default) means
+        "not declared": the skill is asked about every command.
+        """
+        return None
+
     @abstractmethod
     def execute(self, command: Command, context: Optional[Dict[str, Any]] = None) -> SkillResult:
         """
@@ -42,3 +54,10 @@ class Skill(ABC):
         Should return SkillResult (success/failure). Must NOT call other skills.
         """
         raise NotImplementedError
+
+    async def execute_async(self, command: Command, context: Optional[Dict[str, Any]] = None) -> SkillResult:
+        """
+        Awaitable execute(). Default runs the blocking execute() in a worker thread;
+        skills with their own executor/event loop may override this.
+        """
+        return await asyncio.to_thread(self.execute, command, context)
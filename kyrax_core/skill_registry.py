@@ -1,5 +1,5 @@
 # kyrax_core/skill_registry.py
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from kyrax_core.skill_base import Skill
 from kyrax_core.command import Command
 
@@ -11,21 +11,49 @@ class SkillRegistry:
 
     def __init__(self):
         self._skills: List[Skill] = []
+        # lowercased intent -> [(registration order, skill)] for skills declaring supported_intents();
+        # skills that don't declare any are asked about every command (_any_intent)
+        self._by_intent: Dict[str, List[Tuple[int, Skill]]] = {}
+        self._any_intent: List[Tuple[int, Skill]] = []
 
     def register(self, skill: Skill) -> None:
         if any(s.name == skill.name for s in self._skills):
             raise ValueError(f"Skill with name '{skill.name}' already registered")
         self._skills.append(skill)
+        self._reindex()
 
     def unregister(self, skill_name: str) -> None:
         self._skills = [s for s in self._skills if s.name != skill_name]
+        self._reindex()
+
+    def _reindex(self) -> None:
+        by_intent: Dict[str, List[Tuple[int, Skill]]] = {}
+        any_intent: List[Tuple[int, Skill]] = []
+        for order, skill in enumerate(self._skills):
+            try:
+                intents = skill.supported_intents()
+            except Exception:
+                intents = None
+            if intents is None:
+                any_intent.append((order, skill))
+                continue
+            for intent in {i.lower() for i in intents}:
+                by_intent.setdefault(intent, []).append((order, skill))
+        self._by_intent = by_intent
+        self._any_intent = any_intent
 
     def find_handler(self, command: Command) -> Optional[Skill]:
         """
         Returns the first skill that claims it can handle the command.
         Registry order determines priority. You can extend to scoring later.
+        Only skills indexed under the command's intent (plus undeclared ones) are asked.
         """
-        for skill in self._skills:
+        indexed = self._by_intent.get((getattr(command, "intent", None) or "").lower(), ())
+        if self._any_intent:
+            candidates = sorted([*indexed, *self._any_intent], key=lambda pair: pair[0])
+        else:
+            candidates = indexed
+        for _, skill in candidates:
             try:
                 if skill.can_handle(command):
                     return skill
@@ -35,4 +63,4 @@ class SkillRegistry:
         return None
 
     def list_skills(self) -> List[str]:
-        return [s.name for s in self._skills]
\ No newline at end of file
+        return [s.name for s in self._skills]
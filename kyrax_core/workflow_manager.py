@@ -9,12 +9,18 @@ Provides:
  - Execution hooks: helper functions to integrate with your dispatcher/chain executor
 """
 
+import copy
+import hashlib
+import re
 import sqlite3
 import json
 import uuid
 import datetime
+import sys
 import threading
-from typing import List, Dict, Any, Optional, Tuple
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from kyrax_core.command import Command
 
 # step status constants
@@ -27,6 +33,54 @@ STATUS_CANCELLED = "cancelled"
 def _now_iso() -> str:
     return datetime.datetime.utcnow().isoformat() + "Z"
 
+# {{ last.<field> }} -> <field> of the previous step's result. Scanned once per command, at
+# create_workflow time, into a template plan; execution only fills the plan in.
+LAST_PLACEHOLDER_RE = re.compile(r"\{\{\s*last\.([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+
+
+def build_template_plan(entities: Dict[str, Any]) -> Optional[Dict[str, List[Any]]]:
+    """
+    Pre-parse the {{ last.X }} references in a command's string entities.
+    Returns {entity_key: [literal, [field, placeholder], literal, ..., literal]} for templated keys,
+    or None when the command has no placeholders.
+    """
+    plan: Dict[str, List[Any]] = {}
+    for key, value in (entities or {}).items():
+        if not isinstance(value, str) or "{{" not in value:
+            continue
+        parts: List[Any] = []
+        pos = 0
+        for m in LAST_PLACEHOLDER_RE.finditer(value):
+            parts.append(value[pos:m.start()])
+            parts.append([m.group(1), m.group(0)])
+            pos = m.end()
+        if parts:
+            parts.append(value[pos:])
+            plan[key] = parts
+    return plan or None
+
+
+def apply_template_plan(command: Command, plan: Optional[Dict[str, List[Any]]],
+                        last_result: Optional[Dict[str, Any]]) -> Command:
+    """
+    Fill a template plan from the previous step's result. No plan -> the command itself (no copy);
+    otherwise a copy with the templated entities rendered. Fields missing from last_result (or no
+    last_result) keep their placeholder text.
+    """
+    if not plan:
+        return command
+    cmd = copy.copy(command)
+    for key, parts in plan.items():
+        out = []
+        for i, part in enumerate(parts):
+            if i % 2 == 0:
+                out.append(part)
+            else:
+                field, placeholder = part
+                out.append(str(last_result.get(field, placeholder)) if last_result else placeholder)
+        cmd.entities[key] = "".join(out)
+    return cmd
+
 # ---------------------------
 # Models (lightweight dict wrappers)
 # ---------------------------
@@ -38,6 +92,8 @@ class Step:
         self.attempts = 0
         self.last_error: Optional[str] = None
         self.result: Optional[Dict[str, Any]] = None
+        # build_template_plan() of the command, computed when the workflow is created
+        self.plan: Optional[Dict[str, List[Any]]] = None
         self.created_at = _now_iso()
         self.updated_at = self.created_at
 
@@ -51,10 +107,11 @@ class Step:
     def from_row(row: sqlite3.Row) -> "Step":
         s = Step(step_id=row["step_id"],
                  command=Command.from_json(row["command_json"]) if row["command_json"] else Command(intent="unknown", domain="generic"))
-        s.status = row["status"]
+        s.status = sys.intern(row["status"]) if row["status"] else row["status"]  # identity-compares with STATUS_*
         s.attempts = int(row["attempts"] or 0)
         s.last_error = row["last_error"]
         s.result = json.loads(row["result_json"]) if row["result_json"] else None
+        s.plan = json.loads(row["template_plan"]) if row["template_plan"] else None
         s.created_at = row["created_at"]
         s.updated_at = row["updated_at"]
         return s
@@ -73,22 +130,81 @@ class Workflow:
 # ---------------------------
 # WorkflowStore: SQLite persistence
 # ---------------------------
+# Statements on the per-turn write path, kept as constants so each is one identical string that
+# sqlite3's per-connection statement cache prepares once and reuses.
+_SQL_INSERT_WORKFLOW = "INSERT INTO workflows (workflow_id, goal, state, created_at, updated_at) VALUES (?, ?, ?, ?, ?)"
+_SQL_INSERT_STEP = """
+    INSERT INTO steps (step_id, workflow_id, command_json, status, attempts, last_error, result_json, created_at, updated_at, template_plan)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+_SQL_SET_WORKFLOW_STATE = "UPDATE workflows SET state=?, updated_at=? WHERE workflow_id=?"
+_SQL_SELECT_STEP = "SELECT * FROM steps WHERE step_id=? AND workflow_id=?"
+_SQL_UPDATE_STEP = """
+    UPDATE steps SET status=?, attempts=?, last_error=?, result_json=?, updated_at=?
+    WHERE step_id=? AND workflow_id=?"""
+_SQL_SET_STEP_STATUS = "UPDATE steps SET status=?, updated_at=? WHERE step_id=? AND workflow_id=?"
+
 class WorkflowStore:
     """
     Small SQLite-backed workflow storage.
 
     Schema:
       workflows(workflow_id PK, goal, state, created_at, updated_at)
-      steps(step_id PK, workflow_id FK, command_json, status, attempts, last_error, result_json, created_at, updated_at)
+      steps(step_id PK, workflow_id FK, command_json, status, attempts, last_error, result_json, created_at, updated_at,
+            template_plan)
+      response_cache(cache_key PK, payload_json, created_at)  -- LLM results by normalized input, see get_cached_response
     """
 
+    # default max age (seconds) of a response_cache entry
+    RESPONSE_CACHE_TTL = 3600.0
+
     def __init__(self, path: str = "kyrax_workflows.db"):
         self.path = path
         self._lock = threading.RLock()
         self._conn = sqlite3.connect(self.path, check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
+        # wait up to 5s on a lock held by another process instead of failing with "database is locked"
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        # open transaction() blocks; while > 0 the per-call commits are deferred to the outermost block
+        self._tx_depth = 0
+        if self.path != ":memory:":
+            # WAL: readers (get_next_pending_step) don't block on the writer; NORMAL: fsync at checkpoints
+            # rather than on every commit
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
         self._init_tables()
 
+    @contextmanager
+    def transaction(self):
+        """
+        Group several store calls into one SQLite transaction (one commit/fsync):
+
+            with store.transaction():
+                store.mark_step_failed(...)
+                store.mark_workflow_state(...)
+
+        Commits on success, rolls back everything on exception. Nested blocks join the outer one.
+        The store lock is held for the whole block.
+        """
+        with self._lock:
+            if self._tx_depth == 0 and not self._conn.in_transaction:
+                self._conn.execute("BEGIN IMMEDIATE")
+            self._tx_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._tx_depth -= 1
+                if self._tx_depth == 0:
+                    self._conn.rollback()
+                raise
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                self._conn.commit()
+
+    def _commit(self):
+        if self._tx_depth == 0:
+            self._conn.commit()
+
     def _init_tables(self):
         with self._lock:
             cur = self._conn.cursor()
@@ -112,10 +228,57 @@ class WorkflowStore:
                 result_json TEXT,
                 created_at TEXT,
                 updated_at TEXT,
+                template_plan TEXT,
                 FOREIGN KEY(workflow_id) REFERENCES workflows(workflow_id)
             )
             """)
-            self._conn.commit()
+            # databases created before template plans existed
+            if "template_plan" not in {r["name"] for r in cur.execute("PRAGMA table_info(steps)")}:
+                cur.execute("ALTER TABLE steps ADD COLUMN template_plan TEXT")
+            # (workflow_id, status) -> rowid: per-status lookups are index seeks, already in step order
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_steps_workflow_status ON steps (workflow_id, status)")
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS response_cache (
+                cache_key TEXT PRIMARY KEY,
+                payload_json TEXT,
+                created_at REAL
+            )
+            """)
+            self._commit()
+
+    @staticmethod
+    def _response_cache_key(kind: str, text: str) -> str:
+        # case- and whitespace-insensitive, so "Send Alice  hi" reuses "send alice hi" -- including
+        # its payload, whose entities keep the casing of whichever input was cached first
+        norm = " ".join((text or "").lower().split())
+        return hashlib.sha256(f"{kind}\0{norm}".encode("utf-8")).hexdigest()
+
+    def get_cached_response(self, kind: str, text: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """
+        Cached LLM result of type `kind` (e.g. "nlu") for `text`, or None when missing or older than
+        max_age seconds (default RESPONSE_CACHE_TTL). Persists across runs with the store's database.
+        Lookups are case-folded and whitespace-collapsed, so the returned payload (e.g. a message
+        entity) may carry the casing of an earlier input that differed only in case.
+        """
+        max_age = self.RESPONSE_CACHE_TTL if max_age is None else max_age
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("SELECT payload_json FROM response_cache WHERE cache_key=? AND created_at > ?",
+                        (self._response_cache_key(kind, text), time.time() - max_age))
+            r = cur.fetchone()
+        return json.loads(r["payload_json"]) if r else None
+
+    def put_cached_response(self, kind: str, text: str, payload: Any):
+        """
+        Store a JSON-serializable LLM result for get_cached_response(kind, text). Entries older than
+        RESPONSE_CACHE_TTL are purged on each write, so the table does not grow without bound.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM response_cache WHERE created_at <= ?",
+                               (time.time() - self.RESPONSE_CACHE_TTL,))
+            self._conn.execute("INSERT OR REPLACE INTO response_cache (cache_key, payload_json, created_at) VALUES (?, ?, ?)",
+                               (self._response_cache_key(kind, text), json.dumps(payload, ensure_ascii=False), time.time()))
+            self._commit()
 
     def create_workflow(self, goal: str, commands: List[Command]) -> str:
         """
@@ -125,18 +288,27 @@ class WorkflowStore:
         wf = Workflow(goal=goal)
         with self._lock:
             cur = self._conn.cursor()
-            cur.execute("INSERT INTO workflows (workflow_id, goal, state, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
-                        (wf.workflow_id, wf.goal, wf.state, wf.created_at, wf.updated_at))
-            now = _now_iso()
+            cur.execute(_SQL_INSERT_WORKFLOW, (wf.workflow_id, wf.goal, wf.state, wf.created_at, wf.updated_at))
+            rows = []
             for cmd in commands:
                 step = Step(command=cmd)
-                cur.execute("""
-                    INSERT INTO steps (step_id, workflow_id, command_json, status, attempts, last_error, result_json, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (step.step_id, wf.workflow_id, cmd.to_json(), step.status, step.attempts, step.last_error, None, step.created_at, step.updated_at))
-            self._conn.commit()
+                plan = build_template_plan(cmd.entities)
+                rows.append((step.step_id, wf.workflow_id, cmd.to_json(), step.status, step.attempts, step.last_error, None,
+                             step.created_at, step.updated_at, json.dumps(plan, ensure_ascii=False) if plan else None))
+            cur.executemany(_SQL_INSERT_STEP, rows)
+            self._commit()
         return wf.workflow_id
 
+    def create_and_complete_workflow(self, goal: str, commands: List[Command], state: str = "completed") -> str:
+        """
+        create_workflow() + mark_workflow_state(state) in one transaction, for workflows that were
+        already executed before being persisted. Returns workflow_id.
+        """
+        with self.transaction():
+            wf_id = self.create_workflow(goal, commands)
+            self.mark_workflow_state(wf_id, state)
+        return wf_id
+
     def list_active_workflows(self) -> List[Workflow]:
         with self._lock:
             cur = self._conn.cursor()
@@ -161,22 +333,19 @@ class WorkflowStore:
     def _update_step_row(self, step: Step, workflow_id: str):
         with self._lock:
             cur = self._conn.cursor()
-            cur.execute("""
-                UPDATE steps SET status=?, attempts=?, last_error=?, result_json=?, updated_at=?
-                WHERE step_id=? AND workflow_id=?
-            """, (step.status, step.attempts, step.last_error, json.dumps(step.result, ensure_ascii=False) if step.result is not None else None, step.updated_at, step.step_id, workflow_id))
-            self._conn.commit()
+            cur.execute(_SQL_UPDATE_STEP, (step.status, step.attempts, step.last_error, json.dumps(step.result, ensure_ascii=False) if step.result is not None else None, step.updated_at, step.step_id, workflow_id))
+            self._commit()
 
     def mark_step_in_progress(self, workflow_id: str, step_id: str):
         with self._lock:
             cur = self._conn.cursor()
-            cur.execute("UPDATE steps SET status=?, updated_at=? WHERE step_id=? AND workflow_id=?", (STATUS_IN_PROGRESS, _now_iso(), step_id, workflow_id))
-            self._conn.commit()
+            cur.execute(_SQL_SET_STEP_STATUS, (STATUS_IN_PROGRESS, _now_iso(), step_id, workflow_id))
+            self._commit()
 
     def mark_step_completed(self, workflow_id: str, step_id: str, result: Optional[Dict[str, Any]] = None):
         with self._lock:
             cur = self._conn.cursor()
-            cur.execute("SELECT * FROM steps WHERE step_id=? AND workflow_id=?", (step_id, workflow_id))
+            cur.execute(_SQL_SELECT_STEP, (step_id, workflow_id))
             r = cur.fetchone()
             if not r:
                 raise KeyError("step_not_found")
@@ -188,10 +357,33 @@ class WorkflowStore:
             step.updated_at = _now_iso()
             self._update_step_row(step, workflow_id)
 
+    def advance_step(self, workflow_id: str, prev_step_id: str, prev_result: Optional[Dict[str, Any]] = None,
+                     next_step_id: Optional[str] = None):
+        """
+        mark_step_completed(prev) + mark_step_in_progress(next) in a single transaction (one commit).
+        next_step_id=None just completes prev.
+        """
+        now = _now_iso()
+        result_json = json.dumps(prev_result, ensure_ascii=False) if prev_result is not None else None
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("""
+                UPDATE steps SET status=?, attempts=COALESCE(attempts, 0) + 1, last_error=NULL, result_json=?, updated_at=?
+                WHERE step_id=? AND workflow_id=?
+            """, (STATUS_COMPLETED, result_json, now, prev_step_id, workflow_id))
+            if cur.rowcount == 0:
+                if self._tx_depth == 0:
+                    self._conn.rollback()
+                raise KeyError("step_not_found")
+            if next_step_id is not None:
+                cur.execute(_SQL_SET_STEP_STATUS,
+                            (STATUS_IN_PROGRESS, now, next_step_id, workflow_id))
+            self._commit()
+
     def mark_step_failed(self, workflow_id: str, step_id: str, error: str):
         with self._lock:
             cur = self._conn.cursor()
-            cur.execute("SELECT * FROM steps WHERE step_id=? AND workflow_id=?", (step_id, workflow_id))
+            cur.execute(_SQL_SELECT_STEP, (step_id, workflow_id))
             r = cur.fetchone()
             if not r:
                 raise KeyError("step_not_found")
@@ -208,13 +400,13 @@ class WorkflowStore:
             cur = self._conn.cursor()
             cur.execute("UPDATE steps SET status=?, last_error=NULL, updated_at=? WHERE step_id=? AND workflow_id=?",
                         (STATUS_PENDING, _now_iso(), step_id, workflow_id))
-            self._conn.commit()
+            self._commit()
 
     def mark_workflow_state(self, workflow_id: str, state: str):
         with self._lock:
             cur = self._conn.cursor()
-            cur.execute("UPDATE workflows SET state=?, updated_at=? WHERE workflow_id=?", (state, _now_iso(), workflow_id))
-            self._conn.commit()
+            cur.execute(_SQL_SET_WORKFLOW_STATE, (state, _now_iso(), workflow_id))
+            self._commit()
 
     # Convenience helpers
     def get_next_pending_step(self, workflow_id: str) -> Optional[Step]:
@@ -225,6 +417,36 @@ class WorkflowStore:
             r = cur.fetchone()
             return Step.from_row(r) if r else None
 
+    def get_last_completed_step(self, workflow_id: str) -> Optional[Step]:
+        """Most recent (by step order) completed step, or None."""
+        with self._lock:
+            cur = self._conn.cursor()
+            # steps are inserted in order, so rowid is step order (created_at can tie)
+            cur.execute("SELECT * FROM steps WHERE workflow_id=? AND status=? ORDER BY rowid DESC LIMIT 1",
+                        (workflow_id, STATUS_COMPLETED))
+            r = cur.fetchone()
+            return Step.from_row(r) if r else None
+
+    def iter_steps(self, workflow_id: str, statuses: Optional[Iterable[str]] = None) -> Iterator[Step]:
+        """
+        Steps of a workflow in step order, optionally only those with a status in `statuses`.
+        One SELECT, materialized on first next(); for workflows whose steps are all known up front
+        this replaces a get_next_pending_step() query per step. Steps appended after iteration
+        starts are not seen — poll get_next_pending_step() for dynamically growing workflows.
+        """
+        with self._lock:
+            cur = self._conn.cursor()
+            if statuses is None:
+                cur.execute("SELECT * FROM steps WHERE workflow_id=? ORDER BY rowid ASC", (workflow_id,))
+            else:
+                statuses = tuple(statuses)
+                marks = ", ".join("?" * len(statuses))
+                cur.execute(f"SELECT * FROM steps WHERE workflow_id=? AND status IN ({marks}) ORDER BY rowid ASC",
+                            (workflow_id, *statuses))
+            rows = cur.fetchall()
+        for r in rows:
+            yield Step.from_row(r)
+
     def get_all_steps(self, workflow_id: str) -> List[Step]:
         with self._lock:
             cur = self._conn.cursor()
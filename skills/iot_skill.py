@@ -6,6 +6,7 @@ from kyrax_core.command import Command
 
 class IoTSkill(Skill):
     name = "iot"
+    INTENTS = ("turn_on", "turn_off", "set", "toggle")
 
     def __init__(self, mqtt_client=None):
         """
@@ -15,7 +16,10 @@ class IoTSkill(Skill):
         self.client = mqtt_client
 
     def can_handle(self, command: Command) -> bool:
-        return command.domain == "iot" and command.intent.lower() in ("turn_on", "turn_off", "set", "toggle")
+        return command.domain == "iot" and command.intent.lower() in self.INTENTS
+
+    def supported_intents(self):
+        return self.INTENTS
 
     def execute(self, command: Command, context: Optional[Dict[str, Any]] = None) -> SkillResult:
         device = command.entities.get("device")
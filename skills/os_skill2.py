@@ -17,10 +17,13 @@ from subprocess import CalledProcessError
 
 class OSSkill(Skill):
     name = "os_control"
+    INTENTS = ("open_app", "close_app", "set_volume", "mute", "unmute", "shutdown", "restart", "sleep")
 
     def __init__(self, dry_run: bool = True):
         self.dry_run = True if _FORCE_DRY_RUN else dry_run
         self.backend = None
+        # dry-run results only describe what would happen, so repeating them is safe
+        self.cacheable = self.dry_run
 
 
     # ---------- small wrapper helper ----------
@@ -117,7 +120,10 @@ class OSSkill(Skill):
             return False
         intent = (command.intent or "").lower()
         # support common OS intents
-        return intent in ("open_app", "close_app", "set_volume", "mute", "unmute", "shutdown", "restart", "sleep")
+        return intent in self.INTENTS
+
+    def supported_intents(self):
+        return self.INTENTS
 
     def execute(self, command: Command, context: Optional[Dict[str, Any]] = None) -> SkillResult:
         import os
@@ -13,6 +13,7 @@ Notes:
 """
 
 # skills/whatsapp_skill.py
+import asyncio
 import time
 import json
 import re
@@ -20,10 +21,14 @@ import os
 import threading
 from concurrent.futures import ThreadPoolExecutor
 from types import SimpleNamespace
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Union
 
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError, Error as PlaywrightError
 
+# precompiled for _prepare_send (runs once per send)
+_RE_TRAILING_PAREN = re.compile(r'\s*\(.*\)$')
+_RE_NON_DIGIT = re.compile(r'\D')
+
 # Thread-local state for Playwright in the worker thread (avoids asyncio conflict on main thread)
 _worker_tls = threading.local()
 
@@ -532,6 +537,9 @@ class WhatsAppSkill(Skill):
             return False
 
         return True
+
+    def supported_intents(self):
+        return ("send_message",)
     
     # add this helper method to your WhatsAppSkill class (place it near other helpers)
     def _resolve_contact_in_worker(self, name: str, wait_ms: int = 1200) -> list[str]:
@@ -546,6 +554,27 @@ class WhatsAppSkill(Skill):
         # now call the actual resolver (it will use thread-local state / create browser as needed)
         return self.resolve_contact_via_whatsapp_ui(name, wait_ms=wait_ms)
 
+    def keepalive(self, timeout: float = 30) -> bool:
+        """
+        Background health check, safe to call periodically between commands. If WhatsApp Web was
+        started and the browser/page has since died (e.g. user closed the window), relaunch it now
+        so the next send doesn't pay the startup. No-op (False) before the first send.
+        """
+        try:
+            return self._executor.submit(self._keepalive_in_worker).result(timeout=timeout)
+        except Exception:
+            return False
+
+    def _keepalive_in_worker(self) -> bool:
+        ws = _get_worker_state()
+        if ws is None or not getattr(ws, "pw", None):
+            return False
+        if not self._is_context_alive() or ws.page is None or ws.page.is_closed():
+            self._ensure_browser()
+            return True
+        ws.page.evaluate("1")
+        return True
+
     def _cleanup_in_worker(self):
         """Run in worker thread to close browser/context held in thread-local state."""
         state = _get_worker_state()
@@ -557,7 +586,7 @@ class WhatsAppSkill(Skill):
             state.context = None
             state.page = None
 
-    def _do_send_in_thread(self, contact_query: str, text: str, ui_resolved: bool = False) -> SkillResult:
+    def _do_send_in_thread(self, contact_query: str, text: Union[str, List[str]], ui_resolved: bool = False) -> SkillResult:
         """
         Run Playwright (sync API) in this worker thread only.
         Handles:
@@ -594,16 +623,18 @@ class WhatsAppSkill(Skill):
                 opened = self._find_and_open_chat(contact_query)
 
 
-            # 4️⃣ If chat not opened, assume page/context was closed or stale → RECOVER ONCE
+            # 4️⃣ If chat not opened, the page/context may have been closed → RECOVER ONCE
             if not opened:
                 try:
-                    # Hard reset: recreate browser context
-                    try:
-                        self._cleanup()
-                    except Exception:
-                        pass
+                    # Hard reset only when the persistent context is really gone; a plain
+                    # "contact not found" keeps the running browser (relaunch costs seconds)
+                    if not self._is_context_alive():
+                        try:
+                            self._cleanup()
+                        except Exception:
+                            pass
 
-                    # Reopen WhatsApp Web
+                    # Reopen WhatsApp Web (reuses the live context/page when possible)
                     self._ensure_browser()
                     self._ensure_home_view()
 
@@ -620,13 +651,15 @@ class WhatsAppSkill(Skill):
                     {"contact_query": contact_query}
                 )
 
-            # 5️⃣ Send the message
-            sent = self._send_text(text)
-            if not sent:
-                return SkillResult(
-                    False,
-                    "Failed to send message (send action failed)"
-                )
+            # 5️⃣ Send the message(s) — the chat stays open between them
+            texts = [text] if isinstance(text, str) else text
+            for i, t in enumerate(texts):
+                if not self._send_text(t):
+                    return SkillResult(
+                        False,
+                        "Failed to send message (send action failed)",
+                        {"sent": i, "contact_query": contact_query}
+                    )
 
             # Persist new contact AFTER successful send
 
@@ -647,7 +680,7 @@ class WhatsAppSkill(Skill):
 
             return SkillResult(
                 True,
-                f"Message sent to {contact_query}",
+                f"Message sent to {contact_query}" if len(texts) == 1 else f"{len(texts)} messages sent to {contact_query}",
                 {"text": text, "contact_query": contact_query}
             )
 
@@ -669,8 +702,54 @@ class WhatsAppSkill(Skill):
     
     # ---------------- public execute ----------------
     def execute(self, command: Command, context: Optional[Dict[str, Any]] = None) -> SkillResult:
+        prepared = self._prepare_send(command)
+        if isinstance(prepared, SkillResult):
+            return prepared
+        contact, contact_query, text, ui_resolved = prepared
+
+        # Run all Playwright sync API in a dedicated thread (no asyncio loop there)
+        try:
+            future = self._executor.submit(self._do_send_in_thread, contact_query, text, ui_resolved)
+            return future.result(timeout=120)
+        except Exception as e:
+            return self._send_exception_result(contact, contact_query, e)
+
+    async def execute_async(self, command: Command, context: Optional[Dict[str, Any]] = None) -> SkillResult:
+        """
+        Awaitable execute(): submits to the same single Playwright worker and awaits its future,
+        so no extra thread blocks on it. Concurrent calls are queued and sent one after another —
+        WhatsApp Web only drives one open chat per session, so sends cannot overlap in separate pages.
+        """
+        prepared = self._prepare_send(command)
+        if isinstance(prepared, SkillResult):
+            return prepared
+        contact, contact_query, text, ui_resolved = prepared
+
+        try:
+            future = self._executor.submit(self._do_send_in_thread, contact_query, text, ui_resolved)
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=120)
+        except Exception as e:
+            return self._send_exception_result(contact, contact_query, e)
+
+    def _send_exception_result(self, contact, contact_query, e: Exception) -> SkillResult:
+        if contact_query is None:
+            # helpful debug for developer
+            return SkillResult(False, f"Contact '{contact}' not found", {"contact_query": contact})
+
+        return SkillResult(False, f"Exception during send: {e}")
+
+    def _prepare_send(self, command: Command):
+        """
+        Validate entities and canonicalize the contact (main thread, no Playwright).
+        Returns (contact, contact_query, text, ui_resolved) or a failing SkillResult; text is a list
+        when the command carries entities["messages"].
+        """
         contact = (command.entities or {}).get("contact") or (command.entities or {}).get("to")
         text = (command.entities or {}).get("text") or (command.entities or {}).get("message")
+        # several messages for one contact are sent in order from a single opened chat
+        messages = (command.entities or {}).get("messages")
+        if isinstance(messages, list) and messages and all(isinstance(m, str) and m for m in messages):
+            text = list(messages)
         ui_resolved = False
         if not text:
             return SkillResult(False, "No text provided")
@@ -686,8 +765,8 @@ class WhatsAppSkill(Skill):
             contact_query = cinfo.get("whatsapp_name") or cinfo.get("name") or cinfo.get("phone") or contact
         else:
             s = str(contact).strip()
-            s_clean = re.sub(r'\s*\(.*\)$', '', s).strip()
-            digits = re.sub(r'\D', '', s_clean)
+            s_clean = _RE_TRAILING_PAREN.sub('', s).strip()
+            digits = _RE_NON_DIGIT.sub('', s_clean)
             if digits and len(digits) >= 7:
                 contact_query = digits
             else:
@@ -735,13 +814,4 @@ class WhatsAppSkill(Skill):
 
 
 
-        # Run all Playwright sync API in a dedicated thread (no asyncio loop there)
-        try:
-            future = self._executor.submit(self._do_send_in_thread, contact_query, text, ui_resolved)
-            return future.result(timeout=120)
-        except Exception as e:
-            if contact_query is None:
-                # helpful debug for developer
-                return SkillResult(False, f"Contact '{contact}' not found", {"contact_query": contact})
-
-            return SkillResult(False, f"Exception during send: {e}")
\ No newline at end of file
+        return contact, contact_query, text, ui_resolved
\ No newline at end of file
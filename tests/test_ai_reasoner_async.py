@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+from kyrax_core.ai_reasoner import AIReasoner
+from kyrax_core.command_builder import CommandBuilder
+
+
+PLAN_JSON = json.dumps([{
+    "explanation": "open then message",
+    "score": 0.8,
+    "steps": [
+        {"intent": "open_app", "domain": "os", "entities": {"app": "chrome"}, "confidence": 0.9},
+        {"intent": "send_message", "domain": "application",
+         "entities": {"contact": "Bob", "text": "hi"}, "confidence": 0.9},
+    ],
+}])
+
+
+def _shape(result):
+    return [
+        (p.explanation, p.score, [(c.intent if c else None, issues) for c, issues in steps])
+        for p, steps in result
+    ]
+
+
+def test_async_plan_matches_sync():
+    sync_r = AIReasoner(llm=lambda prompt, max_tokens=512: PLAN_JSON)
+
+    async def fake_async(prompt, max_tokens=512):
+        return PLAN_JSON
+
+    async_r = AIReasoner(llm_async=fake_async)
+    builder = CommandBuilder()
+
+    expected = sync_r.propose_and_validate_plan("open chrome and text bob hi", {}, builder)
+    got = asyncio.run(async_r.propose_and_validate_plan_async("open chrome and text bob hi", {}, builder))
+    assert _shape(got) == _shape(expected)
+
+
+def test_async_gather_respects_concurrency_limit():
+    in_flight = 0
+    peak = 0
+
+    async def fake_async(prompt, max_tokens=512):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return PLAN_JSON
+
+    async def run():
+        reasoner = AIReasoner(llm_async=fake_async, max_concurrency=2)
+        builder = CommandBuilder()
+        goals = [f"goal {i}" for i in range(6)]
+        return await asyncio.gather(
+            *[reasoner.propose_and_validate_plan_async(g, {}, builder) for g in goals]
+        )
+
+    results = asyncio.run(run())
+    assert len(results) == 6
+    assert peak == 2
+
+
+def test_async_falls_back_to_sync_llm_in_thread():
+    reasoner = AIReasoner(llm=lambda prompt, max_tokens=512: PLAN_JSON)
+    got = asyncio.run(reasoner.suggest_plans_async("open chrome", {}, n=1))
+    assert [pc.intent for pc in got[0].proposed_commands] == ["open_app", "send_message"]
+
+
+def test_async_llm_error_returns_clarification():
+    async def boom(prompt, max_tokens=512):
+        raise RuntimeError("network down")
+
+    got = asyncio.run(AIReasoner(llm_async=boom).suggest_plans_async("do stuff"))
+    assert got[0].proposed_commands[0].intent == "ask_clarify"
@@ -0,0 +1,57 @@
+import json
+
+from kyrax_core.ai_reasoner import AIReasoner, iter_json_array_objects
+from kyrax_core.command_builder import CommandBuilder
+
+
+STEPS = [
+    {"intent": "open_app", "domain": "os", "entities": {"app": "chrome"}, "confidence": 0.9},
+    {"intent": "send_message", "entities": {"contact": "Bob", "text": "see {you} \"soon\" ]"}, "confidence": 0.9},
+]
+PAYLOAD = json.dumps([{"explanation": "two steps", "score": 0.7, "steps": STEPS}])
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_iter_json_array_objects_handles_any_chunking():
+    for size in (1, 3, 7, len(PAYLOAD)):
+        assert list(iter_json_array_objects(_chunks(PAYLOAD, size))) == STEPS
+
+
+def test_iter_json_array_objects_yields_before_stream_ends():
+    produced = []
+
+    def gen():
+        for c in _chunks(PAYLOAD, 5):
+            produced.append(c)
+            yield c
+
+    it = iter_json_array_objects(gen())
+    first = next(it)
+    assert first == STEPS[0]
+    assert len("".join(produced)) < len(PAYLOAD)
+
+
+def test_propose_stream_validates_each_step():
+    reasoner = AIReasoner(llm_stream=lambda prompt, max_tokens=512: iter(_chunks(PAYLOAD, 4)))
+    out = list(reasoner.propose_stream("open chrome and text bob", {}, CommandBuilder()))
+    assert [pc.intent for pc, _, _ in out] == ["open_app", "send_message"]
+    assert all(cmd is not None and issues == [] for _, cmd, issues in out)
+
+
+def test_propose_stream_without_stream_matches_blocking_plan():
+    reasoner = AIReasoner(llm=lambda prompt, max_tokens=512: PAYLOAD)
+    out = list(reasoner.propose_stream("open chrome and text bob", {}, CommandBuilder()))
+    assert [pc.intent for pc, _, _ in out] == ["open_app", "send_message"]
+
+
+def test_propose_stream_empty_plan_asks_for_clarification():
+    empty = json.dumps([{"explanation": "nothing to do", "score": 0.5, "steps": []}])
+    for reasoner in (
+        AIReasoner(llm=lambda prompt, max_tokens=512: empty),
+        AIReasoner(llm_stream=lambda prompt, max_tokens=512: iter(_chunks(empty, 4))),
+    ):
+        out = list(reasoner.propose_stream("do nothing and rest", {}, CommandBuilder()))
+        assert [(pc.intent, cmd) for pc, cmd, _ in out] == [("ask_clarify", None)]
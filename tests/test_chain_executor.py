@@ -0,0 +1,35 @@
+from kyrax_core.chain_executor import ChainExecutor
+from kyrax_core.command import Command
+
+
+class _RecordingDispatcher:
+    def __init__(self):
+        self.seen = []
+
+    def dispatch(self, cmd):
+        self.seen.append(cmd)
+        if cmd.intent == "download_file":
+            return {"file_path": "/tmp/report.pdf"}
+        return {"ok": True}
+
+
+def test_untemplated_commands_dispatched_without_copy():
+    dl = Command(intent="download_file", domain="file", entities={"url": "https://x/r.pdf", "opts": {"n": [1]}})
+    dispatcher = _RecordingDispatcher()
+    outputs, issues = ChainExecutor().execute_chain([dl], dispatcher)
+    assert dispatcher.seen[0] is dl
+    assert outputs == [{"file_path": "/tmp/report.pdf"}] and issues == []
+
+
+def test_templated_commands_rendered_on_a_copy():
+    dl = Command(intent="download_file", domain="file", entities={"url": "https://x/r.pdf"})
+    attach = Command(intent="attach_file", domain="application",
+                     entities={"files": ["{{ last.file_path }}"], "note": "{{ steps.5.x }}"})
+    dispatcher = _RecordingDispatcher()
+    outputs, issues = ChainExecutor().execute_chain([dl, attach], dispatcher)
+
+    sent = dispatcher.seen[1]
+    assert sent is not attach
+    assert sent.entities["files"] == ["/tmp/report.pdf"]
+    assert attach.entities["files"] == ["{{ last.file_path }}"]
+    assert issues == [{"step": 1, "command": attach.to_dict(), "issues": ["unresolved_placeholders:steps.5.x"]}]
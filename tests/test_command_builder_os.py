@@ -37,3 +37,27 @@ def test_shutdown_no_entities_allowed():
     assert cmd is not None
     assert cmd.intent == "shutdown"
     assert issues == [] or all(not i.startswith("missing_required_entity") for i in issues)
+
+
+def test_patch_revalidates_clarified_contact():
+    b = CommandBuilder()
+    bridge = Command(intent="send_message", domain="application",
+                     entities={"contact": "my friend from school", "text": " hi "}, confidence=0.8, source="test")
+    cmd, issues = b.build({"intent": "send_message", "entities": dict(bridge.entities), "confidence": 0.8},
+                          source="test", contacts_registry=object())
+    assert cmd is None and "ambiguous_contact" in issues
+
+    patched, issues = b.patch(bridge, {"contact": "akshat pawar"}, contacts_registry=object())
+    assert issues == []
+    assert patched.entities["contact"] == "Akshat Pawar"
+    assert patched.entities["text"] == "hi"
+    assert patched.entities["app"] == "whatsapp"
+    assert patched.confidence == 0.8
+
+
+def test_patch_reports_invalid_update():
+    b = CommandBuilder()
+    cmd, _ = b.build({"intent": "set_volume", "entities": {"level": "40"}, "confidence": 0.9}, source="test")
+    patched, issues = b.patch(cmd, {"level": "loud"})
+    assert patched is None
+    assert any(i.startswith("missing_required_entity:level") for i in issues)
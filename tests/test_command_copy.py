@@ -0,0 +1,28 @@
+import copy
+
+from kyrax_core.command import Command
+
+
+def _cmd():
+    return Command(intent="attach_file", domain="application",
+                   entities={"file_path": "{{ last.file_path }}", "tags": ["a"]},
+                   confidence=0.8, source="voice", context_id="ctx-1", meta={"k": "v"})
+
+
+def test_copy_keeps_all_fields_and_owns_entities():
+    orig = _cmd()
+    c = copy.copy(orig)
+    assert c.to_dict() == orig.to_dict()
+    c.entities["file_path"] = "/tmp/x"
+    c.meta["k"] = "changed"
+    assert orig.entities["file_path"] == "{{ last.file_path }}"
+    assert orig.meta == {"k": "v"}
+    assert c.entities["tags"] is orig.entities["tags"]  # shallow: values shared
+
+
+def test_deepcopy_copies_nested_values():
+    orig = _cmd()
+    d = copy.deepcopy(orig)
+    assert d.to_dict() == orig.to_dict()
+    d.entities["tags"].append("b")
+    assert orig.entities["tags"] == ["a"]
@@ -0,0 +1,149 @@
+import pytest
+
+from kyrax_core.contact_resolver import ContactResolver
+
+
+CONTACTS = {
+    "Akshat Pawar": {"name": "Akshat Pawar", "phone": "+91 98765 43210"},
+    "Rohit Sharma": {"name": "Rohit Sharma", "alias": "ro"},
+    "Mom": {"name": "Mom"},
+}
+
+
+def test_resolve_batch_local_preserves_order():
+    r = ContactResolver(contacts_dict=CONTACTS)
+    out = r.resolve_batch(["mom", "akshat pawar", "nobody at all", "mom"])
+    assert out == ["Mom", "Akshat Pawar", None, "Mom"]
+
+
+def test_resolve_batch_single_llm_call_for_unresolved():
+    r = ContactResolver(contacts_dict=CONTACTS)
+    calls = []
+
+    def llm(prompt, max_tokens=256):
+        calls.append(prompt)
+        return '["Rohit Sharma", "Not In Book"]'
+
+    out = r.resolve_batch(["my cricket friend", "mom", "someone else"], llm=llm)
+    assert len(calls) == 1
+    assert "my cricket friend" in calls[0] and "someone else" in calls[0]
+    # answers outside the contact book are rejected
+    assert out == ["Rohit Sharma", "Mom", None]
+
+
+def test_resolve_batch_skips_llm_when_all_local():
+    r = ContactResolver(contacts_dict=CONTACTS)
+
+    def llm(prompt, max_tokens=256):
+        raise AssertionError("LLM should not be called")
+
+    assert r.resolve_batch(["Mom", "rohit sharma"], llm=llm) == ["Mom", "Rohit Sharma"]
+
+
+def test_candidates_memoized_and_reset_on_reload(tmp_path):
+    path = tmp_path / "contacts.json"
+    path.write_text('{"Mom": {"name": "Mom"}}', encoding="utf-8")
+    r = ContactResolver(str(path))
+
+    first = r.candidates("  MOM ")
+    assert first == [("Mom", 1.0)]
+    first.append(("junk", 0.0))  # caller mutation must not leak into the cache
+    assert r.candidates("mom") == [("Mom", 1.0)]
+    assert r._candidates_cached.cache_info().hits >= 1
+
+    path.write_text('{"Dad": {"name": "Dad"}}', encoding="utf-8")
+    r.reload()
+    assert r.candidates("mom", cutoff=0.9) == []
+    assert r.candidates("dad") == [("Dad", 1.0)]
+
+
+def test_exact_and_phone_hits_skip_fuzzy_scan():
+    r = ContactResolver(contacts_dict=CONTACTS)
+
+    def no_fuzzy(*a, **k):
+        raise AssertionError("fuzzy scoring should be skipped")
+
+    r._score_pair = no_fuzzy
+    assert r.candidates("akshat pawar.") == [("Akshat Pawar", 1.0)]
+    assert r.candidates("+91-98765-43210") == [("Akshat Pawar", 1.0)]
+
+
+def test_trigram_prefilter_matches_full_scan(monkeypatch):
+    book = {f"Person {i:04d}": {"name": f"Person {i:04d}"} for i in range(300)}
+    book.update(CONTACTS)
+    full = ContactResolver(contacts_dict=book)
+    assert full._tri is None
+
+    monkeypatch.setattr(ContactResolver, "TRIGRAM_MIN_CONTACTS", 10)
+    indexed = ContactResolver(contacts_dict=book)
+    assert indexed._tri is not None
+
+    for q in ("akshat", "rohit sharm", "person 012", "mom", "ro"):
+        assert indexed.candidates(q, cutoff=0.6) == full.candidates(q, cutoff=0.6)
+
+
+def test_vectorized_scoring_matches_scalar_loop(monkeypatch):
+    pytest.importorskip("numpy")
+    pytest.importorskip("rapidfuzz")
+    import kyrax_core.contact_resolver as cr
+
+    book = {f"Person {i:03d}": {"alias": f"p{i}"} for i in range(50)}
+    book.update(CONTACTS)
+    fast = ContactResolver(contacts_dict=book)
+    expected = {q: fast._score_vectorized(q, None, 5, 0.4) for q in ("akshat", "rohit", "person 01", "ro")}
+
+    monkeypatch.setattr(cr, "_HAS_NUMPY", False)
+    slow = ContactResolver(contacts_dict=book)
+    for q, want in expected.items():
+        assert slow.candidates(q, n=5, cutoff=0.4) == want
+
+
+def test_candidates_many_matches_per_query_candidates():
+    book = {f"Person {i:03d}": {"alias": f"p{i}"} for i in range(50)}
+    book.update(CONTACTS)
+    r = ContactResolver(contacts_dict=book)
+    queries = ["akshat", "", "rohit", "Mom", "+91 98765 43210", "person 01", "akshat", "zzz"]
+    expected = [r.candidates(q, n=3, cutoff=0.4) for q in queries]
+    assert r.candidates_many(queries, n=3, cutoff=0.4) == expected
+
+
+def test_refresh_if_changed_reloads_on_mtime_change(tmp_path):
+    import os
+
+    path = tmp_path / "contacts.json"
+    path.write_text('{"Mom": {"name": "Mom"}}', encoding="utf-8")
+    r = ContactResolver(str(path))
+    assert r.candidates_many(["mom"], n=1) == [[("Mom", 1.0)]]
+    assert r.refresh_if_changed() is False
+
+    path.write_text('{"Dad": {"name": "Dad"}}', encoding="utf-8")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert r.refresh_if_changed() is True
+    assert r.candidates_many(["mom", "dad"], n=1, cutoff=0.9) == [[], [("Dad", 1.0)]]
+
+
+def test_build_batch_matches_per_item_build():
+    from kyrax_core.command_builder import CommandBuilder
+
+    r = ContactResolver(contacts_dict=CONTACTS)
+    b = CommandBuilder()
+    nlus = [
+        {"intent": "send_message", "entities": {"contact": c, "text": "hi"}, "confidence": 0.9}
+        for c in ("mom", "akshat pawar", "nobody at all", "mom")
+    ]
+    cmds, issues = b.build_batch(nlus, source="test", contacts_registry=r)
+    single = [b.build(n, source="test", contacts_registry=r) for n in nlus]
+    assert [c.entities if c else None for c in cmds] == [c.entities if c else None for c, _ in single]
+    assert issues == [i for _, i in single]
+    assert cmds[0].entities["contact"] == "Mom"
+
+
+def test_mentions_finds_whole_word_names_in_order():
+    r = ContactResolver(contacts_dict=CONTACTS)
+    assert r.mentions("send hi to rohit sharma and MOM and akshat pawar, not momentum") == [
+        "Rohit Sharma", "Mom", "Akshat Pawar"
+    ]
+    # alias resolves to its contact; repeats are reported once
+    assert r.mentions("tell ro and mom, then mom again") == ["Rohit Sharma", "Mom"]
+    assert r.mentions("nobody here") == []
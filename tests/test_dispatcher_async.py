@@ -0,0 +1,42 @@
+import asyncio
+
+from kyrax_core.command import Command
+from kyrax_core.dispatcher import Dispatcher
+from kyrax_core.skill_base import Skill, SkillResult
+from kyrax_core.skill_registry import SkillRegistry
+
+
+class EchoSkill(Skill):
+    name = "echo"
+
+    def can_handle(self, command):
+        return command.intent == "echo"
+
+    def execute(self, command, context=None):
+        return SkillResult(True, command.entities.get("text", ""))
+
+
+def _dispatcher(**kw):
+    registry = SkillRegistry()
+    registry.register(EchoSkill())
+    return Dispatcher(registry=registry, **kw)
+
+
+def test_execute_async_matches_execute_and_keeps_order():
+    d = _dispatcher()
+    cmds = [Command(intent="echo", domain="generic", entities={"text": str(i)}) for i in range(5)]
+    results = asyncio.run(_gather(d, cmds))
+    assert [r.message for r in results] == [d.execute(c).message for c in cmds]
+
+
+async def _gather(d, cmds):
+    return await asyncio.gather(*[d.execute_async(c) for c in cmds])
+
+
+def test_execute_async_applies_same_gating():
+    d = _dispatcher(min_confidence=0.5)
+    low = Command(intent="echo", domain="generic", entities={"text": "x"}, confidence=0.1)
+    unknown = Command(intent="nope", domain="generic", entities={})
+    assert asyncio.run(d.execute_async(low)).success is False
+    res = asyncio.run(d.execute_async(unknown))
+    assert res.success is False and "No skill registered" in res.message
@@ -0,0 +1,54 @@
+import asyncio
+
+from kyrax_core.command import Command
+from kyrax_core.dispatcher import Dispatcher
+from kyrax_core.skill_base import Skill, SkillResult
+from kyrax_core.skill_registry import SkillRegistry
+
+
+class CountingSkill(Skill):
+    def __init__(self, name, cacheable):
+        self.name = name
+        self.cacheable = cacheable
+        self.calls = 0
+
+    def can_handle(self, command):
+        return command.domain == self.name
+
+    def execute(self, command, context=None):
+        self.calls += 1
+        return SkillResult(True, "ok", {"n": self.calls})
+
+
+def _setup():
+    registry = SkillRegistry()
+    cached, plain = CountingSkill("cached", True), CountingSkill("plain", False)
+    registry.register(cached)
+    registry.register(plain)
+    return Dispatcher(registry=registry), cached, plain
+
+
+def test_cacheable_skill_result_reused_for_identical_command():
+    dispatcher, cached, plain = _setup()
+    cmd = Command(intent="open_app", domain="cached", entities={"app": "code"})
+    first = dispatcher.execute(cmd)
+    first.data["n"] = 99  # callers can't poison the cache
+    assert dispatcher.execute(Command(intent="open_app", domain="cached", entities={"app": "code"})).data == {"n": 1}
+    assert asyncio.run(dispatcher.execute_async(cmd)).data == {"n": 1}
+    assert cached.calls == 1
+
+    dispatcher.execute(Command(intent="open_app", domain="cached", entities={"app": "chrome"}))
+    dispatcher.execute(cmd, context={"session": 1})
+    assert cached.calls == 3
+
+    dispatcher.clear_result_cache()
+    dispatcher.execute(cmd)
+    assert cached.calls == 4
+
+
+def test_non_cacheable_and_unhashable_commands_always_execute():
+    dispatcher, cached, plain = _setup()
+    for _ in range(2):
+        dispatcher.execute(Command(intent="send_message", domain="plain", entities={"text": "hi"}))
+        dispatcher.execute(Command(intent="open_app", domain="cached", entities={"apps": ["a", "b"]}))
+    assert plain.calls == 2 and cached.calls == 2
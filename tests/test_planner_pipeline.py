@@ -0,0 +1,118 @@
+from kyrax_core.command import Command
+from kyrax_core.context_logger import ContextLogger
+from kyrax_core.planner_pipeline import build_context_dict_from_logger
+
+
+def _logger_with(*entities):
+    ctx = ContextLogger()
+    for ents in entities:
+        ctx.update_from_command(Command(intent="send_message", domain="application", entities=ents))
+    return ctx
+
+
+def test_context_dict_matches_get_most_recent():
+    ctx = _logger_with(
+        {"contact": "Alice", "app": "whatsapp", "text": "hi"},
+        {"device": "light"},
+    )
+    d = build_context_dict_from_logger(ctx)
+    for key in ("last_contact", "last_app", "last_device", "last_file"):
+        assert d[key] == ctx.get_most_recent(key)
+    assert d["presentation_file"] == d["last_file"]
+    assert len(d["snapshot"]) == 2
+
+
+def test_context_dict_reads_logger_once(monkeypatch):
+    ctx = _logger_with({"contact": "Bob"})
+    calls = {"snapshot": 0}
+    orig = ctx.snapshot
+
+    def counting_snapshot():
+        calls["snapshot"] += 1
+        return orig()
+
+    monkeypatch.setattr(ctx, "snapshot", counting_snapshot)
+    monkeypatch.setattr(ctx, "get_most_recent", lambda key: (_ for _ in ()).throw(AssertionError(key)))
+    d = build_context_dict_from_logger(ctx)
+    assert d["last_contact"] == "Bob"
+    assert calls["snapshot"] == 1
+
+
+def test_context_dict_without_logger():
+    assert build_context_dict_from_logger(None) == {}
+
+
+class _ListPlanner:
+    def __init__(self, commands):
+        self.commands = commands
+
+    def plan(self, goal, context=None):
+        return list(self.commands)
+
+
+class _CountingDispatcher:
+    def __init__(self):
+        self.calls = []
+
+    def dispatch(self, cmd):
+        self.calls.append(cmd)
+        return {"ok": True, "intent": cmd.intent}
+
+
+def test_plan_validate_and_dispatch_runs_each_command_once():
+    from kyrax_core.planner_pipeline import plan_validate_and_dispatch
+
+    planned = [
+        Command(intent="open_app", domain="os", entities={"app": "chrome"}, source="planner"),
+        Command(intent="send_message", domain="application", entities={"contact": "Alice", "text": "hi"}, source="planner"),
+    ]
+    dispatcher = _CountingDispatcher()
+    results, issues = plan_validate_and_dispatch("goal", dispatcher, planner=_ListPlanner(planned))
+    assert issues == []
+    assert [c.intent for c in dispatcher.calls] == ["open_app", "send_message"]
+    assert len(results) == 2
+
+
+def test_plan_validate_and_dispatch_patches_missing_entity_from_context():
+    from kyrax_core.planner_pipeline import plan_validate_and_dispatch
+
+    ctx = _logger_with({"contact": "Alice", "text": "earlier"})
+    planned = [Command(intent="send_message", domain="application", entities={"text": "hello"}, source="planner")]
+    dispatcher = _CountingDispatcher()
+    results, issues = plan_validate_and_dispatch("goal", dispatcher, planner=_ListPlanner(planned), context_logger=ctx)
+    assert issues == []
+    assert dispatcher.calls[0].entities["contact"] == "Alice"
+
+
+def test_plan_soa_matches_plan():
+    from archive.planner import TaskPlanner
+
+    planner = TaskPlanner()
+    for goal in ("prepare my presentation", "set volume to 40", "something unplannable"):
+        soa = planner.plan_soa(goal, context={"last_file": "talk.pptx"})
+        assert [c.to_dict() for c in soa.commands()] == [
+            c.to_dict() for c in planner.plan(goal, context={"last_file": "talk.pptx"})
+        ]
+        assert len(soa) == len(soa.intents) == len(soa.entities) == len(soa.sources)
+
+
+def test_plan_validate_and_dispatch_thread_pool_keeps_plan_order():
+    import threading
+    from kyrax_core.planner_pipeline import plan_validate_and_dispatch
+
+    class _ThreadRecordingDispatcher(_CountingDispatcher):
+        def dispatch(self, cmd):
+            res = super().dispatch(cmd)
+            res["app"] = cmd.entities["app"]
+            res["thread"] = threading.get_ident()
+            return res
+
+    planned = [
+        Command(intent="open_app", domain="os", entities={"app": app}, source="planner")
+        for app in ("chrome", "spotify", "vscode", "notepad")
+    ]
+    results, issues = plan_validate_and_dispatch(
+        "goal", _ThreadRecordingDispatcher(), planner=_ListPlanner(planned), max_workers=4
+    )
+    assert issues == []
+    assert [r["app"] for r in results] == ["chrome", "spotify", "vscode", "notepad"]
@@ -0,0 +1,40 @@
+from kyrax_core.nlu.regex_engine import RegexNLUEngine
+
+
+def test_regex_engine_demo_utterances():
+    engine = RegexNLUEngine()
+    r = engine.analyze("Send hi to Rohit on whatsapp")
+    assert r["intent"] == "send_message"
+    assert r["entities"] == {"text": "hi", "contact": "Rohit", "app": "whatsapp"}
+    assert engine.analyze("Open VSCode")["entities"] == {"app": "VSCode"}
+    assert engine.analyze("Turn on the bedroom light")["entities"] == {"device": "bedroom light"}
+    assert engine.analyze("Search for nearest coffee shop")["intent"] == "search_web"
+
+    cmd = engine.map_to_command(r)
+    assert cmd.intent == "send_message" and cmd.domain == "application"
+    assert cmd.entities["contact"] == "Rohit"
+
+
+def test_regex_engine_miss_without_fallback():
+    r = RegexNLUEngine().analyze("what's up")
+    assert r["intent"] is None and r["confidence"] == 0.0
+
+
+def test_regex_engine_fallback_built_lazily_for_misses_only():
+    built = []
+
+    class Fallback:
+        def analyze(self, text):
+            return {"intent": "fallback", "entities": {}, "confidence": 0.5, "source": "fb"}
+
+    def factory():
+        built.append(1)
+        return Fallback()
+
+    engine = RegexNLUEngine(fallback=factory)
+    assert engine.analyze("Open Chrome")["intent"] == "open_app"
+    assert built == []
+
+    results = engine.analyze_many(["Open Chrome", "hmm", "Play some jazz", "well"])
+    assert [r["intent"] for r in results] == ["open_app", "fallback", "play_music", "fallback"]
+    assert built == [1]
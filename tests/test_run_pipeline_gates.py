@@ -0,0 +1,55 @@
+import importlib.util
+import json
+from pathlib import Path
+
+from kyrax_core.ai_reasoner import AIReasoner
+from kyrax_core.command_builder import CommandBuilder
+from kyrax_core.context_logger import ContextLogger
+
+_spec = importlib.util.spec_from_file_location(
+    "run_pipeline", Path(__file__).resolve().parent.parent / "examples" / "run_pipeline.py"
+)
+run_pipeline = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(run_pipeline)
+
+
+def test_direct_send_rejects_trailing_subordinator():
+    assert run_pipeline.looks_like_direct_send("send bob hi")
+    assert not run_pipeline.looks_like_direct_send("send bob that")
+    assert not run_pipeline.looks_like_direct_send("text mom what")
+
+
+def test_direct_send_allows_please_after_the_verb():
+    assert run_pipeline.looks_like_direct_send("send bob hi please")
+    assert not run_pipeline.looks_like_direct_send("please send bob hi")
+
+
+def test_regex_gate_still_rejects_please():
+    assert not run_pipeline.is_safe_for_regex_execution("send bob hi please")
+
+
+class _NoNLU:
+    def analyze(self, text):
+        raise AssertionError("nlu.analyze must not run after the planner answered")
+
+
+class _NoDispatch:
+    def guard_and_dispatch(self, *args, **kwargs):
+        raise AssertionError("an empty plan must not dispatch anything")
+
+
+def test_empty_plan_asks_for_clarification_and_skips_nlu(capsys):
+    empty = json.dumps([{"explanation": "nothing to do", "score": 0.5, "steps": []}])
+    reasoner = AIReasoner(llm=lambda prompt, max_tokens=512: empty)
+    nlu = _NoNLU()
+    handled, executed = run_pipeline.run_plan_stream(
+        reasoner.propose_stream("open chrome and rest", {}, CommandBuilder()),
+        _NoDispatch(),
+        None,
+        None,
+        ContextLogger(),
+    )
+    if not handled:
+        nlu.analyze("open chrome and rest")
+    assert handled and executed == []
+    assert "I need clarification" in capsys.readouterr().out
@@ -0,0 +1,49 @@
+from kyrax_core.command import Command
+from kyrax_core.skill_base import Skill, SkillResult
+from kyrax_core.skill_registry import SkillRegistry
+
+
+class _Skill(Skill):
+    def __init__(self, name, intents=None, accept=None):
+        self.name = name
+        self._intents = intents
+        self._accept = accept or (lambda cmd: True)
+        self.asked = 0
+
+    def supported_intents(self):
+        return self._intents
+
+    def can_handle(self, command):
+        self.asked += 1
+        return self._accept(command)
+
+    def execute(self, command, context=None):
+        return SkillResult(True, self.name)
+
+
+def test_find_handler_only_asks_skills_indexed_under_intent():
+    registry = SkillRegistry()
+    a = _Skill("a", intents=("open_app",))
+    b = _Skill("b", intents=("turn_on", "turn_off"))
+    registry.register(a)
+    registry.register(b)
+
+    assert registry.find_handler(Command(intent="Turn_On", domain="iot")) is b
+    assert a.asked == 0
+    assert registry.find_handler(Command(intent="unknown", domain="x")) is None
+    assert a.asked == 0 and b.asked == 1
+
+
+def test_undeclared_skills_keep_registration_priority():
+    registry = SkillRegistry()
+    first = _Skill("first", intents=None, accept=lambda c: c.domain == "os")
+    second = _Skill("second", intents=("open_app",))
+    registry.register(first)
+    registry.register(second)
+
+    assert registry.find_handler(Command(intent="open_app", domain="os")) is first
+    assert registry.find_handler(Command(intent="open_app", domain="application")) is second
+
+    registry.unregister("first")
+    assert registry.find_handler(Command(intent="open_app", domain="os")) is second
+    assert registry.list_skills() == ["second"]
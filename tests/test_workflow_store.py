@@ -0,0 +1,136 @@
+import pytest
+
+from kyrax_core.command import Command
+from kyrax_core.workflow_manager import (
+    WorkflowStore, STATUS_COMPLETED, STATUS_IN_PROGRESS, STATUS_PENDING,
+)
+
+
+def _store_with_steps(n=3):
+    store = WorkflowStore(path=":memory:")
+    cmds = [Command(intent=f"step{i}", domain="system") for i in range(n)]
+    wf_id = store.create_workflow(goal="demo", commands=cmds)
+    return store, wf_id
+
+
+def test_advance_step_completes_prev_and_starts_next():
+    store, wf_id = _store_with_steps()
+    first = store.get_next_pending_step(wf_id)
+    store.mark_step_in_progress(wf_id, first.step_id)
+    second = store.get_next_pending_step(wf_id)
+    assert second.command.intent == "step1"
+
+    store.advance_step(wf_id, first.step_id, {"ok": 1}, second.step_id)
+    steps = {s.step_id: s for s in store.get_all_steps(wf_id)}
+    assert steps[first.step_id].status == STATUS_COMPLETED
+    assert steps[first.step_id].result == {"ok": 1}
+    assert steps[first.step_id].attempts == 1
+    assert steps[second.step_id].status == STATUS_IN_PROGRESS
+    assert store.get_next_pending_step(wf_id).command.intent == "step2"
+
+
+def test_advance_step_unknown_step_changes_nothing():
+    store, wf_id = _store_with_steps(1)
+    only = store.get_next_pending_step(wf_id)
+    with pytest.raises(KeyError):
+        store.advance_step(wf_id, "missing", None, only.step_id)
+    assert store.get_all_steps(wf_id)[0].status == STATUS_PENDING
+
+
+def test_transaction_commits_together_or_rolls_back(tmp_path):
+    store = WorkflowStore(path=str(tmp_path / "wf.db"))
+    wf_id = store.create_workflow(goal="demo", commands=[Command(intent="a", domain="system")])
+    step = store.get_next_pending_step(wf_id)
+
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.mark_step_in_progress(wf_id, step.step_id)
+            store.mark_workflow_state(wf_id, "failed")
+            raise RuntimeError("boom")
+    wf, steps = store.get_workflow(wf_id)
+    assert wf.state == "active" and steps[0].status == STATUS_PENDING
+
+    with store.transaction():
+        store.advance_step(wf_id, step.step_id, {"ok": True})
+        store.mark_workflow_state(wf_id, "completed")
+    store.close()
+
+    reopened = WorkflowStore(path=str(tmp_path / "wf.db"))
+    wf, steps = reopened.get_workflow(wf_id)
+    assert wf.state == "completed" and steps[0].status == STATUS_COMPLETED
+    reopened.close()
+
+
+def test_get_last_completed_step_uses_step_order():
+    store, wf_id = _store_with_steps()
+    assert store.get_last_completed_step(wf_id) is None
+    steps = store.get_all_steps(wf_id)
+    store.mark_step_completed(wf_id, steps[1].step_id, result={"i": 1})
+    store.mark_step_completed(wf_id, steps[0].step_id, result={"i": 0})
+    last = store.get_last_completed_step(wf_id)
+    assert last.step_id == steps[1].step_id and last.result == {"i": 1}
+    plan = store._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM steps WHERE workflow_id=? AND status=? ORDER BY rowid DESC LIMIT 1",
+        (wf_id, STATUS_COMPLETED)).fetchall()
+    assert any("idx_steps_workflow_status" in row[-1] for row in plan)
+
+
+def test_template_plan_built_at_create_and_applied():
+    from kyrax_core.workflow_manager import apply_template_plan
+
+    store = WorkflowStore(path=":memory:")
+    cmds = [
+        Command(intent="download_file", domain="file", entities={"url": "u"}),
+        Command(intent="attach_file", domain="application",
+                entities={"file_path": "{{ last.file_path }}", "note": "got {{last.size}} bytes, {{ last.nope }}"}),
+    ]
+    wf_id = store.create_workflow(goal="demo", commands=cmds)
+    first, second = store.get_all_steps(wf_id)
+    assert first.plan is None
+    assert apply_template_plan(first.command, first.plan, {"x": 1}) is first.command
+
+    cmd = apply_template_plan(second.command, second.plan, {"file_path": "/tmp/r.pdf", "size": 12})
+    assert cmd.entities == {"file_path": "/tmp/r.pdf", "note": "got 12 bytes, {{ last.nope }}"}
+    assert second.command.entities["file_path"] == "{{ last.file_path }}"
+    assert apply_template_plan(second.command, second.plan, None).entities == second.command.entities
+
+
+def test_iter_steps_in_order_with_status_filter():
+    store, wf_id = _store_with_steps()
+    steps = list(store.iter_steps(wf_id))
+    assert [s.command.intent for s in steps] == ["step0", "step1", "step2"]
+    store.mark_step_completed(wf_id, steps[0].step_id, result={})
+    pending = store.iter_steps(wf_id, statuses=(STATUS_PENDING,))
+    assert [s.command.intent for s in pending] == ["step1", "step2"]
+
+
+def test_create_and_complete_workflow_persists_in_one_commit(tmp_path):
+    store = WorkflowStore(path=str(tmp_path / "wf.db"))
+    cmds = [Command(intent="a", domain="system"), Command(intent="b", domain="system")]
+    wf_id = store.create_and_complete_workflow("demo", cmds)
+    assert not store._conn.in_transaction
+    store.close()
+
+    reopened = WorkflowStore(path=str(tmp_path / "wf.db"))
+    wf, steps = reopened.get_workflow(wf_id)
+    assert wf.state == "completed"
+    assert [s.command.intent for s in steps] == ["a", "b"]
+    reopened.close()
+
+
+def test_response_cache_normalizes_input_and_expires():
+    store = WorkflowStore(path=":memory:")
+    assert store.get_cached_response("nlu", "send alice hi") is None
+    store.put_cached_response("nlu", "send alice hi", {"intent": "send_message"})
+    assert store.get_cached_response("nlu", "  Send ALICE   hi ") == {"intent": "send_message"}
+    assert store.get_cached_response("plan", "send alice hi") is None
+    assert store.get_cached_response("nlu", "send alice hi", max_age=-1) is None
+
+
+def test_response_cache_purges_expired_rows_on_write():
+    store = WorkflowStore(path=":memory:")
+    store.put_cached_response("nlu", "send alice hi", {"intent": "send_message"})
+    store.RESPONSE_CACHE_TTL = -1
+    store.put_cached_response("nlu", "send bob yo", {"intent": "send_message"})
+    count = store._conn.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+    assert count == 1